@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Entity Memory Benchmark
+
+Holds N processors (50,000 by default) decoded from NiFi-shaped JSON, first
+as the raw dicts the REST API returns and then as ProcessorEntity objects
+with each raw payload mode, and reports the memory retained by each.
+
+Usage:
+    python benchmarks/bench_entities.py [--processors N]
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nifi_client.entities import ProcessorEntity, RAW_MODES  # noqa: E402
+
+
+TYPES = [
+    "org.apache.nifi.processors.standard.GenerateFlowFile",
+    "org.apache.nifi.processors.standard.LogAttribute",
+    "org.apache.nifi.processors.standard.RouteOnAttribute",
+    "org.apache.nifi.processors.standard.UpdateAttribute",
+    "org.apache.nifi.processors.standard.PutFile",
+]
+
+
+def processor_json(index):
+    """One processor entity shaped like GET /process-groups/{id}/processors returns."""
+    proc_id = f"{index:08x}-0000-1000-8000-00000000{index % 10000:04d}"
+    group_id = f"group-{index // 500:05d}"
+    return {
+        "id": proc_id,
+        "uri": f"https://nifi.example.com:8443/nifi-api/processors/{proc_id}",
+        "revision": {"version": index % 7, "clientId": "bench-client"},
+        "position": {"x": float(index % 40) * 400, "y": float(index // 40) * 200},
+        "permissions": {"canRead": True, "canWrite": True},
+        "bulletins": [],
+        "status": {
+            "groupId": group_id, "id": proc_id, "name": f"Processor {index}", "runStatus": "Stopped",
+            "aggregateSnapshot": {"id": proc_id, "groupId": group_id, "activeThreadCount": 0,
+                                  "bytesRead": 0, "bytesWritten": 0, "flowFilesIn": 0,
+                                  "flowFilesOut": 0, "taskCount": 0, "tasksDuration": 0},
+        },
+        "component": {
+            "id": proc_id,
+            "parentGroupId": group_id,
+            "name": f"Processor {index}",
+            "type": TYPES[index % len(TYPES)],
+            "bundle": {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.6.0"},
+            "state": "STOPPED",
+            "position": {"x": float(index % 40) * 400, "y": float(index // 40) * 200},
+            "validationStatus": "VALID",
+            "relationships": [{"name": "success", "autoTerminate": False, "retry": False},
+                              {"name": "failure", "autoTerminate": True, "retry": False}],
+            "config": {
+                "schedulingPeriod": "1 sec",
+                "schedulingStrategy": "TIMER_DRIVEN",
+                "executionNode": "ALL",
+                "penaltyDuration": "30 sec",
+                "yieldDuration": "1 sec",
+                "bulletinLevel": "WARN",
+                "concurrentlySchedulableTaskCount": 1,
+                "autoTerminatedRelationships": ["failure"],
+                "properties": {f"property-{n}": f"value-{index}-{n}" for n in range(8)},
+                "descriptors": {
+                    f"property-{n}": {"name": f"property-{n}", "displayName": f"Property {n}",
+                                      "description": "A processor property.", "required": False,
+                                      "sensitive": False, "dynamic": False, "supportsEl": True}
+                    for n in range(8)
+                },
+            },
+        },
+    }
+
+
+def measure(build, payload):
+    """Decode the payload, build the representation and return (retained bytes, seconds)."""
+    # Time without tracing, which slows allocation-heavy code several times over
+    gc.collect()
+    started = time.perf_counter()
+    held = build(json.loads(payload))
+    elapsed = time.perf_counter() - started
+    del held
+
+    gc.collect()
+    tracemalloc.start()
+    held = build(json.loads(payload))
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return retained, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory held by raw dicts and slotted entities")
+    parser.add_argument("--processors", type=int, default=50000, help="Processors held (default: 50000)")
+    args = parser.parse_args()
+
+    payload = json.dumps({"processors": [processor_json(i) for i in range(args.processors)]})
+    print(f"Payload: {args.processors} processors, {len(payload) / 1e6:.1f} MB of JSON")
+    print()
+
+    rows = [("Raw dicts", measure(lambda data: data["processors"], payload))]
+    for raw in RAW_MODES:
+        rows.append((f"ProcessorEntity (raw={raw})",
+                     measure(lambda data: [ProcessorEntity(p, raw) for p in data.pop("processors")], payload)))
+
+    baseline = rows[0][1][0]
+    for label, (retained, elapsed) in rows:
+        print(f"{label:30} {retained / 1e6:8.1f} MB  {retained / args.processors:7.0f} B/processor  "
+              f"{baseline / retained:5.1f}x smaller  ({elapsed:.2f}s to build)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
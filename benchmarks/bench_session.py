@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Session Pooling Benchmark
+
+Compares calls/sec of module-level ``requests.get`` (a new connection per
+call, as the client used to do) against the pooled ``NiFiClient`` session,
+using a local keep-alive stand-in server.
+
+The stand-in speaks plain HTTP, so the numbers only reflect TCP setup; against
+a real HTTPS NiFi the pooled session also saves a TLS handshake per call.
+
+Usage:
+    python benchmarks/bench_session.py [--calls N]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import warnings
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from nifi_client import NiFiClient  # noqa: E402
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal NiFi stand-in answering the token and about endpoints."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status, body, content_type="application/json"):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.path == "/nifi-api/access/token":
+            self._send(201, "stand-in-token", content_type="text/plain")
+        else:
+            self._send(404, "{}")
+
+    def do_GET(self):
+        if self.path == "/nifi-api/flow/about":
+            self._send(200, json.dumps({"about": {"version": "2.6.0"}}))
+        else:
+            self._send(404, "{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    """Start the stand-in server on a free port and return it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_unpooled(base_url, calls):
+    """Issue calls the way the client used to: one module-level request each."""
+    headers = {"Authorization": "Bearer stand-in-token"}
+    started = time.perf_counter()
+    for _ in range(calls):
+        response = requests.get(f"{base_url}/nifi-api/flow/about", headers=headers, timeout=30)
+        response.raise_for_status()
+        response.json()
+    return calls / (time.perf_counter() - started)
+
+
+def bench_pooled(base_url, calls):
+    """Issue calls through the pooled NiFiClient session."""
+    with NiFiClient(base_url=base_url) as client:
+        client.authenticate()
+        started = time.perf_counter()
+        for _ in range(calls):
+            client.get_nifi_version()
+        return calls / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pooled vs unpooled NiFi API calls")
+    parser.add_argument("--calls", type=int, default=1000, help="Calls per run (default: 1000)")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    server = start_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        before = bench_unpooled(base_url, args.calls)
+        after = bench_pooled(base_url, args.calls)
+    finally:
+        server.shutdown()
+
+    print(f"Unpooled (requests.get): {before:8.0f} calls/sec")
+    print(f"Pooled (NiFiClient):     {after:8.0f} calls/sec")
+    print(f"Speedup:                 {after / before:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
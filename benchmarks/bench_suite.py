@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Client Benchmark Suite
+
+Runs the client against the in-process mock NiFi (benchmarks/mock_nifi.py)
+at several flow sizes and reports throughput and p50/p95/p99 latency for:
+
+    processor.create / processor.start / processor.stop
+    flow.create_sample_flow
+    processor.list_all
+    cli.start-flow / cli.stop-flow (bulk, concurrent)
+
+Results are saved as JSON; pass --compare with an earlier file to see the
+change in throughput and p95 per operation.
+
+Usage:
+    python benchmarks/bench_suite.py [--sizes 10 100 1000] [--latency 0.002]
+                                     [--error-rate 0.0] [--output results.json]
+                                     [--compare baseline.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from mock_nifi import MockNiFi  # noqa: E402
+from nifi_client import Flow, NiFiClient, Processor  # noqa: E402
+from nifi_client import cli  # noqa: E402
+
+
+PROCESSOR_TYPE = "org.apache.nifi.processors.standard.GenerateFlowFile"
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, elapsed, errors, operations=None):
+    """
+    Build the result record for one measured operation.
+
+    Args:
+        latencies: Seconds per call
+        elapsed: Wall-clock seconds for all calls
+        errors: Calls that raised
+        operations: Components handled, when one call covers many (default: len(latencies))
+
+    Returns:
+        dict: calls, errors, seconds, throughput (operations/sec) and p50/p95/p99 in ms
+    """
+    ordered = sorted(latencies)
+    operations = operations if operations is not None else len(latencies)
+    return {
+        "calls": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "throughput": round(operations / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 3),
+    }
+
+
+def measure(calls):
+    """
+    Time each call in an iterable of zero-argument callables.
+
+    Returns:
+        tuple: (latencies, elapsed seconds, error count)
+    """
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for call in calls:
+        call_started = time.perf_counter()
+        try:
+            call()
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started, errors
+
+
+def run_size(mock, size, concurrency):
+    """Run every scenario against a fresh mock flow of the given size."""
+    mock.reset()
+    results = {}
+
+    with NiFiClient(base_url=mock.url) as client:
+        processor = Processor(client)
+        ids = []
+
+        def create(index):
+            return lambda: ids.append(processor.create(PROCESSOR_TYPE, f"Bench {index}",
+                                                       position={"x": index * 10.0, "y": 0.0})["id"])
+
+        results["processor.create"] = summarize(*measure(create(i) for i in range(size)))
+        results["processor.start"] = summarize(*measure(lambda pid=pid: processor.start(pid) for pid in ids))
+        results["processor.stop"] = summarize(*measure(lambda pid=pid: processor.stop(pid) for pid in ids))
+
+        repeats = 20
+        latencies, elapsed, errors = measure(processor.list_all for _ in range(repeats))
+        results["processor.list_all"] = summarize(latencies, elapsed, errors, operations=repeats)
+
+        flows = max(1, size // 3)
+        flow = Flow(client)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results["flow.create_sample_flow"] = summarize(*measure(flow.create_sample_flow for _ in range(flows)))
+
+    # Bulk CLI operations over everything created above
+    components = len(mock.flow.processors)
+    os.environ["NIFI_URL"] = mock.url
+    for command in ("start-flow", "stop-flow"):
+        argv = [command, "--concurrency", str(concurrency)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            latencies, elapsed, errors = measure([lambda argv=argv: cli.main(argv)])
+        results[f"cli.{command}"] = summarize(latencies, elapsed, errors, operations=components)
+
+    results["requests"] = mock.total_calls()
+    return results
+
+
+def compare(baseline, current):
+    """Print the change in throughput and p95 against a baseline results file."""
+    print()
+    print(f"{'Size':>6} {'Operation':28} {'Throughput':>12} {'p95':>12}")
+    for size, operations in current["results"].items():
+        before_size = baseline.get("results", {}).get(size, {})
+        for name, result in operations.items():
+            before = before_size.get(name)
+            if not isinstance(result, dict) or not isinstance(before, dict):
+                continue
+            throughput = (result["throughput"] / before["throughput"] - 1) * 100 if before["throughput"] else 0.0
+            p95 = (result["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+            print(f"{size:>6} {name:28} {throughput:>+11.1f}% {p95:>+11.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NiFi client against a mock NiFi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Component counts to run (default: 10 100 1000)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests failing with 503 (default: 0)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Workers for bulk CLI operations (default: 16)")
+    parser.add_argument("--output", default="bench_results.json", help="Results file (default: bench_results.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "concurrency": args.concurrency,
+        "results": {},
+    }
+
+    with MockNiFi(latency=args.latency, error_rate=args.error_rate) as mock:
+        for size in args.sizes:
+            results = run_size(mock, size, args.concurrency)
+            report["results"][str(size)] = results
+
+            print(f"\n{size} components ({results['requests']} requests)")
+            print(f"  {'Operation':28} {'ops/sec':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+            for name, result in results.items():
+                if isinstance(result, dict):
+                    print(f"  {name:28} {result['throughput']:>10.1f} {result['p50_ms']:>9.2f} "
+                          f"{result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} {result['errors']:>7}")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+In-Process Mock NiFi
+
+A small, thread-safe stand-in for the NiFi REST API, used by the benchmark
+suite. It keeps an in-memory flow and implements the endpoints the client
+uses: access/token, flow/about, flow/processor-types, system-diagnostics,
+flow/process-groups (flow, schedule, status), process-groups (including
+flow definition uploads), processors, run-status, connections and drop
+requests. Revisions are enforced like NiFi does, with 409 on a stale
+version.
+
+Latency and errors can be injected:
+
+    mock = MockNiFi(latency=0.005, error_rate=0.01)
+    mock.start()
+    client = NiFiClient(base_url=mock.url)
+    ...
+    mock.stop()
+"""
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email import policy
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+ROOT_ID = "00000000-0000-1000-8000-000000000000"
+
+
+def make_token(lifetime=3600):
+    """Build an unsigned JWT with an exp claim, as NiFi's token endpoint returns."""
+    def encode(obj):
+        return base64.urlsafe_b64encode(json.dumps(obj).encode()).rstrip(b"=").decode()
+    claims = {"sub": "admin", "exp": int(time.time()) + lifetime, "jti": uuid.uuid4().hex}
+    return f"{encode({'alg': 'none'})}.{encode(claims)}.mock"
+
+
+# Processor types the mock reports as installed, all in the standard bundle
+PROCESSOR_TYPES = [f"org.apache.nifi.processors.standard.{name}" for name in (
+    "GenerateFlowFile", "LogAttribute", "UpdateAttribute", "RouteOnAttribute", "ListenHTTP", "PutFile",
+    "GetFile", "ReplaceText", "SplitText", "MergeContent")]
+STANDARD_BUNDLE = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.6.0"}
+
+
+def parse_multipart(content_type, body):
+    """Decode a multipart/form-data body into {field name: str or bytes}."""
+    message = BytesParser(policy=policy.HTTP).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body)
+    fields = {}
+    for part in message.iter_parts():
+        value = part.get_payload(decode=True)
+        fields[part.get_param("name", header="content-disposition")] = (
+            value if part.get_filename() else value.decode("utf-8"))
+    return fields
+
+
+class MockFlow:
+    """In-memory flow state shared by all request handlers."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.groups = {ROOT_ID: {"id": ROOT_ID, "name": "NiFi Flow", "parent": None, "version": 0}}
+        self.processors = {}
+        self.connections = {}
+
+    def group_id(self, group_id):
+        return ROOT_ID if group_id == "root" else group_id
+
+    def processor_entity(self, proc):
+        return {
+            "id": proc["id"],
+            "revision": {"version": proc["version"]},
+            "status": {"aggregateSnapshot": {"activeThreadCount": 0,
+                                             "runStatus": proc["state"].title()}},
+            "component": {
+                "id": proc["id"], "name": proc["name"], "type": proc["type"], "state": proc["state"],
+                "parentGroupId": proc["group"], "validationStatus": "VALID",
+                "position": proc["position"], "config": proc["config"],
+            },
+        }
+
+    def connection_entity(self, conn):
+        return {
+            "id": conn["id"],
+            "revision": {"version": conn["version"]},
+            "sourceId": conn["source"],
+            "destinationId": conn["destination"],
+            "component": {
+                "id": conn["id"], "parentGroupId": conn["group"],
+                "source": {"id": conn["source"], "groupId": conn["group"], "type": "PROCESSOR"},
+                "destination": {"id": conn["destination"], "groupId": conn["group"], "type": "PROCESSOR"},
+                "selectedRelationships": conn["relationships"],
+                "backPressureObjectThreshold": 10000,
+                "backPressureDataSizeThreshold": "1 GB",
+            },
+        }
+
+    def group_entity(self, group):
+        return {"id": group["id"], "revision": {"version": group["version"]},
+                "component": {"id": group["id"], "name": group["name"], "parentGroupId": group["parent"]}}
+
+    def children(self, group_id):
+        return [group for group in self.groups.values() if group["parent"] == group_id]
+
+    def status_snapshot(self, group_id, recursive):
+        group = self.groups[group_id]
+        snapshot = {
+            "id": group_id,
+            "name": group["name"],
+            "activeThreadCount": 0,
+            "flowFilesQueued": sum(c["queued"] for c in self.connections.values() if c["group"] == group_id),
+            "bytesQueued": sum(c["queued"] * 1024 for c in self.connections.values() if c["group"] == group_id),
+            "processorStatusSnapshots": [
+                {"processorStatusSnapshot": {
+                    "id": p["id"], "groupId": group_id, "name": p["name"], "type": p["type"].rsplit(".", 1)[-1],
+                    "runStatus": p["state"].title(), "activeThreadCount": 0,
+                    "flowFilesIn": 0, "flowFilesOut": 0, "bytesRead": 0, "bytesWritten": 0}}
+                for p in self.processors.values() if p["group"] == group_id
+            ],
+            "connectionStatusSnapshots": [
+                {"connectionStatusSnapshot": {
+                    "id": c["id"], "groupId": group_id, "name": "",
+                    "sourceName": self.processors.get(c["source"], {}).get("name", ""),
+                    "destinationName": self.processors.get(c["destination"], {}).get("name", ""),
+                    "flowFilesQueued": c["queued"], "bytesQueued": c["queued"] * 1024,
+                    "percentUseCount": c["queued"] * 100 // 10000, "percentUseBytes": 0}}
+                for c in self.connections.values() if c["group"] == group_id
+            ],
+            "processGroupStatusSnapshots": [],
+        }
+        if recursive:
+            snapshot["processGroupStatusSnapshots"] = [
+                {"processGroupStatusSnapshot": self.status_snapshot(child["id"], True)}
+                for child in self.children(group_id)
+            ]
+        return snapshot
+
+    def schedule(self, group_id, state):
+        for proc in self.processors.values():
+            # Like NiFi, scheduling a group leaves invalid and disabled processors alone
+            if proc["group"] == group_id and proc["state"] not in (state, "INVALID", "DISABLED"):
+                proc["state"] = state
+                proc["version"] += 1
+        for child in self.children(group_id):
+            self.schedule(child["id"], state)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Routes NiFi REST requests to the shared MockFlow."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    # (method, path pattern, handler name); patterns are matched in order
+    ROUTES = [
+        ("POST", r"/access/token", "token"),
+        ("GET", r"/flow/about", "about"),
+        ("GET", r"/system-diagnostics", "diagnostics"),
+        ("GET", r"/flow/process-groups/([^/]+)/status", "group_status"),
+        ("GET", r"/flow/process-groups/([^/]+)", "group_flow"),
+        ("PUT", r"/flow/process-groups/([^/]+)", "schedule_group"),
+        ("GET", r"/process-groups/([^/]+)/processors", "list_processors"),
+        ("POST", r"/process-groups/([^/]+)/processors", "create_processor"),
+        ("GET", r"/process-groups/([^/]+)/connections", "list_connections"),
+        ("POST", r"/process-groups/([^/]+)/connections", "create_connection"),
+        ("POST", r"/process-groups/([^/]+)/process-groups", "create_group"),
+        ("POST", r"/process-groups/([^/]+)/process-groups/upload", "upload_group"),
+        ("GET", r"/flow/processor-types", "processor_types"),
+        ("GET", r"/process-groups/([^/]+)", "get_group"),
+        ("DELETE", r"/process-groups/([^/]+)", "delete_group"),
+        ("PUT", r"/processors/([^/]+)/run-status", "run_status"),
+        ("GET", r"/processors/([^/]+)", "get_processor"),
+        ("PUT", r"/processors/([^/]+)", "update_processor"),
+        ("DELETE", r"/processors/([^/]+)", "delete_processor"),
+        ("GET", r"/connections/([^/]+)", "get_connection"),
+        ("PUT", r"/connections/([^/]+)", "update_connection"),
+        ("DELETE", r"/connections/([^/]+)", "delete_connection"),
+        ("POST", r"/flowfile-queues/([^/]+)/drop-requests", "drop_queue"),
+        ("GET", r"/flowfile-queues/([^/]+)/drop-requests/([^/]+)", "drop_status"),
+        ("DELETE", r"/flowfile-queues/([^/]+)/drop-requests/([^/]+)", "drop_status"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self, status, body, content_type="application/json"):
+        payload = body if isinstance(body, str) else json.dumps(body)
+        payload = payload.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def handle_method(self, method):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        path = url.path[len("/nifi-api"):] if url.path.startswith("/nifi-api") else url.path
+        self.query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        raw = self.rfile.read(length) if length else b""
+        content_type = self.headers.get("Content-Type", "")
+        if raw and content_type.startswith("application/json"):
+            self.body = json.loads(raw)
+        elif raw and content_type.startswith("multipart/form-data"):
+            self.body = parse_multipart(content_type, raw)
+        else:
+            self.body = {}
+
+        mock.count(method, path)
+        if path != "/access/token" and self.headers.get("Authorization", "")[len("Bearer "):] in mock.revoked:
+            return self.respond(401, "Token has been revoked", "text/plain")
+        if mock.latency:
+            time.sleep(mock.latency() if callable(mock.latency) else mock.latency)
+        if mock.error_rate and path != "/access/token" and random.random() < mock.error_rate:
+            return self.respond(503, "Injected error", "text/plain")
+
+        for route_method, pattern, name in self.ROUTES:
+            match = re.fullmatch(pattern, path)
+            if match and route_method == method:
+                with mock.flow.lock:
+                    try:
+                        return getattr(self, name)(mock.flow, *match.groups())
+                    except KeyError:
+                        return self.respond(404, "Not found", "text/plain")
+
+        self.respond(404, f"No route for {method} {path}", "text/plain")
+
+    def do_GET(self):
+        self.handle_method("GET")
+
+    def do_POST(self):
+        self.handle_method("POST")
+
+    def do_PUT(self):
+        self.handle_method("PUT")
+
+    def do_DELETE(self):
+        self.handle_method("DELETE")
+
+    def stale(self, entity, version):
+        if version != entity["version"]:
+            self.respond(409, f"Revision {version} is not the current revision {entity['version']}", "text/plain")
+            return True
+        return False
+
+    # Handlers --------------------------------------------------------------
+
+    def token(self, flow):
+        token = make_token()
+        self.server.mock.issued.append(token)
+        self.respond(201, token, "text/plain")
+
+    def about(self, flow):
+        self.respond(200, {"about": {"title": "NiFi", "version": "2.6.0"}})
+
+    def diagnostics(self, flow):
+        self.respond(200, {"systemDiagnostics": {"aggregateSnapshot": {
+            "usedHeapBytes": 512 * 1024 ** 2, "maxHeapBytes": 2048 * 1024 ** 2, "totalThreads": 120,
+            "availableProcessors": 8, "processorLoadAverage": 1.5}}})
+
+    def group_status(self, flow, group_id):
+        group_id = flow.group_id(group_id)
+        recursive = self.query.get("recursive", ["false"])[0] == "true"
+        self.respond(200, {"processGroupStatus": {"id": group_id,
+                                                  "aggregateSnapshot": flow.status_snapshot(group_id, recursive)}})
+
+    def group_flow(self, flow, group_id):
+        group = flow.groups[flow.group_id(group_id)]
+        self.respond(200, {"processGroupFlow": {"id": group["id"], "parentGroupId": group["parent"], "flow": {
+            "processors": [flow.processor_entity(p) for p in flow.processors.values() if p["group"] == group["id"]],
+            "connections": [flow.connection_entity(c) for c in flow.connections.values()
+                            if c["group"] == group["id"]],
+            "processGroups": [flow.group_entity(g) for g in flow.children(group["id"])],
+            "inputPorts": [], "outputPorts": [], "funnels": []}}})
+
+    def schedule_group(self, flow, group_id):
+        group_id = flow.group_id(group_id)
+        flow.groups[group_id]
+        flow.schedule(group_id, self.body["state"])
+        self.respond(200, {"id": group_id, "state": self.body["state"]})
+
+    def list_processors(self, flow, group_id):
+        group_id = flow.group_id(group_id)
+        self.respond(200, {"processors": [flow.processor_entity(p) for p in flow.processors.values()
+                                          if p["group"] == group_id]})
+
+    def create_processor(self, flow, group_id):
+        group_id = flow.group_id(group_id)
+        component = self.body["component"]
+        proc = {"id": str(uuid.uuid4()), "name": component.get("name", ""), "type": component["type"],
+                "state": "STOPPED", "group": group_id, "version": 1,
+                "position": component.get("position", {"x": 0, "y": 0}),
+                "config": component.get("config", {})}
+        flow.processors[proc["id"]] = proc
+        self.respond(201, flow.processor_entity(proc))
+
+    def list_connections(self, flow, group_id):
+        group_id = flow.group_id(group_id)
+        self.respond(200, {"connections": [flow.connection_entity(c) for c in flow.connections.values()
+                                           if c["group"] == group_id]})
+
+    def create_connection(self, flow, group_id):
+        component = self.body["component"]
+        source, destination = component["source"]["id"], component["destination"]["id"]
+        if source not in flow.processors or destination not in flow.processors:
+            return self.respond(400, "Unknown source or destination", "text/plain")
+        conn = {"id": str(uuid.uuid4()), "group": flow.group_id(group_id), "source": source,
+                "destination": destination, "relationships": component.get("selectedRelationships", []),
+                "version": 1, "queued": 0}
+        flow.connections[conn["id"]] = conn
+        self.respond(201, flow.connection_entity(conn))
+
+    def create_group(self, flow, parent_id):
+        group = {"id": str(uuid.uuid4()), "name": self.body["component"]["name"],
+                 "parent": flow.group_id(parent_id), "version": 1}
+        flow.groups[group["id"]] = group
+        self.respond(201, flow.group_entity(group))
+
+    def processor_types(self, flow):
+        self.respond(200, {"processorTypes": [{"type": name, "bundle": STANDARD_BUNDLE} for name in PROCESSOR_TYPES]})
+
+    def upload_group(self, flow, parent_id):
+        definition = json.loads(self.body["file"])
+        contents = definition["flowContents"]
+        ids = {}
+
+        def create(versioned, parent, name, position):
+            group = {"id": str(uuid.uuid4()), "name": name, "parent": parent, "version": 1}
+            flow.groups[group["id"]] = group
+            for child in versioned.get("processGroups", []):
+                create(child, group["id"], child["name"], child["position"])
+            for proc in versioned.get("processors", []):
+                if proc["type"] not in PROCESSOR_TYPES:
+                    raise ValueError(f"Unknown processor type {proc['type']}")
+                ids[proc["identifier"]] = str(uuid.uuid4())
+                config = {key: proc[key] for key in ("properties", "schedulingPeriod", "autoTerminatedRelationships")
+                          if key in proc}
+                flow.processors[ids[proc["identifier"]]] = {
+                    "id": ids[proc["identifier"]], "name": proc["name"], "type": proc["type"], "state": "STOPPED",
+                    "group": group["id"], "version": 1, "position": proc["position"], "config": config}
+            for conn in versioned.get("connections", []):
+                conn_id = str(uuid.uuid4())
+                flow.connections[conn_id] = {
+                    "id": conn_id, "group": group["id"], "source": ids[conn["source"]["id"]],
+                    "destination": ids[conn["destination"]["id"]], "relationships": conn["selectedRelationships"],
+                    "version": 1, "queued": 0}
+            return group
+
+        try:
+            group = create(contents, flow.group_id(parent_id), self.body["groupName"],
+                           {"x": float(self.body["positionX"]), "y": float(self.body["positionY"])})
+        except (KeyError, ValueError) as e:
+            return self.respond(400, f"Invalid flow definition: {e}", "text/plain")
+        self.respond(201, flow.group_entity(group))
+
+    def get_group(self, flow, group_id):
+        self.respond(200, flow.group_entity(flow.groups[flow.group_id(group_id)]))
+
+    def delete_group(self, flow, group_id):
+        group = flow.groups[group_id]
+        if flow.children(group_id) or any(p["group"] == group_id for p in flow.processors.values()):
+            return self.respond(409, "Process group is not empty", "text/plain")
+        del flow.groups[group_id]
+        self.respond(200, flow.group_entity(group))
+
+    def run_status(self, flow, proc_id):
+        proc = flow.processors[proc_id]
+        if self.stale(proc, self.body["revision"]["version"]):
+            return
+        proc["state"] = self.body["state"]
+        proc["version"] += 1
+        self.respond(200, flow.processor_entity(proc))
+
+    def get_processor(self, flow, proc_id):
+        self.respond(200, flow.processor_entity(flow.processors[proc_id]))
+
+    def update_processor(self, flow, proc_id):
+        proc = flow.processors[proc_id]
+        if self.stale(proc, self.body["revision"]["version"]):
+            return
+        if proc["state"] == "RUNNING":
+            return self.respond(409, f"{proc_id} is not stopped", "text/plain")
+        component = self.body["component"]
+        proc["name"] = component.get("name", proc["name"])
+        proc["position"] = component.get("position", proc["position"])
+        proc["config"].update(component.get("config", {}))
+        proc["version"] += 1
+        self.respond(200, flow.processor_entity(proc))
+
+    def delete_processor(self, flow, proc_id):
+        proc = flow.processors[proc_id]
+        if self.stale(proc, int(self.query.get("version", ["-1"])[0])):
+            return
+        if any(proc_id in (c["source"], c["destination"]) for c in flow.connections.values()):
+            return self.respond(409, "Processor has connections", "text/plain")
+        del flow.processors[proc_id]
+        self.respond(200, flow.processor_entity(proc))
+
+    def get_connection(self, flow, conn_id):
+        self.respond(200, flow.connection_entity(flow.connections[conn_id]))
+
+    def update_connection(self, flow, conn_id):
+        conn = flow.connections[conn_id]
+        if self.stale(conn, self.body["revision"]["version"]):
+            return
+        conn["relationships"] = self.body["component"].get("selectedRelationships", conn["relationships"])
+        conn["version"] += 1
+        self.respond(200, flow.connection_entity(conn))
+
+    def delete_connection(self, flow, conn_id):
+        conn = flow.connections[conn_id]
+        if self.stale(conn, int(self.query.get("version", ["-1"])[0])):
+            return
+        if conn["queued"]:
+            return self.respond(409, "Queue is not empty", "text/plain")
+        del flow.connections[conn_id]
+        self.respond(200, flow.connection_entity(conn))
+
+    def drop_queue(self, flow, conn_id):
+        flow.connections[conn_id]["queued"] = 0
+        self.respond(202, {"dropRequest": {"id": f"drop-{conn_id}", "finished": True, "percentCompleted": 100}})
+
+    def drop_status(self, flow, conn_id, request_id):
+        self.respond(200, {"dropRequest": {"id": request_id, "finished": True, "percentCompleted": 100}})
+
+
+class MockNiFi:
+    """
+    Runs the mock NiFi REST API on a local port in a background thread.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, host="127.0.0.1", port=0):
+        """
+        Initialize mock server.
+
+        Args:
+            latency: Seconds added to every request, or a callable returning
+                seconds per request (default: 0)
+            error_rate: Fraction of requests answered with HTTP 503 (default: 0)
+            host: Interface to listen on (default: 127.0.0.1)
+            port: Port to listen on; 0 picks a free port (default: 0)
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.flow = MockFlow()
+        self.calls = {}
+        self._calls_lock = threading.Lock()
+        self.issued = []
+        self.revoked = set()
+        self.server = ThreadingHTTPServer((host, port), MockHandler)
+        self.server.daemon_threads = True
+        self.server.mock = self
+
+    @property
+    def url(self):
+        """str: Base URL to pass to NiFiClient."""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count(self, method, path):
+        with self._calls_lock:
+            key = f"{method} {path}"
+            self.calls[key] = self.calls.get(key, 0) + 1
+
+    def revoke_tokens(self):
+        """Answer HTTP 401 to every token issued so far, as NiFi does once a token expires."""
+        self.revoked.update(self.issued)
+
+    def total_calls(self):
+        """int: Requests received since the last reset."""
+        with self._calls_lock:
+            return sum(self.calls.values())
+
+    def reset(self):
+        """Clear the flow and the call counts."""
+        self.flow = MockFlow()
+        with self._calls_lock:
+            self.calls = {}
+
+    def start(self):
+        """Start serving in a background thread."""
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a mock NiFi REST API")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 503")
+    args = parser.parse_args()
+
+    mock = MockNiFi(latency=args.latency, error_rate=args.error_rate, port=args.port)
+    print(f"Mock NiFi listening on {mock.url} (NIFI_URL={mock.url})")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
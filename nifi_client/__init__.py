@@ -3,11 +3,57 @@ NiFi REST API Client Library
 
 A simple Python client for Apache NiFi REST API.
 Provides classes for managing NiFi flows, processors, and connections.
+
+Submodules are imported on first use, so importing the package (or the
+CLI) does not pay for requests or aiohttp until a client is needed.
 """
 
-from .client import NiFiClient, NiFiError, AuthenticationError, APIError
-from .processor import Processor
-from .flow import Flow
+import importlib
 
 __version__ = "1.0.0"
-__all__ = ["NiFiClient", "Processor", "Flow", "NiFiError", "AuthenticationError", "APIError"]
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "NiFiClient": "client", "NiFiError": "client", "AuthenticationError": "client", "APIError": "client",
+    "CircuitOpenError": "client",
+    "RetryPolicy": "retry", "CircuitBreaker": "retry",
+    "RateLimiter": "ratelimit",
+    "ResponseCache": "cache",
+    "Hooks": "hooks", "RequestEvent": "hooks", "LatencyHistogram": "hooks",
+    "Processor": "processor",
+    "Flow": "flow",
+    "ProcessGroup": "process_group",
+    "SpecError": "spec", "load_spec": "spec",
+    "Deployer": "deploy",
+    "Planner": "plan",
+    "Walker": "walker",
+    "Teardown": "teardown",
+    "Snapshot": "snapshot", "SnapshotError": "snapshot",
+    "DefinitionError": "definition",
+    "Fleet": "fleet", "Target": "fleet", "FleetError": "fleet", "load_fleet": "fleet",
+    "SearchIndex": "search", "SearchError": "search",
+    "Revision": "entities", "ProcessorEntity": "entities", "ConnectionEntity": "entities",
+    "ProcessGroupEntity": "entities",
+    "AsyncNiFiClient": "aio", "AsyncProcessor": "aio", "AsyncFlow": "aio",
+}
+
+__all__ = ["NiFiClient", "Processor", "Flow", "NiFiError", "AuthenticationError", "APIError",
+           "AsyncNiFiClient", "AsyncProcessor", "AsyncFlow", "ProcessGroup", "SpecError", "load_spec",
+           "Deployer", "Planner", "Walker", "Revision", "ProcessorEntity", "ConnectionEntity",
+           "ProcessGroupEntity", "ResponseCache", "RetryPolicy", "CircuitBreaker", "CircuitOpenError",
+           "RateLimiter", "Hooks", "RequestEvent", "LatencyHistogram",
+           "Teardown", "Snapshot", "SnapshotError", "DefinitionError",
+           "Fleet", "Target", "FleetError", "load_fleet", "SearchIndex", "SearchError"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
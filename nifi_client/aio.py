@@ -0,0 +1,539 @@
+"""
+NiFi REST API Asyncio Client
+
+Async counterparts of NiFiClient, Processor and Flow built on aiohttp.
+Every request passes through a semaphore so thousands of component
+operations can be scheduled from one event loop without oversubscribing
+NiFi.
+
+Requires the optional ``aiohttp`` dependency (``pip install nifi-client[async]``).
+"""
+
+import asyncio
+import ssl
+import warnings
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .client import NiFiError, AuthenticationError, APIError, SecurityWarning
+from .flow import connection_payload
+from .processor import processor_payload
+
+
+class AsyncNiFiClient:
+    """
+    Asyncio NiFi REST API client.
+
+    Mirrors NiFiClient. The aiohttp session and concurrency semaphore are
+    created lazily inside the running event loop; use ``async with`` or
+    ``await client.close()`` to release connections.
+    """
+
+    def __init__(self, base_url="https://localhost:8443", username="admin", password="adminadminadmin",
+                 verify_ssl=False, cert_path=None, max_in_flight=32, pool_maxsize=100):
+        """
+        Initialize async NiFi client.
+
+        Args:
+            base_url: NiFi base URL (default: https://localhost:8443)
+            username: NiFi username (default: admin)
+            password: NiFi password (default: adminadminadmin)
+            verify_ssl: Verify SSL certificates (default: False for development)
+            cert_path: Path to CA bundle for SSL verification (optional)
+            max_in_flight: Maximum concurrent requests sent to NiFi (default: 32)
+            pool_maxsize: Maximum pooled connections per host (default: 100)
+
+        Raises:
+            NiFiError: If aiohttp is not installed
+        """
+        if aiohttp is None:
+            raise NiFiError("AsyncNiFiClient requires aiohttp: pip install nifi-client[async]")
+
+        if not base_url.startswith('https://'):
+            warnings.warn(
+                "HTTP URLs are not secure. Use HTTPS in production.",
+                SecurityWarning,
+                stacklevel=2
+            )
+
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.max_in_flight = max_in_flight
+        self.pool_maxsize = pool_maxsize
+        self.token = None
+        self.root_pg_id = None
+        self.session = None
+        self._semaphore = None
+        self._auth_lock = None
+
+        if cert_path:
+            self.ssl = ssl.create_default_context(cafile=cert_path)
+        elif verify_ssl:
+            self.ssl = True
+        else:
+            self.ssl = False
+            warnings.warn(
+                "SSL certificate verification is disabled. This is insecure and should only be used in development.",
+                SecurityWarning,
+                stacklevel=2
+            )
+
+    def _ensure_session(self):
+        """Create the aiohttp session and semaphore on first use inside the event loop."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize, ssl=self.ssl)
+            self.session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._auth_lock = asyncio.Lock()
+        return self.session
+
+    async def close(self):
+        """Close the aiohttp session and release pooled connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def authenticate(self):
+        """
+        Authenticate with NiFi and get JWT token.
+
+        Returns:
+            str: JWT token
+
+        Raises:
+            AuthenticationError: If authentication fails
+        """
+        session = self._ensure_session()
+        url = f"{self.base_url}/nifi-api/access/token"
+        data = {
+            "username": self.username,
+            "password": self.password
+        }
+
+        async with self._semaphore:
+            async with session.post(url, data=data) as response:
+                text = await response.text()
+
+        if response.status in (200, 201):
+            self.token = text
+            return self.token
+        else:
+            raise AuthenticationError(f"Authentication failed: {response.status} - {text}")
+
+    async def get_headers(self):
+        """
+        Get HTTP headers with authorization token.
+
+        Concurrent callers share a single authentication request.
+
+        Returns:
+            dict: Headers dictionary
+        """
+        if not self.token:
+            self._ensure_session()
+            async with self._auth_lock:
+                if not self.token:
+                    await self.authenticate()
+
+        return {
+            "Authorization": f"Bearer {self.token}",
+            "Content-Type": "application/json"
+        }
+
+    async def _request(self, method, endpoint, data=None, params=None, timeout=30):
+        """
+        Send a request to the NiFi API, bounded by the in-flight semaphore.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (e.g., "/flow/process-groups/root")
+            data: JSON request body (optional)
+            params: Query string parameters (optional)
+            timeout: Request timeout in seconds (default: 30)
+
+        Like NiFiClient, a request rejected with HTTP 401 (expired or revoked
+        token) is sent once more after re-authenticating; concurrent
+        requests rejected with the same token share one login.
+
+        Returns:
+            dict: Response JSON
+
+        Raises:
+            APIError: If request fails; status_code is set when NiFi responded
+        """
+        session = self._ensure_session()
+        url = f"{self.base_url}/nifi-api{endpoint}"
+        for attempt in range(2):
+            headers = await self.get_headers()
+            try:
+                async with self._semaphore:
+                    async with session.request(method, url, json=data, params=params, headers=headers,
+                                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                        if response.status == 401 and not attempt:
+                            # Only drop the token if no other request has replaced it yet
+                            if self.token == headers["Authorization"][len("Bearer "):]:
+                                self.token = None
+                            continue
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+            except aiohttp.ClientResponseError as e:
+                raise APIError(f"{method} {endpoint} failed: {e}", status_code=e.status) from e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise APIError(f"{method} {endpoint} failed: {e}") from e
+
+    async def get(self, endpoint, timeout=30):
+        """
+        Make GET request to NiFi API.
+
+        Args:
+            endpoint: API endpoint (e.g., "/flow/process-groups/root")
+            timeout: Request timeout in seconds (default: 30)
+
+        Returns:
+            dict: Response JSON
+        """
+        return await self._request("GET", endpoint, timeout=timeout)
+
+    async def post(self, endpoint, data, timeout=30):
+        """
+        Make POST request to NiFi API.
+
+        Args:
+            endpoint: API endpoint
+            data: Request body dict
+            timeout: Request timeout in seconds (default: 30)
+
+        Returns:
+            dict: Response JSON
+        """
+        return await self._request("POST", endpoint, data=data, timeout=timeout)
+
+    async def put(self, endpoint, data, timeout=30):
+        """
+        Make PUT request to NiFi API.
+
+        Args:
+            endpoint: API endpoint
+            data: Request body dict
+            timeout: Request timeout in seconds (default: 30)
+
+        Returns:
+            dict: Response JSON
+        """
+        return await self._request("PUT", endpoint, data=data, timeout=timeout)
+
+    async def delete(self, endpoint, params=None, timeout=30):
+        """
+        Make DELETE request to NiFi API.
+
+        Args:
+            endpoint: API endpoint
+            params: Query string parameters, e.g. {"version": 3} (optional)
+            timeout: Request timeout in seconds (default: 30)
+
+        Returns:
+            dict: Response JSON
+        """
+        return await self._request("DELETE", endpoint, params=params, timeout=timeout)
+
+    async def get_root_process_group_id(self):
+        """
+        Get the root process group ID.
+
+        Returns:
+            str: Root process group ID
+        """
+        if not self.root_pg_id:
+            response = await self.get("/flow/process-groups/root")
+            self.root_pg_id = response["processGroupFlow"]["id"]
+
+        return self.root_pg_id
+
+    async def get_nifi_version(self):
+        """
+        Get NiFi version information.
+
+        Returns:
+            str: NiFi version
+        """
+        response = await self.get("/flow/about")
+        return response["about"]["version"]
+
+
+class AsyncProcessor:
+    """
+    Async counterpart of Processor.
+    """
+
+    def __init__(self, client):
+        """
+        Initialize async Processor manager.
+
+        Args:
+            client: AsyncNiFiClient instance
+        """
+        self.client = client
+
+    async def create(self, processor_type, name, process_group_id=None, position=None, properties=None,
+                     scheduling_period="60 sec", auto_terminated_relationships=None):
+        """
+        Create a new processor.
+
+        Args:
+            processor_type: Processor type (e.g., "org.apache.nifi.processors.standard.GenerateFlowFile")
+            name: Processor name
+            process_group_id: Process group ID (default: root)
+            position: Position dict with x, y coordinates (default: {x: 300, y: 200})
+            properties: Processor properties dict
+            scheduling_period: Scheduling period (default: "60 sec")
+            auto_terminated_relationships: List of relationships to auto-terminate
+
+        Returns:
+            dict: Created processor response with ID
+        """
+        if not process_group_id:
+            process_group_id = await self.client.get_root_process_group_id()
+
+        data = processor_payload(processor_type, name, position, properties, scheduling_period,
+                                 auto_terminated_relationships)
+
+        return await self.client.post(f"/process-groups/{process_group_id}/processors", data)
+
+    async def get(self, processor_id):
+        """
+        Get processor information.
+
+        Args:
+            processor_id: Processor ID
+
+        Returns:
+            dict: Processor information
+        """
+        return await self.client.get(f"/processors/{processor_id}")
+
+    async def _set_state(self, processor_id, state, done_status, already_status):
+        proc_info = await self.get(processor_id)
+        revision = proc_info["revision"]["version"]
+
+        if proc_info["component"]["state"] == state:
+            return {"status": already_status, "processor": proc_info}
+
+        data = {
+            "revision": {"version": revision},
+            "state": state
+        }
+
+        response = await self.client.put(f"/processors/{processor_id}/run-status", data)
+        return {"status": done_status, "processor": response}
+
+    async def start(self, processor_id):
+        """
+        Start a processor.
+
+        Args:
+            processor_id: Processor ID
+
+        Returns:
+            dict: Status ("started" or "already_running") and processor information
+        """
+        return await self._set_state(processor_id, "RUNNING", "started", "already_running")
+
+    async def stop(self, processor_id):
+        """
+        Stop a processor.
+
+        Args:
+            processor_id: Processor ID
+
+        Returns:
+            dict: Status ("stopped" or "already_stopped") and processor information
+        """
+        return await self._set_state(processor_id, "STOPPED", "stopped", "already_stopped")
+
+    async def list_all(self, process_group_id=None):
+        """
+        List all processors in a process group.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+
+        Returns:
+            list: List of processors
+        """
+        if not process_group_id:
+            process_group_id = "root"
+
+        response = await self.client.get(f"/process-groups/{process_group_id}/processors")
+        return response.get("processors", [])
+
+    async def delete(self, processor_id):
+        """
+        Delete a processor (stops it first).
+
+        Args:
+            processor_id: Processor ID
+
+        Returns:
+            dict: Deletion response
+        """
+        await self.stop(processor_id)
+
+        proc_info = await self.get(processor_id)
+        revision = proc_info["revision"]["version"]
+
+        return await self.client.delete(f"/processors/{processor_id}", params={"version": revision})
+
+
+class AsyncFlow:
+    """
+    Async counterpart of Flow.
+    """
+
+    def __init__(self, client):
+        """
+        Initialize async Flow manager.
+
+        Args:
+            client: AsyncNiFiClient instance
+        """
+        self.client = client
+        self.processor = AsyncProcessor(client)
+        self.created_processors = []
+        self.created_connections = []
+
+    async def create_sample_flow(self, process_group_id=None):
+        """
+        Create a sample flow: GenerateFlowFile -> LogAttribute
+
+        Both processors are created concurrently, then connected.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+
+        Returns:
+            dict: Dictionary with created processor IDs and connection ID
+        """
+        if not process_group_id:
+            process_group_id = await self.client.get_root_process_group_id()
+
+        generate_proc, log_proc = await asyncio.gather(
+            self.processor.create(
+                processor_type="org.apache.nifi.processors.standard.GenerateFlowFile",
+                name="Generate Sample Data",
+                process_group_id=process_group_id,
+                position={"x": 300, "y": 200},
+                properties={
+                    "File Size": "1KB",
+                    "Batch Size": "1"
+                },
+                scheduling_period="60 sec"
+            ),
+            self.processor.create(
+                processor_type="org.apache.nifi.processors.standard.LogAttribute",
+                name="Log Sample Data",
+                process_group_id=process_group_id,
+                position={"x": 300, "y": 400},
+                properties={
+                    "Log Level": "info",
+                    "Log Payload": "true"
+                },
+                auto_terminated_relationships=["success"]
+            )
+        )
+        generate_id = generate_proc["id"]
+        log_id = log_proc["id"]
+        self.created_processors.extend([generate_id, log_id])
+
+        connection = await self.create_connection(
+            source_id=generate_id,
+            destination_id=log_id,
+            relationships=["success"],
+            process_group_id=process_group_id
+        )
+        connection_id = connection["id"]
+        self.created_connections.append(connection_id)
+
+        return {
+            "generate_id": generate_id,
+            "log_id": log_id,
+            "connection_id": connection_id,
+            "process_group_id": process_group_id
+        }
+
+    async def create_connection(self, source_id, destination_id, relationships, process_group_id=None):
+        """
+        Create a connection between two processors.
+
+        Args:
+            source_id: Source processor ID
+            destination_id: Destination processor ID
+            relationships: List of relationships (e.g., ["success"])
+            process_group_id: Process group ID (default: root)
+
+        Returns:
+            dict: Created connection response
+        """
+        if not process_group_id:
+            process_group_id = await self.client.get_root_process_group_id()
+
+        data = connection_payload(source_id, destination_id, relationships, process_group_id)
+        return await self.client.post(f"/process-groups/{process_group_id}/connections", data)
+
+    async def _run_all(self, operation, done_status, already_status):
+        results = await asyncio.gather(
+            *(operation(proc_id) for proc_id in self.created_processors),
+            return_exceptions=True
+        )
+
+        done, already, failed = [], [], []
+        for proc_id, result in zip(self.created_processors, results):
+            if isinstance(result, Exception):
+                failed.append(proc_id)
+            elif result["status"] == done_status:
+                done.append(proc_id)
+            elif result["status"] == already_status:
+                already.append(proc_id)
+
+        return done, already, failed
+
+    async def start_all_processors(self):
+        """
+        Start all processors created by this flow instance concurrently.
+
+        Returns:
+            dict: Summary of started, already running, and failed processors
+        """
+        started, already_running, failed = await self._run_all(
+            self.processor.start, "started", "already_running")
+
+        return {
+            "started": started,
+            "already_running": already_running,
+            "failed": failed
+        }
+
+    async def stop_all_processors(self):
+        """
+        Stop all processors created by this flow instance concurrently.
+
+        Returns:
+            dict: Summary of stopped processors
+        """
+        stopped, already_stopped, failed = await self._run_all(
+            self.processor.stop, "stopped", "already_stopped")
+
+        return {
+            "stopped": stopped,
+            "already_stopped": already_stopped,
+            "failed": failed
+        }
@@ -0,0 +1,251 @@
+"""
+NiFi Token Management
+
+JWT-expiry-aware token handling and an optional file-backed token cache
+shared across CLI processes.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+def decode_jwt_expiry(token):
+    """
+    Read the ``exp`` claim from a JWT without verifying its signature.
+
+    Args:
+        token: JWT string
+
+    Returns:
+        float: Expiry as a Unix timestamp, or None if the token has no readable exp claim
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class TokenCache:
+    """
+    File-backed token cache keyed by NiFi URL and username.
+
+    The file is created with 0600 permissions (inside a 0700 directory) and
+    replaced atomically on every write.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize token cache.
+
+        Args:
+            path: Cache file path (e.g., ~/.cache/nifi-client/tokens.json)
+        """
+        self.path = os.path.expanduser(path)
+
+    @staticmethod
+    def key(base_url, username):
+        """
+        Build the cache key for a NiFi URL and user.
+
+        Args:
+            base_url: NiFi base URL
+            username: NiFi username
+
+        Returns:
+            str: Cache key
+        """
+        return hashlib.sha256(f"{base_url}\n{username}".encode("utf-8")).hexdigest()
+
+    def _read(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key):
+        """
+        Load a cached token.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            str: Cached token, or None if missing
+        """
+        entry = self._read().get(key)
+        return entry.get("token") if isinstance(entry, dict) else None
+
+    def _write(self, entries):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tokens-")
+        try:
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def store(self, key, token, expires=None):
+        """
+        Store a token, dropping entries that have already expired.
+
+        Args:
+            key: Cache key
+            token: JWT string
+            expires: Expiry Unix timestamp (optional)
+        """
+        now = time.time()
+        entries = {k: v for k, v in self._read().items()
+                   if isinstance(v, dict) and (v.get("expires") is None or v["expires"] > now)}
+        entries[key] = {"token": token, "expires": expires}
+        self._write(entries)
+
+    def remove(self, key):
+        """
+        Remove a cached token.
+
+        Args:
+            key: Cache key
+        """
+        entries = self._read()
+        if entries.pop(key, None) is not None:
+            self._write(entries)
+
+
+class TokenManager:
+    """
+    Hands out a valid token, refreshing it shortly before it expires.
+
+    Concurrent callers share a single refresh. Tokens without a readable
+    ``exp`` claim are used until the server rejects them.
+    """
+
+    def __init__(self, authenticate, refresh_margin=60, cache=None, cache_key=None):
+        """
+        Initialize token manager.
+
+        Args:
+            authenticate: Callable performing a login and returning a fresh token
+            refresh_margin: Seconds before expiry at which the token is refreshed (default: 60)
+            cache: TokenCache shared across processes (optional)
+            cache_key: Key of this client's entry in the cache (required with cache)
+        """
+        self._authenticate = authenticate
+        self.refresh_margin = refresh_margin
+        self.cache = cache
+        self.cache_key = cache_key
+        self.token = None
+        self.expires = None
+        self._lock = threading.Lock()
+
+    def is_valid(self, token=None, expires=None):
+        """
+        Check whether a token can still be used without refreshing.
+
+        Args:
+            token: Token to check (default: current token)
+            expires: Expiry of that token (default: current expiry)
+
+        Returns:
+            bool: True if the token exists and is not about to expire
+        """
+        if token is None:
+            token, expires = self.token, self.expires
+        if not token:
+            return False
+        return expires is None or expires - self.refresh_margin > time.time()
+
+    def get_token(self):
+        """
+        Get a valid token, loading it from the cache or authenticating if needed.
+
+        Returns:
+            str: JWT token
+        """
+        if self.is_valid():
+            return self.token
+
+        with self._lock:
+            if self.is_valid():
+                return self.token
+
+            if self.cache is not None:
+                cached = self.cache.load(self.cache_key)
+                if cached and self.is_valid(cached, decode_jwt_expiry(cached)):
+                    self.set_token(cached, persist=False)
+                    return self.token
+
+            return self._refresh()
+
+    def refresh(self):
+        """
+        Authenticate and store the new token.
+
+        Takes the same lock as get_token(), so it never races a refresh
+        there. If another thread obtained a new token while this one waited
+        for the lock, that token is returned instead of logging in again.
+
+        Returns:
+            str: JWT token
+        """
+        seen = self.token
+        with self._lock:
+            if self.token != seen and self.is_valid():
+                return self.token
+            return self._refresh()
+
+    def _refresh(self):
+        # Callers hold self._lock
+        self.set_token(self._authenticate())
+        return self.token
+
+    def set_token(self, token, persist=True):
+        """
+        Adopt a token obtained elsewhere (e.g. an explicit authenticate call).
+
+        Args:
+            token: JWT string
+            persist: Write the token to the cache, if configured (default: True)
+        """
+        self.token = token
+        self.expires = decode_jwt_expiry(token)
+
+        if persist and self.cache is not None:
+            try:
+                self.cache.store(self.cache_key, token, self.expires)
+            except OSError:
+                pass
+
+    def invalidate(self, token=None):
+        """
+        Discard the current token (and its cache entry) so the next call re-authenticates.
+
+        Args:
+            token: Only invalidate if the current token is still this one (optional)
+        """
+        with self._lock:
+            if token is not None and token != self.token:
+                return
+
+            self.token = None
+            self.expires = None
+
+            if self.cache is not None:
+                try:
+                    self.cache.remove(self.cache_key)
+                except OSError:
+                    pass
@@ -0,0 +1,158 @@
+"""
+NiFi Bulk Run-Status
+
+Starts or stops many processors concurrently using a worker pool.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+from .processor import Processor
+
+
+# state -> (Processor method, done status, already status, done label, already label)
+RUN_STATE_ACTIONS = {
+    "RUNNING": ("start", "started", "already_running", "Started", "Already running"),
+    "STOPPED": ("stop", "stopped", "already_stopped", "Stopped", "Already stopped"),
+}
+
+
+def format_result(result):
+    """
+    Format a single bulk result the way the CLI and Flow summaries print it.
+
+    Args:
+        result: Result dict from BulkRunStatus.run
+
+    Returns:
+        str: Printable line
+    """
+    method, done, already, done_label, already_label = RUN_STATE_ACTIONS[result["state"]]
+
+    if result["status"] == done:
+        return f"  ✓ {done_label}: {result['name']}"
+    elif result["status"] == already:
+        return f"  ⚠ {already_label}: {result['name']}"
+    return f"  ✗ Failed to {method} {result['name']}: {result['error']}"
+
+
+def summarize(results, state):
+    """
+    Group result IDs by outcome.
+
+    Args:
+        results: List of result dicts from BulkRunStatus.run
+        state: Target state ("RUNNING" or "STOPPED")
+
+    Returns:
+        dict: Processor IDs keyed by outcome, e.g. {"started": [...], "already_running": [...], "failed": [...]}
+    """
+    method, done, already, done_label, already_label = RUN_STATE_ACTIONS[state]
+    summary = {done: [], already: [], "failed": []}
+
+    for result in results:
+        summary[result["status"]].append(result["id"])
+
+    return summary
+
+
+def format_summary(summary, state):
+    """
+    Format the one-line summary printed after a bulk run.
+
+    Args:
+        summary: Dict returned by summarize()
+        state: Target state ("RUNNING" or "STOPPED")
+
+    Returns:
+        str: Printable summary line
+    """
+    method, done, already, done_label, already_label = RUN_STATE_ACTIONS[state]
+    return (f"Summary: {len(summary[done])} {done.replace('_', ' ')}, "
+            f"{len(summary[already])} {already.replace('_', ' ')}, {len(summary['failed'])} failed")
+
+
+class BulkRunStatus:
+    """
+    Changes the run status of many processors using a pool of workers.
+
+    Each worker performs the usual Processor.start/stop, so per-processor
+    semantics (already running, already stopped) are unchanged.
+    """
+
+    def __init__(self, client, concurrency=8):
+        """
+        Initialize bulk run-status engine.
+
+        Args:
+            client: NiFiClient instance
+            concurrency: Number of processors updated in parallel (default: 8)
+        """
+        self.processor = Processor(client)
+        self.concurrency = max(1, concurrency)
+
+    def run(self, processors, state, on_result=None):
+        """
+        Move every processor to the target state.
+
+        Args:
+            processors: Processor IDs or processor entities (dicts with "id" and "component");
+                any iterable, including a generator such as Walker.processors()
+            state: Target state ("RUNNING" or "STOPPED")
+            on_result: Optional callback invoked with each result as soon as it completes
+
+        Returns:
+            list: One result dict per processor, in input order, with keys
+                id, name, state, status ("started", "already_running", ... or "failed") and error
+        """
+        method, done, already, done_label, already_label = RUN_STATE_ACTIONS[state]
+        operation = getattr(self.processor, method)
+        targets = []
+        results = []
+        finished = queue.SimpleQueue()
+
+        def report(index, future):
+            proc_id, name = targets[index]
+            result = {"id": proc_id, "name": name or proc_id, "state": state, "status": "failed", "error": None}
+
+            try:
+                response = future.result()
+                result["status"] = response["status"]
+                if not name:
+                    result["name"] = response["processor"]["component"]["name"]
+            except Exception as e:
+                result["error"] = e
+
+            results[index] = result
+            if on_result:
+                on_result(result)
+
+        def drain():
+            while True:
+                try:
+                    report(*finished.get_nowait())
+                except queue.Empty:
+                    return
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            # Submit while iterating so work starts before a streamed listing finishes,
+            # and report whatever has finished between items so results stream too
+            for proc in processors:
+                proc_id, name = self._target(proc)
+                index = len(targets)
+                targets.append((proc_id, name))
+                results.append(None)
+                future = pool.submit(operation, proc_id)
+                future.add_done_callback(lambda future, index=index: finished.put((index, future)))
+                drain()
+
+            for _ in range(sum(result is None for result in results)):
+                report(*finished.get())
+
+        return results
+
+    @staticmethod
+    def _target(proc):
+        if isinstance(proc, dict):
+            return proc["id"], proc.get("component", {}).get("name")
+        return proc, None
@@ -0,0 +1,227 @@
+"""
+NiFi Response Cache
+
+Opt-in read-through cache for GET responses, with per-endpoint TTLs, LRU
+eviction and invalidation when a mutation touches a cached resource.
+"""
+
+import fnmatch
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# Endpoint patterns (fnmatch) -> seconds. Live status is never cached so
+# polling loops always see fresh state.
+DEFAULT_TTLS = {
+    "/flow/about": 3600,
+    "*/status": 0,
+    "*/status?*": 0,
+    "/system-diagnostics*": 0,
+    "/flowfile-queues/*": 0,
+}
+
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+def resource_ids(endpoint):
+    """
+    Return the resource IDs named in an endpoint path.
+
+    Component IDs are UUIDs; the "root" alias is included as well, so
+    "/process-groups/root/processors" yields {"root"}.
+
+    Args:
+        endpoint: API endpoint
+
+    Returns:
+        set: IDs in the path
+    """
+    path = endpoint.split("?", 1)[0]
+    ids = set(_UUID.findall(path))
+    if "root" in path.split("/"):
+        ids.add("root")
+    return ids
+
+
+def _entity_ids(entity, ids):
+    if not isinstance(entity, dict):
+        return
+    if isinstance(entity.get("id"), str):
+        ids.add(entity["id"])
+    component = entity.get("component")
+    if isinstance(component, dict) and component.get("parentGroupId"):
+        ids.add(component["parentGroupId"])
+
+
+def response_ids(result):
+    """
+    Return the IDs a response describes: its own entity, its parent group and,
+    for listings, every listed entity and their parent groups.
+
+    Args:
+        result: Decoded response JSON
+
+    Returns:
+        set: IDs in the response
+    """
+    ids = set()
+    if not isinstance(result, dict):
+        return ids
+
+    _entity_ids(result, ids)
+    flow = result.get("processGroupFlow")
+    if isinstance(flow, dict):
+        ids.update(value for value in (flow.get("id"), flow.get("parentGroupId")) if value)
+        result = flow.get("flow", {})
+
+    for value in result.values():
+        if isinstance(value, list):
+            for entity in value:
+                _entity_ids(entity, ids)
+
+    return ids
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of GET responses keyed by endpoint.
+
+    Each entry is tagged with the resource IDs in its endpoint and response.
+    Mutations invalidate every entry sharing an ID with the mutated resource
+    or its parent group, so a cached processor, its group listing and the
+    group's flow are all dropped when the processor changes.
+
+    Cached responses are shared between callers and must not be modified.
+    """
+
+    def __init__(self, max_entries=1024, default_ttl=5.0, ttls=None):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum cached responses; least recently used are evicted (default: 1024)
+            default_ttl: Seconds a response stays fresh when no pattern matches (default: 5)
+            ttls: Endpoint pattern -> seconds, checked in order before DEFAULT_TTLS;
+                a TTL of 0 disables caching for matching endpoints (optional)
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttls = dict(ttls or {})
+        for pattern, ttl in DEFAULT_TTLS.items():
+            self.ttls.setdefault(pattern, ttl)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint):
+        """
+        Return how long responses for an endpoint stay fresh.
+
+        Args:
+            endpoint: API endpoint
+
+        Returns:
+            float: Seconds (0 means not cached)
+        """
+        for pattern, ttl in self.ttls.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return ttl
+        return self.default_ttl
+
+    def get(self, endpoint):
+        """
+        Return a fresh cached response, counting the hit or miss.
+
+        Args:
+            endpoint: API endpoint
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[endpoint]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(endpoint)
+            self.hits += 1
+            return entry[1]
+
+    def store(self, endpoint, result):
+        """
+        Cache a response if its endpoint has a TTL.
+
+        Args:
+            endpoint: API endpoint
+            result: Decoded response JSON
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        tags = resource_ids(endpoint) | response_ids(result)
+        with self._lock:
+            self._entries[endpoint] = (time.monotonic() + ttl, result, tags)
+            self._entries.move_to_end(endpoint)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, ids):
+        """
+        Drop every entry tagged with any of the given IDs.
+
+        Args:
+            ids: Resource or group IDs touched by a mutation
+
+        Returns:
+            int: Entries dropped
+        """
+        ids = set(ids)
+        if not ids:
+            return 0
+
+        with self._lock:
+            stale = [endpoint for endpoint, entry in self._entries.items() if entry[2] & ids]
+            for endpoint in stale:
+                del self._entries[endpoint]
+            self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self):
+        """Drop every cached response (counters are kept)."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return cache counters for tuning.
+
+        Returns:
+            dict: hits, misses, hit_ratio, evictions, invalidations, size and max_entries
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
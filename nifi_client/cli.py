@@ -5,11 +5,13 @@ NiFi REST API Client - Command Line Interface
 Simple CLI for managing NiFi flows from the command line.
 """
 
+import argparse
+import json
+import shlex
 import sys
 import os
-from .client import NiFiClient
-from .flow import Flow
-from .processor import Processor
+import threading
+import time
 
 
 def print_usage():
@@ -23,38 +25,237 @@ Usage:
 Commands:
     setup          - Check if NiFi is ready and authenticate
     create-flow    - Create sample flow (GenerateFlowFile -> LogAttribute)
+    apply SPEC     - Deploy a YAML/JSON flow spec, changing only what differs
+    upload FILE    - Create a new process group from a flow definition or
+                     spec in one request
     start-flow     - Start all processors in the flow
     stop-flow      - Stop all processors in the flow
     list           - List all processors
+    metrics serve  - Serve flow and JVM metrics for Prometheus
+    queues         - Show the connections closest to backpressure
+    teardown       - Stop a process group and delete everything in it
+    snapshot export FILE - Save a process group tree to a compressed snapshot
+    snapshot import FILE - Recreate a snapshot inside a process group
+    find QUERY     - Search components by name, type, group or property
+                     using a local index
     version        - Show NiFi version
+    shell          - Interactive prompt running commands with one
+                     long-lived, authenticated client
+    batch FILE     - Run the commands in FILE ("-" for stdin), one per
+                     line, with one long-lived client
+
+Global Options:
+    --profile        - After the command, print per-endpoint request
+                       counts, latency and time per phase (to stderr)
+    --targets NAMES  - Run the command on fleet targets concurrently:
+                       comma-separated names, or "all" (setup, version,
+                       list, start-flow and stop-flow)
+    --fleet FILE     - Fleet file listing the targets (default:
+                       $NIFI_FLEET or ~/.config/nifi-client/fleet.yaml)
+
+Options (list):
+    --pg ID          - Process group to list (default: root)
+    --recursive      - Include nested process groups
+    --stream         - Decode responses incrementally, printing each
+                       processor as it arrives (for very large flows)
+
+Options (start-flow, stop-flow):
+    --pg ID          - Process group to act on (default: root)
+    --recursive      - Include processors in nested process groups
+    --concurrency N  - Processors updated in parallel (default: 8)
+    --stream         - Print each result as soon as it completes
+    --whole-group    - Schedule the whole group recursively in one API call
+    --no-wait        - With --whole-group, don't wait for the target state
+    --timeout SECS   - With --whole-group, seconds to wait (default: 60)
+
+Options (apply):
+    --pg ID          - Process group to deploy into (default: root)
+    --concurrency N  - Components changed in parallel (default: 16)
+    --dry-run        - Print the plan without changing anything
+    --prune          - Also delete components that are not in the spec
+
+Options (upload):
+    --pg ID          - Parent process group (default: root)
+    --name NAME      - Name of the new group (default: from the file)
+    --output FILE    - Also write the flow definition JSON to FILE
+    --dry-run        - Build and check the definition without uploading
+    --no-validate    - Skip the check against installed processor types (the
+                       definition itself is always checked)
+
+Options (metrics serve):
+    --host HOST      - Interface to listen on (default: 127.0.0.1)
+    --port N         - Port to listen on (default: 9403)
+    --interval SECS  - Seconds between polls (default: 15)
+    --history N      - Samples kept per metric (default: 60)
+    --pg ID          - Process group to monitor recursively (default: root)
+
+Options (teardown):
+    --pg ID          - Process group to empty; required, "root" empties
+                       the whole canvas
+    --delete-group   - Also delete the group itself (controller services,
+                       labels and remote process groups are not removed
+                       and block deleting the groups holding them)
+    --concurrency N  - Requests in flight at once (default: 16)
+    --timeout SECS   - Seconds to wait for the stop and each queue drop
+                       (default: 60)
+
+Options (snapshot export, snapshot import):
+    --pg ID          - Group to export, or to import into (default: root)
+    --concurrency N  - Groups read or components created in parallel
+                       (default: 16)
+
+Options (find):
+    QUERY            - Terms that must all match: words, name:, type:,
+                       group:, kind:, prop:NAME or prop:NAME=VALUE; a
+                       trailing * matches by prefix (e.g. type:Put*)
+    --pg ID          - Process group tree to index (default: root)
+    --kind KIND      - Only show this kind (processor, group, connection,
+                       input_port, output_port); repeatable
+    --limit N        - Show at most N results
+    --refresh        - Refresh the index before searching
+    --max-age SECS   - Refresh first if the index is older (default: 300)
+    --index FILE     - Index file (default: ~/.cache/nifi-client/index/)
+    --concurrency N  - Groups fetched in parallel on refresh (default: 16)
+
+Options (batch):
+    --keep-going     - Run the remaining commands after one fails
+                       (default: stop at the first failure)
+
+Options (queues):
+    --pg ID          - Process group to monitor recursively (default: root)
+    --top N          - Connections shown (default: 10)
+    --watch          - Keep polling, redrawing only rows that change
+    --interval SECS  - With --watch, seconds between polls (default: 5)
 
 Environment Variables:
     NIFI_URL       - NiFi URL (default: https://localhost:8443)
     NIFI_USERNAME  - Username (default: admin)
     NIFI_PASSWORD  - Password (default: adminadminadmin)
+    NIFI_TOKEN_CACHE - Token cache file reused across runs (optional,
+                       e.g. ~/.cache/nifi-client/tokens.json)
+    NIFI_READ_RATE   - Max GET requests per second (optional)
+    NIFI_WRITE_RATE  - Max POST/PUT/DELETE requests per second (optional)
+    NIFI_ADAPTIVE_RATE - Set to 1 to slow down while NiFi latency or
+                       errors are high (needs one of the rates above)
+    NIFI_FLEET       - Fleet file used by --targets (.yaml or .json)
 
 Examples:
     python -m nifi_client.cli setup
     python -m nifi_client.cli create-flow
     python -m nifi_client.cli start-flow
+    python -m nifi_client.cli stop-flow --concurrency 32 --stream
+    python -m nifi_client.cli start-flow --whole-group
+    python -m nifi_client.cli apply flows/ingest.yaml
+    python -m nifi_client.cli upload flows/ingest.yaml --name Ingest
+    python -m nifi_client.cli metrics serve --port 9403 --interval 15
+    python -m nifi_client.cli queues --watch --top 20
+    python -m nifi_client.cli teardown --pg 0a1b2c3d-... --delete-group
+    python -m nifi_client.cli snapshot export ingest.snapshot.gz --pg 0a1b2c3d-...
+    python -m nifi_client.cli snapshot import ingest.snapshot.gz --pg 4e5f6a7b-...
+    python -m nifi_client.cli start-flow --recursive --profile
+    python -m nifi_client.cli stop-flow --whole-group --targets all
+    python -m nifi_client.cli version --targets east,west --fleet fleet.yaml
+    python -m nifi_client.cli find type:PutFile prop:Directory=/data
+    python -m nifi_client.cli shell
+    python -m nifi_client.cli batch nightly.txt --keep-going
+    printf 'stop-flow --whole-group\\nlist\\n' | python -m nifi_client.cli batch -
     """)
 
 
-def get_client():
+# LatencyHistogram recording every client the current command creates, set by --profile
+_profiler = None
+
+# Clients kept alive between the commands of a shell or batch session, keyed by
+# fleet target name (None for the NIFI_URL instance); None outside a session
+_sessions = None
+_sessions_lock = threading.Lock()
+
+# Commands that can run on several fleet targets at once with --targets
+FLEET_COMMANDS = ("setup", "version", "list", "start-flow", "stop-flow")
+
+DEFAULT_FLEET = "~/.config/nifi-client/fleet.yaml"
+
+
+def env_rate_limit():
+    """
+    Build the rate limiter configured by NIFI_READ_RATE and NIFI_WRITE_RATE.
+
+    Returns:
+        RateLimiter: Limiter for the configured rates, or None if neither is set
+
+    Raises:
+        ValueError: If a rate is not a positive number
+    """
+    from .ratelimit import RateLimiter
+
+    rates = {}
+    for name, key in (("NIFI_READ_RATE", "read_rate"), ("NIFI_WRITE_RATE", "write_rate")):
+        value = os.getenv(name)
+        if not value:
+            continue
+        try:
+            rates[key] = float(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number of requests per second, got {value!r}") from None
+        if not rates[key] > 0:
+            raise ValueError(f"{name} must be positive, got {value!r}")
+
+    if not rates:
+        return None
+    return RateLimiter(read_rate=rates.get("read_rate", 1000), write_rate=rates.get("write_rate", 1000),
+                       adaptive=os.getenv("NIFI_ADAPTIVE_RATE") == "1")
+
+
+def get_client(concurrency=None):
     """
     Create NiFi client from environment variables or defaults.
 
+    Inside a --targets run, the client connects to the fleet target the
+    command is running for instead. During a shell or batch session the
+    first client for each instance is kept and returned again, so later
+    commands skip authentication and reuse its connections and cached
+    root group ID.
+
+    Args:
+        concurrency: Parallel requests the command will make; sizes the
+            connection pool so every worker keeps its connection (optional)
+
     Returns:
         NiFiClient: Configured client instance
     """
+    from .client import NiFiClient
+    from .fleet import current_target
+
+    target = current_target()
+    key = target.name if target is not None else None
+    if _sessions is not None:
+        with _sessions_lock:
+            if key in _sessions:
+                return _sessions[key]
+
     url = os.getenv("NIFI_URL", "https://localhost:8443")
     username = os.getenv("NIFI_USERNAME", "admin")
     password = os.getenv("NIFI_PASSWORD", "adminadminadmin")
-
-    return NiFiClient(base_url=url, username=username, password=password)
-
-
-def cmd_setup():
+    token_cache = os.getenv("NIFI_TOKEN_CACHE") or None
+
+    # A session client serves every later command, so size it for the busiest one
+    pool_maxsize = max(32 if _sessions is not None else 10, concurrency or 0)
+
+    rate_limit = env_rate_limit()
+    if target is not None:
+        client = target.client(pool_maxsize=pool_maxsize, rate_limit=rate_limit)
+    else:
+        client = NiFiClient(base_url=url, username=username, password=password, token_cache=token_cache,
+                            pool_maxsize=pool_maxsize, rate_limit=rate_limit)
+    if _profiler is not None:
+        _profiler.attach(client)
+    if _sessions is not None:
+        with _sessions_lock:
+            _sessions[key] = client
+    return client
+
+
+def cmd_setup(args):
     """Check if NiFi is ready and test authentication."""
     print("=" * 60)
     print(" NiFi Setup Check")
@@ -95,8 +296,10 @@ def cmd_setup():
         return 1
 
 
-def cmd_create_flow():
+def cmd_create_flow(args):
     """Create sample NiFi flow."""
+    from .flow import Flow
+
     print("=" * 60)
     print(" Create Sample Flow")
     print("=" * 60)
@@ -128,51 +331,342 @@ def cmd_create_flow():
         return 1
 
 
-def cmd_start_flow():
-    """Start all processors."""
+def cmd_apply(args):
+    """Plan and apply a declarative flow spec."""
+    from .client import NiFiError
+    from .deploy import Deployer
+    from .plan import Planner, format_operation
+    from .spec import load_spec
+
     print("=" * 60)
-    print(" Start Flow")
+    print(" Apply Flow Spec")
     print("=" * 60)
+    print()
 
-    client = get_client()
-    processor_mgr = Processor(client)
+    try:
+        spec = load_spec(args.spec)
+    except (OSError, NiFiError) as e:
+        print(f"✗ Failed to load spec: {e}")
+        return 1
+
+    client = get_client(args.concurrency)
 
     try:
-        # Get all processors
-        processors = processor_mgr.list_all()
+        plan = Planner(client, concurrency=args.concurrency).plan(spec, args.pg, prune=args.prune)
+    except Exception as e:
+        print(f"✗ Failed to plan: {e}")
+        return 1
 
-        if not processors:
-            print("\n✗ No processors found")
-            print("  Create a flow first: python -m nifi_client.cli create-flow")
+    operations = plan["operations"]
+    counts = {action: sum(1 for op in operations if op["action"] == action)
+              for action in ("create", "update", "delete")}
+
+    if not operations:
+        print("✓ Flow is up to date, nothing to do")
+        return 0
+
+    print(f"Plan: {counts['create']} to create, {counts['update']} to update, {counts['delete']} to delete")
+    print()
+
+    if args.dry_run:
+        for operation in operations:
+            print(f"  {format_operation(operation)}")
+        return 0
+
+    def on_done(operation, result, error):
+        if error is None:
+            print(f"  ✓ {format_operation(operation)}")
+        else:
+            print(f"  ✗ {format_operation(operation)}: {error}")
+
+    try:
+        outcome = Deployer(client, concurrency=args.concurrency).apply_plan(plan, on_done=on_done)
+    except Exception as e:
+        print(f"✗ Failed to apply spec: {e}")
+        return 1
+
+    print()
+    print(f"Summary: {len(outcome['applied'])} applied, {len(outcome['failed'])} failed")
+    return 1 if outcome["failed"] else 0
+
+
+def cmd_teardown(args):
+    """Stop a process group, drop its queues and delete its contents."""
+    from .teardown import Teardown
+
+    print("=" * 60)
+    print(" Teardown Process Group")
+    print("=" * 60)
+    print()
+
+    client = get_client(args.concurrency)
+
+    def on_done(key, result, error):
+        label = "drop queue of connection" if key[0] == "drop" else key[0].replace("_", " ")
+        if error is not None:
+            print(f"  ✗ {label} {key[1]}: {error}")
+
+    print(f"Stopping {args.pg} and deleting its contents...")
+    try:
+        outcome = Teardown(client, concurrency=args.concurrency, timeout=args.timeout).teardown(
+            args.pg, delete_group=args.delete_group, on_done=on_done)
+    except Exception as e:
+        print(f"✗ Teardown failed: {e}")
+        return 1
+
+    deleted = ", ".join(f"{count} {kind.replace('_', ' ')}{'s' if count != 1 else ''}"
+                        for kind, count in sorted(outcome["deleted"].items()))
+    print()
+    print(f"Summary: deleted {deleted or 'nothing'}; dropped {outcome['dropped']} FlowFiles; "
+          f"{len(outcome['failed'])} failed in {outcome['seconds']:.1f}s")
+    return 1 if outcome["failed"] else 0
+
+
+def cmd_snapshot(args):
+    """Export a process group tree to a snapshot file, or import one."""
+    from .client import NiFiError
+    from .snapshot import Snapshot
+
+    client = get_client(args.concurrency)
+    snapshot = Snapshot(client, concurrency=args.concurrency)
+
+    def counts(result):
+        return ", ".join(f"{count} {kind.replace('_', ' ')}{'s' if count != 1 else ''}"
+                         for kind, count in sorted(result.items()))
+
+    if args.action == "export":
+        print(f"Exporting {args.pg or 'root'} to {args.file}...")
+        try:
+            result = snapshot.export(args.file, args.pg)
+        except (OSError, NiFiError) as e:
+            print(f"✗ Export failed: {e}")
             return 1
+        seconds = result.pop("seconds")
+        print(f"✓ Exported {counts(result) or 'an empty group'} in {seconds:.1f}s")
+        return 0
 
-        print(f"\nFound {len(processors)} processors")
-        print()
+    def on_done(record, new_id, error):
+        if error is not None and not str(error).startswith("Skipped"):
+            print(f"  ✗ {record['kind'].replace('_', ' ')} {record.get('name') or record['id']}: {error}")
+
+    print(f"Importing {args.file} into {args.pg or 'root'}...")
+    try:
+        result = snapshot.restore(args.file, args.pg, on_done=on_done)
+    except NiFiError as e:
+        print(f"✗ Import failed: {e}")
+        return 1
 
-        started = 0
-        already_running = 0
-        failed = 0
+    print()
+    print(f"Summary: created {counts(result['created']) or 'nothing'}; {len(result['failed'])} failed "
+          f"in {result['seconds']:.1f}s")
+    return 1 if result["failed"] else 0
 
-        for proc in processors:
-            proc_id = proc["id"]
-            proc_name = proc["component"]["name"]
 
-            try:
-                result = processor_mgr.start(proc_id)
+def cmd_upload(args):
+    """Create a process group from a flow definition or spec in one upload."""
+    from .client import NiFiError
+    from .definition import definition_size, load_definition
+    from .flow import Flow
 
-                if result["status"] == "started":
-                    print(f"  ✓ Started: {proc_name}")
-                    started += 1
-                elif result["status"] == "already_running":
-                    print(f"  ⚠ Already running: {proc_name}")
-                    already_running += 1
+    print("=" * 60)
+    print(" Upload Flow Definition")
+    print("=" * 60)
+    print()
 
-            except Exception as e:
-                print(f"  ✗ Failed to start {proc_name}: {e}")
-                failed += 1
+    try:
+        definition = load_definition(args.file, args.name)
+    except (OSError, NiFiError) as e:
+        print(f"✗ Failed to load {args.file}: {e}")
+        return 1
+
+    size = definition_size(definition)
+    print("Definition: " + ", ".join(f"{count} {key}" for key, count in size.items() if count))
+
+    client = get_client()
+    flow = Flow(client)
+    try:
+        if args.dry_run:
+            problems = flow.check_definition(definition, installed=args.validate)
+            for problem in problems:
+                print(f"  ✗ {problem}")
+            result = 1 if problems else 0
+            print("✓ Definition is valid" if not problems else f"✗ {len(problems)} problem(s) found")
+        else:
+            started = time.monotonic()
+            group = flow.upload_definition(definition, name=args.name, process_group_id=args.pg,
+                                           validate=args.validate)
+            print(f"✓ Created process group {group['component']['name']} ({group['id']}) "
+                  f"in {time.monotonic() - started:.1f}s")
+            result = 0
+    except NiFiError as e:
+        print(f"✗ Upload failed: {e}")
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(definition, f, indent=2)
+        print(f"Definition written to {args.output}")
+    return result
 
+
+def cmd_find(args):
+    """Search the local component index, refreshing it from NiFi when stale."""
+    from .client import NiFiError
+    from .search import SearchIndex, format_record
+
+    client = get_client(args.concurrency)
+    index = SearchIndex(client, process_group_id=args.pg, path=args.index, concurrency=args.concurrency)
+
+    try:
+        loaded = index.load()
+        if args.refresh or not loaded or index.age is None or index.age > args.max_age:
+            print(f"{'Refreshing' if loaded else 'Building'} index of {args.pg or 'root'}...", file=sys.stderr)
+            counts = index.refresh()
+            print(f"  {counts['added']} added, {counts['updated']} updated, {counts['removed']} removed, "
+                  f"{counts['unchanged']} unchanged in {counts['seconds']:.1f}s", file=sys.stderr)
+            index.save()
+
+        started = time.perf_counter()
+        results = index.search(args.query, kinds=args.kind, limit=args.limit)
+        elapsed = time.perf_counter() - started
+    except (OSError, NiFiError) as e:
+        print(f"✗ Search failed: {e}")
+        return 1
+
+    for record in results:
+        print(format_record(record))
+    print()
+    print(f"Found {len(results)} of {len(index)} indexed components in {elapsed * 1000:.2f} ms "
+          f"(index refreshed {index.age:.0f}s ago)")
+    return 0 if results else 1
+
+
+def find_processors(client, processor_mgr, args):
+    """
+    Get the processors a command acts on.
+
+    With --recursive, returns a generator that walks the group tree so work
+    can start while nested groups are still being fetched.
+
+    Args:
+        client: NiFiClient instance
+        processor_mgr: Processor manager
+        args: Parsed CLI arguments (pg, recursive, concurrency)
+
+    Returns:
+        Iterable of processor entities, or None if the group has no processors
+        (a walked tree is only known to be empty once it has been consumed)
+    """
+    from .walker import Walker
+
+    if args.recursive:
+        print("\nWalking process group tree...")
         print()
-        print(f"Summary: {started} started, {already_running} already running, {failed} failed")
+        return Walker(client, args.concurrency).processors(args.pg)
+
+    # Get all processors
+    processors = processor_mgr.list_all(args.pg)
+
+    if not processors:
+        return None
+
+    print(f"\nFound {len(processors)} processors")
+    print()
+    return processors
+
+
+def run_processors(client, processors, state, args):
+    """
+    Move processors to a run state in parallel and print per-processor results.
+
+    Args:
+        client: NiFiClient instance
+        processors: Processor entities to update
+        state: Target state ("RUNNING" or "STOPPED")
+        args: Parsed CLI arguments (concurrency, stream)
+
+    Returns:
+        dict: Summary of processor IDs by outcome, or None (with nothing
+            printed) if there were no processors
+    """
+    from .bulk import BulkRunStatus, format_result, format_summary, summarize
+
+    on_result = (lambda result: print(format_result(result))) if args.stream else None
+    results = BulkRunStatus(client, args.concurrency).run(processors, state, on_result=on_result)
+    if not results:
+        return None
+
+    if not args.stream:
+        for result in results:
+            print(format_result(result))
+
+    summary = summarize(results, state)
+    print()
+    print(format_summary(summary, state))
+    return summary
+
+
+def schedule_group(client, state, args):
+    """
+    Schedule a whole process group with one API call and wait for the target state.
+
+    Args:
+        client: NiFiClient instance
+        state: Target state ("RUNNING" or "STOPPED")
+        args: Parsed CLI arguments (pg, wait, timeout)
+
+    Returns:
+        int: Exit code
+    """
+    from .process_group import ProcessGroup
+
+    process_group = ProcessGroup(client)
+    pg_id = process_group.resolve_id(args.pg)
+
+    print(f"\nScheduling process group {pg_id} to {state}...")
+    process_group.schedule(pg_id, state)
+
+    if not args.wait:
+        print(f"✓ Requested {state}")
+        return 0
+
+    result = process_group.wait_for_state(pg_id, state, timeout=args.timeout)
+    if result.invalid:
+        print(f"⚠ {len(result.invalid)} processors are invalid or disabled and cannot run")
+    if result:
+        print(f"✓ All processors are {state} ({result.polls} polls, {result.seconds:.1f}s)")
+        return 0
+
+    print(f"✗ Process group did not reach {state} within {args.timeout}s: "
+          f"{len(result.pending)} processors pending, {result.threads} threads still active")
+    return 1
+
+
+def cmd_start_flow(args):
+    """Start all processors."""
+    from .processor import Processor
+
+    print("=" * 60)
+    print(" Start Flow")
+    print("=" * 60)
+
+    client = get_client(args.concurrency)
+    processor_mgr = Processor(client)
+
+    try:
+        if args.whole_group:
+            result = schedule_group(client, "RUNNING", args)
+            if result == 0:
+                print()
+                print("Flow is now running!")
+            return result
+
+        processors = find_processors(client, processor_mgr, args)
+        summary = run_processors(client, processors, "RUNNING", args) if processors is not None else None
+        if summary is None:
+            print("\n✗ No processors found")
+            print("  Create a flow first: python -m nifi_client.cli create-flow")
+            return 1
         print()
         print("Flow is now running!")
         return 0
@@ -184,50 +678,26 @@ def cmd_start_flow():
         return 1
 
 
-def cmd_stop_flow():
+def cmd_stop_flow(args):
     """Stop all processors."""
+    from .processor import Processor
+
     print("=" * 60)
     print(" Stop Flow")
     print("=" * 60)
 
-    client = get_client()
+    client = get_client(args.concurrency)
     processor_mgr = Processor(client)
 
     try:
-        # Get all processors
-        processors = processor_mgr.list_all()
+        if args.whole_group:
+            return schedule_group(client, "STOPPED", args)
 
-        if not processors:
+        processors = find_processors(client, processor_mgr, args)
+        summary = run_processors(client, processors, "STOPPED", args) if processors is not None else None
+        if summary is None:
             print("\n✗ No processors found")
             return 1
-
-        print(f"\nFound {len(processors)} processors")
-        print()
-
-        stopped = 0
-        already_stopped = 0
-        failed = 0
-
-        for proc in processors:
-            proc_id = proc["id"]
-            proc_name = proc["component"]["name"]
-
-            try:
-                result = processor_mgr.stop(proc_id)
-
-                if result["status"] == "stopped":
-                    print(f"  ✓ Stopped: {proc_name}")
-                    stopped += 1
-                elif result["status"] == "already_stopped":
-                    print(f"  ⚠ Already stopped: {proc_name}")
-                    already_stopped += 1
-
-            except Exception as e:
-                print(f"  ✗ Failed to stop {proc_name}: {e}")
-                failed += 1
-
-        print()
-        print(f"Summary: {stopped} stopped, {already_stopped} already stopped, {failed} failed")
         return 0
 
     except Exception as e:
@@ -235,8 +705,31 @@ def cmd_stop_flow():
         return 1
 
 
-def cmd_list():
+def print_processor(proc, group=None):
+    """
+    Print one processor in the list format.
+
+    Args:
+        proc: ProcessorEntity
+        group: Group path to show (optional)
+    """
+    state_icon = "▶" if proc.running else "■"
+    print(f"  {state_icon} {proc.name}")
+    print(f"    Type:  {proc.short_type}")
+    if group is not None:
+        print(f"    Group: {group}")
+    print(f"    ID:    {proc.id}")
+    print(f"    State: {proc.state}")
+    print()
+
+
+def cmd_list(args):
     """List all processors."""
+    from .entities import ProcessorEntity
+    from .processor import Processor
+    from .spec import group_label
+    from .walker import Walker
+
     print("=" * 60)
     print(" List Processors")
     print("=" * 60)
@@ -246,7 +739,29 @@ def cmd_list():
     processor_mgr = Processor(client)
 
     try:
-        processors = processor_mgr.list_all()
+        if args.recursive:
+            found = 0
+            walker = Walker(client, stream=args.stream)
+            for proc, path in walker.entities(args.pg, kinds=("processor",), raw="drop"):
+                print_processor(proc, group_label(path))
+                found += 1
+
+            if not found:
+                print("No processors found")
+            else:
+                print(f"Found {found} processors")
+            return 0
+
+        if args.stream:
+            found = 0
+            for proc in processor_mgr.list_all(args.pg, stream=True):
+                print_processor(ProcessorEntity(proc, raw="drop"))
+                found += 1
+
+            print(f"Found {found} processors" if found else "No processors found")
+            return 0
+
+        processors = processor_mgr.list_all(args.pg)
 
         if not processors:
             print("No processors found")
@@ -256,17 +771,7 @@ def cmd_list():
         print()
 
         for proc in processors:
-            proc_id = proc["id"]
-            name = proc["component"]["name"]
-            proc_type = proc["component"]["type"].split(".")[-1]
-            state = proc["component"]["state"]
-
-            state_icon = "▶" if state == "RUNNING" else "■"
-            print(f"  {state_icon} {name}")
-            print(f"    Type:  {proc_type}")
-            print(f"    ID:    {proc_id}")
-            print(f"    State: {state}")
-            print()
+            print_processor(ProcessorEntity(proc, raw="drop"))
 
         return 0
 
@@ -275,7 +780,98 @@ def cmd_list():
         return 1
 
 
-def cmd_version():
+def cmd_metrics(args):
+    """Serve NiFi metrics in the Prometheus text format."""
+    from .metrics import MetricsPoller, MetricsServer
+
+    client = get_client()
+    poller = MetricsPoller(client, process_group_id=args.pg, history=args.history)
+
+    try:
+        server = MetricsServer(poller, host=args.host, port=args.port, interval=args.interval)
+    except OSError as e:
+        print(f"✗ Cannot listen on {args.host}:{args.port}: {e}")
+        return 1
+
+    host, port = server.address
+    print(f"Serving metrics on http://{host}:{port}/metrics (polling every {args.interval}s, Ctrl+C to stop)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print("Stopped")
+
+    return 0
+
+
+class LineDisplay:
+    """
+    Keeps a block of lines on screen and rewrites only those that change.
+
+    On a terminal, changed lines are redrawn in place with ANSI cursor
+    movement. Otherwise only the changed lines are printed, prefixed with
+    their row number.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.tty = self.stream.isatty()
+        self.lines = []
+
+    def update(self, lines):
+        if self.tty and not self.lines:
+            self.stream.write("\x1b[2J\x1b[H")
+
+        for row in range(max(len(lines), len(self.lines))):
+            line = lines[row] if row < len(lines) else ""
+            previous = self.lines[row] if row < len(self.lines) else None
+            if line == previous:
+                continue
+            if self.tty:
+                self.stream.write(f"\x1b[{row + 1};1H\x1b[2K{line}")
+            elif line or previous:
+                self.stream.write(f"[{row:>3}] {line}\n")
+
+        if self.tty:
+            self.stream.write(f"\x1b[{len(lines) + 1};1H")
+        self.stream.flush()
+        self.lines = list(lines)
+
+
+def cmd_queues(args):
+    """Show the connections closest to backpressure."""
+    from .queues import QUEUE_HEADER, QueueMonitor, format_queue
+
+    client = get_client()
+    monitor = QueueMonitor(client, process_group_id=args.pg)
+
+    def render():
+        queues = monitor.poll()
+        lines = [f"Queues in {args.pg}: {len(queues)} connections, "
+                 f"{sum(queue['queued'] for queue in queues)} FlowFiles queued", "", QUEUE_HEADER]
+        lines.extend(format_queue(queue) for queue in monitor.hottest(args.top, queues))
+        return lines
+
+    try:
+        if not args.watch:
+            print("\n".join(render()))
+            return 0
+
+        display = LineDisplay()
+        while True:
+            display.update(render())
+            time.sleep(args.interval)
+
+    except KeyboardInterrupt:
+        print()
+        return 0
+    except Exception as e:
+        print(f"✗ Failed to read queues: {e}")
+        return 1
+
+
+def cmd_version(args):
     """Show NiFi version."""
     client = get_client()
 
@@ -288,22 +884,347 @@ def cmd_version():
         return 1
 
 
-def main():
+def run_fleet(command, handler, args, names, path):
+    """
+    Run a command on several fleet targets concurrently and merge the output.
+
+    Each target's output is printed as one block as soon as it finishes,
+    followed by a summary of every target.
+
+    Args:
+        command: Command name
+        handler: Command function
+        args: Parsed CLI arguments
+        names: Comma-separated target names, or "all"
+        path: Fleet file
+
+    Returns:
+        int: Exit code, 0 only if the command succeeded on every target
+    """
+    from .client import NiFiError
+    from .fleet import load_fleet
+
+    if command not in FLEET_COMMANDS:
+        print(f"✗ {command} does not support --targets (supported: {', '.join(FLEET_COMMANDS)})")
+        return 1
+
+    try:
+        fleet = load_fleet(path)
+        targets = fleet.select(names)
+    except (OSError, NiFiError) as e:
+        print(f"✗ Failed to load fleet: {e}")
+        return 1
+
+    print("=" * 60)
+    print(f" Fleet: {command} on {len(targets)} target{'s' if len(targets) != 1 else ''}")
+    print("=" * 60)
+    print()
+
+    def status(result):
+        if result.timed_out:
+            return "⚠", f"timed out after {result.target.timeout}s"
+        if result.error is not None:
+            return "✗", f"error: {result.error}"
+        if result.value:
+            return "✗", f"exit code {result.value}"
+        return "✓", "ok"
+
+    def on_done(result):
+        print(f"--- {result.target.name} ({result.target.url}) ".ljust(60, "-"))
+        if result.output.strip():
+            print(result.output.rstrip())
+        if not result.ok:
+            print(" ".join(status(result)))
+        print()
+
+    started = time.monotonic()
+    results = fleet.run(lambda target: handler(args), [target.name for target in targets], capture=True,
+                        on_done=on_done)
+
+    width = max(len(target.name) for target in targets)
+    failed = sum(1 for result in results if status(result)[0] != "✓")
+    print("=" * 60)
+    print(f" Fleet summary: {len(results) - failed} ok, {failed} failed in {time.monotonic() - started:.1f}s")
+    print("=" * 60)
+    for result in results:
+        icon, text = status(result)
+        print(f"  {icon} {result.target.name:<{width}}  {result.seconds:6.1f}s  {text}")
+    return 1 if failed else 0
+
+
+def run_session(lines, interactive=False, keep_going=False):
+    """
+    Run CLI commands one line at a time, sharing clients between them.
+
+    Blank lines and lines starting with # are skipped; "exit" or "quit"
+    ends the session. Clients created by one command are reused by the
+    next, then closed when the session ends.
+
+    Args:
+        lines: Iterable of command lines
+        interactive: Echo nothing and keep going after failures, for a
+            person typing at the prompt (default: False)
+        keep_going: In batch mode, run the remaining commands after one
+            fails (default: False)
+
+    Returns:
+        int: Exit code, 0 if every command succeeded
+    """
+    global _sessions
+    _sessions = {}
+    failed = ran = 0
+    started = time.monotonic()
+
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line in ("exit", "quit"):
+                break
+            if not interactive:
+                print(f"> {line}")
+
+            try:
+                argv = shlex.split(line)
+            except ValueError as e:
+                print(f"✗ Cannot parse command: {e}")
+                result = 1
+            else:
+                if argv[0] in ("shell", "batch"):
+                    print(f"✗ {argv[0]} cannot be run inside a session")
+                    result = 1
+                else:
+                    try:
+                        result = main(argv)
+                    except SystemExit as e:
+                        # argparse exits on bad arguments; the session carries on
+                        result = e.code if isinstance(e.code, int) else 1
+                    except KeyboardInterrupt:
+                        print("\nInterrupted")
+                        result = 1
+
+            ran += 1
+            if result:
+                failed += 1
+                if not interactive and not keep_going:
+                    break
+    finally:
+        with _sessions_lock:
+            clients, _sessions = list(_sessions.values()), None
+        for client in clients:
+            client.close()
+
+    if not interactive:
+        print()
+        print(f"Session: {ran} commands, {failed} failed in {time.monotonic() - started:.1f}s")
+    return 1 if failed else 0
+
+
+def cmd_shell(args):
+    """Read commands at an interactive prompt, reusing one client for all of them."""
+    if not sys.stdin.isatty():
+        return run_session(sys.stdin)
+
+    try:
+        import readline  # noqa: F401  (line editing and history for input())
+    except ImportError:
+        pass
+
+    print("NiFi CLI shell - type a command (e.g. list, start-flow --whole-group), help, or exit")
+
+    def prompt():
+        while True:
+            try:
+                yield input("nifi> ")
+            except KeyboardInterrupt:
+                print()
+            except EOFError:
+                print()
+                return
+
+    return run_session(prompt(), interactive=True)
+
+
+def cmd_batch(args):
+    """Run the commands in a file (or stdin) in order, reusing one client."""
+    if args.file == "-":
+        return run_session(sys.stdin, keep_going=args.keep_going)
+
+    try:
+        with open(args.file, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        print(f"✗ Failed to read {args.file}: {e}")
+        return 1
+    return run_session(lines, keep_going=args.keep_going)
+
+
+def pop_option(argv, name):
+    """
+    Remove a global "--name VALUE" or "--name=VALUE" option from an argument list.
+
+    Args:
+        argv: Argument list, modified in place
+        name: Option name, e.g. "--targets"
+
+    Returns:
+        str: The option's value, or None if it is not given
+    """
+    for index, arg in enumerate(argv):
+        if arg.startswith(name + "="):
+            del argv[index]
+            return arg.split("=", 1)[1]
+        if arg == name and index + 1 < len(argv):
+            value = argv[index + 1]
+            del argv[index:index + 2]
+            return value
+    return None
+
+
+def build_parser():
+    """
+    Build the argument parser for all CLI commands.
+
+    Returns:
+        argparse.ArgumentParser: Parser with one sub-command per CLI command
+    """
+    parser = argparse.ArgumentParser(prog="nifi-cli", add_help=False)
+    subparsers = parser.add_subparsers(dest="command")
+
+    for name in ("setup", "create-flow", "version", "help"):
+        subparsers.add_parser(name)
+
+    command = subparsers.add_parser("list")
+    command.add_argument("--pg", default=None, help="Process group to list (default: root)")
+    command.add_argument("--recursive", action="store_true", help="Include nested process groups")
+    command.add_argument("--stream", action="store_true",
+                         help="Decode responses incrementally, printing each processor as it arrives")
+
+    for name in ("start-flow", "stop-flow"):
+        command = subparsers.add_parser(name)
+        command.add_argument("--concurrency", type=int, default=8,
+                             help="Processors updated in parallel (default: 8)")
+        command.add_argument("--stream", action="store_true",
+                             help="Print each result as soon as it completes")
+        command.add_argument("--pg", default=None,
+                             help="Process group to act on (default: root)")
+        command.add_argument("--recursive", action="store_true",
+                             help="Include processors in nested process groups")
+        command.add_argument("--whole-group", action="store_true",
+                             help="Schedule the whole group recursively in one API call")
+        command.add_argument("--no-wait", dest="wait", action="store_false",
+                             help="With --whole-group, don't wait for the target state")
+        command.add_argument("--timeout", type=float, default=60,
+                             help="With --whole-group, seconds to wait (default: 60)")
+
+    command = subparsers.add_parser("apply")
+    command.add_argument("spec", help="Flow spec file (.yaml, .yml or .json)")
+    command.add_argument("--pg", default=None, help="Process group to deploy into (default: root)")
+    command.add_argument("--concurrency", type=int, default=16,
+                         help="Components changed in parallel (default: 16)")
+    command.add_argument("--dry-run", action="store_true", help="Print the plan without changing anything")
+    command.add_argument("--prune", action="store_true", help="Also delete components that are not in the spec")
+
+    command = subparsers.add_parser("upload")
+    command.add_argument("file", help="Flow definition (.json) or flow spec (.yaml, .yml or .json)")
+    command.add_argument("--pg", default=None, help="Parent process group (default: root)")
+    command.add_argument("--name", default=None, help="Name of the new group (default: from the file)")
+    command.add_argument("--output", default=None, help="Also write the flow definition JSON to FILE")
+    command.add_argument("--dry-run", action="store_true", help="Build and check the definition without uploading")
+    command.add_argument("--no-validate", dest="validate", action="store_false",
+                         help="Skip the check against installed processor types")
+
+    command = subparsers.add_parser("find")
+    command.add_argument("query", nargs="+", help="Search terms, e.g. type:PutFile prop:Directory=/data")
+    command.add_argument("--pg", default=None, help="Process group tree to index (default: root)")
+    command.add_argument("--kind", action="append",
+                         choices=("processor", "group", "connection", "input_port", "output_port"),
+                         help="Only show components of this kind (repeatable)")
+    command.add_argument("--limit", type=int, default=None, help="Show at most N results")
+    command.add_argument("--refresh", action="store_true", help="Refresh the index before searching")
+    command.add_argument("--max-age", type=float, default=300,
+                         help="Refresh the index first if it is older than this many seconds (default: 300)")
+    command.add_argument("--index", default=None, help="Index file (default: under ~/.cache/nifi-client/index)")
+    command.add_argument("--concurrency", type=int, default=16,
+                         help="Groups fetched in parallel when refreshing (default: 16)")
+
+    command = subparsers.add_parser("teardown")
+    command.add_argument("--pg", required=True, help='Process group to empty ("root" empties the whole canvas)')
+    command.add_argument("--delete-group", action="store_true",
+                         help="Also delete the group itself (controller services, labels and remote process "
+                              "groups are not removed and block it)")
+    command.add_argument("--concurrency", type=int, default=16, help="Requests in flight at once (default: 16)")
+    command.add_argument("--timeout", type=float, default=60,
+                         help="Seconds to wait for the stop and each queue drop (default: 60)")
+
+    command = subparsers.add_parser("snapshot")
+    actions = command.add_subparsers(dest="action", required=True)
+    for name, help_text in (("export", "Snapshot file to write"), ("import", "Snapshot file to read")):
+        action = actions.add_parser(name)
+        action.add_argument("file", help=help_text)
+        action.add_argument("--pg", default=None, help="Group to export, or to import into (default: root)")
+        action.add_argument("--concurrency", type=int, default=16,
+                            help="Groups read or components created in parallel (default: 16)")
+
+    subparsers.add_parser("shell")
+
+    command = subparsers.add_parser("batch")
+    command.add_argument("file", help='File of commands, one per line ("-" for stdin)')
+    command.add_argument("--keep-going", action="store_true", help="Run the remaining commands after a failure")
+
+    command = subparsers.add_parser("queues")
+    command.add_argument("--pg", default="root", help="Process group to monitor recursively (default: root)")
+    command.add_argument("--top", type=int, default=10, help="Connections shown (default: 10)")
+    command.add_argument("--watch", action="store_true", help="Keep polling, redrawing only rows that change")
+    command.add_argument("--interval", type=float, default=5, help="With --watch, seconds between polls (default: 5)")
+
+    command = subparsers.add_parser("metrics")
+    actions = command.add_subparsers(dest="action", required=True)
+    serve = actions.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=9403, help="Port to listen on (default: 9403)")
+    serve.add_argument("--interval", type=float, default=15, help="Seconds between polls (default: 15)")
+    serve.add_argument("--history", type=int, default=60, help="Samples kept per metric (default: 60)")
+    serve.add_argument("--pg", default="root", help="Process group to monitor recursively (default: root)")
+
+    return parser
+
+
+def main(argv=None):
     """Main CLI entry point."""
-    if len(sys.argv) < 2:
+    global _profiler
+    if argv is None:
+        argv = sys.argv[1:]
+
+    profile = "--profile" in argv
+    argv = [arg for arg in argv if arg != "--profile"]
+    targets = pop_option(argv, "--targets")
+    fleet_path = pop_option(argv, "--fleet") or os.getenv("NIFI_FLEET") or DEFAULT_FLEET
+
+    if not argv:
         print_usage()
         return 1
 
-    command = sys.argv[1]
+    command = argv[0]
 
     commands = {
         "setup": cmd_setup,
         "create-flow": cmd_create_flow,
+        "apply": cmd_apply,
+        "upload": cmd_upload,
         "start-flow": cmd_start_flow,
         "stop-flow": cmd_stop_flow,
         "list": cmd_list,
+        "metrics": cmd_metrics,
+        "queues": cmd_queues,
+        "teardown": cmd_teardown,
+        "find": cmd_find,
+        "snapshot": cmd_snapshot,
         "version": cmd_version,
-        "help": lambda: (print_usage(), 0)[1],
+        "shell": cmd_shell,
+        "batch": cmd_batch,
+        "help": lambda args: (print_usage(), 0)[1],
     }
 
     if command not in commands:
@@ -311,7 +1232,31 @@ def main():
         print_usage()
         return 1
 
-    return commands[command]()
+    args = build_parser().parse_args(argv)
+    try:
+        # Check the rate settings once, before any command connects
+        env_rate_limit()
+    except ValueError as e:
+        print(f"✗ {e}")
+        return 1
+
+    previous = _profiler
+    if profile:
+        from .hooks import LatencyHistogram
+        _profiler = LatencyHistogram()
+        for client in (_sessions or {}).values():
+            _profiler.attach(client)
+    try:
+        if targets is not None:
+            return run_fleet(command, commands[command], args, targets, fleet_path)
+        return commands[command](args)
+    finally:
+        if profile:
+            print(file=sys.stderr)
+            print(_profiler.format_table(), file=sys.stderr)
+            for client in (_sessions or {}).values():
+                _profiler.detach(client)
+            _profiler = previous
 
 
 if __name__ == "__main__":
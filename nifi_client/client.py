@@ -4,9 +4,24 @@ NiFi REST API Client
 Main client class for authenticating and making API requests to NiFi.
 """
 
+import time
+import warnings
+
 import requests
 import urllib3
-import warnings
+
+from .auth import TokenCache, TokenManager
+from .cache import ResponseCache, resource_ids, response_ids
+from .hooks import Hooks, RequestEvent, TimedHTTPAdapter, active_event, set_active_event
+from .ratelimit import RateLimiter
+from .retry import CircuitBreaker, RetryPolicy
+from .revisions import RevisionCache
+from .stream import iter_json_items
+
+
+class SecurityWarning(UserWarning):
+    """Warning emitted for insecure client configurations."""
+    pass
 
 
 class NiFiError(Exception):
@@ -21,18 +36,50 @@ class AuthenticationError(NiFiError):
 
 class APIError(NiFiError):
     """Raised when API request fails."""
+
+    def __init__(self, message, status_code=None):
+        """
+        Initialize API error.
+
+        Args:
+            message: Error message
+            status_code: HTTP status code, if the server responded (optional)
+        """
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class CircuitOpenError(APIError):
+    """Raised without sending a request while the circuit breaker is open."""
     pass
 
 
+def _never_sent(error):
+    """Check whether a request failed before reaching the server."""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    return isinstance(reason, urllib3.exceptions.NewConnectionError)
+
+
 class NiFiClient:
     """
     Simple NiFi REST API client.
 
     Handles authentication and provides methods for making API requests.
+    All requests go through a single pooled ``requests.Session`` so TCP
+    connections (and their TLS sessions) are kept alive and reused across
+    calls. Use the client as a context manager, or call ``close()``, to
+    release pooled connections.
+
+    Callbacks registered on ``hooks`` receive a RequestEvent when each API
+    request starts and ends; see nifi_client.hooks.
     """
 
     def __init__(self, base_url="https://localhost:8443", username="admin", password="adminadminadmin",
-                 verify_ssl=False, cert_path=None):
+                 verify_ssl=False, cert_path=None, pool_connections=10, pool_maxsize=10,
+                 pool_block=False, keep_alive=True, token_cache=None, refresh_margin=60, cache=None,
+                 retry=None, circuit_breaker=None, rate_limit=None):
         """
         Initialize NiFi client.
 
@@ -42,6 +89,22 @@ class NiFiClient:
             password: NiFi password (default: adminadminadmin)
             verify_ssl: Verify SSL certificates (default: False for development)
             cert_path: Path to CA bundle for SSL verification (optional)
+            pool_connections: Number of per-host connection pools to cache (default: 10)
+            pool_maxsize: Maximum connections kept open per host (default: 10)
+            pool_block: Block when a host's pool is exhausted instead of opening
+                extra, non-pooled connections (default: False)
+            keep_alive: Reuse connections between requests (default: True)
+            token_cache: Path of a token cache file (or a TokenCache) shared across
+                processes, e.g. "~/.cache/nifi-client/tokens.json" (optional)
+            refresh_margin: Seconds before JWT expiry at which the token is refreshed (default: 60)
+            cache: Cache GET responses: True for a default ResponseCache, or a
+                ResponseCache instance (default: None, no caching)
+            retry: RetryPolicy for transient failures; None for the default
+                policy, False to disable retries (default: None)
+            circuit_breaker: Fail fast after repeated failures: True for a default
+                CircuitBreaker, or a CircuitBreaker instance (default: None, disabled)
+            rate_limit: RateLimiter applied to every request, including
+                authentication and readiness checks (default: None, unlimited)
 
         Security Warning:
             - Default password should be changed in production
@@ -60,8 +123,19 @@ class NiFiClient:
         self.username = username
         self.password = password
         self.verify_ssl = cert_path if cert_path else verify_ssl
-        self.token = None
         self.root_pg_id = None
+        self.session = self._create_session(pool_connections, pool_maxsize, pool_block, keep_alive)
+        self.revisions = RevisionCache()
+        self.cache = ResponseCache() if cache is True else (cache if isinstance(cache, ResponseCache) else None)
+        self.retry = RetryPolicy() if retry is None else (retry or None)
+        self.breaker = CircuitBreaker() if circuit_breaker is True else (circuit_breaker or None)
+        self.limiter = rate_limit if isinstance(rate_limit, RateLimiter) else None
+        self.hooks = Hooks()
+
+        if isinstance(token_cache, str):
+            token_cache = TokenCache(token_cache)
+        self.tokens = TokenManager(self._login, refresh_margin=refresh_margin, cache=token_cache,
+                                   cache_key=TokenCache.key(self.base_url, username))
 
         # Disable SSL warnings only if user explicitly disabled verification
         if not verify_ssl and not cert_path:
@@ -72,15 +146,65 @@ class NiFiClient:
                 stacklevel=2
             )
 
+    def _create_session(self, pool_connections, pool_maxsize, pool_block, keep_alive):
+        """
+        Create the pooled HTTP session shared by all managers using this client.
+
+        Returns:
+            requests.Session: Configured session
+        """
+        session = requests.Session()
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              pool_block=pool_block)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.verify = self.verify_ssl
+
+        if not keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+    def close(self):
+        """Close the HTTP session and release pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def token(self):
+        """str: Current JWT token, or None before authentication."""
+        return self.tokens.token
+
     def authenticate(self):
         """
         Authenticate with NiFi and get JWT token.
 
+        The token is also written to the token cache, if configured. A call
+        made while another thread is already logging in waits for it and
+        returns its token.
+
+        Returns:
+            str: JWT token
+
+        Raises:
+            AuthenticationError: If authentication fails
+        """
+        return self.tokens.refresh()
+
+    def _login(self):
+        """
+        Request a new JWT token from NiFi.
+
         Returns:
             str: JWT token
 
         Raises:
-            Exception: If authentication fails
+            AuthenticationError: If authentication fails
         """
         url = f"{self.base_url}/nifi-api/access/token"
         data = {
@@ -88,11 +212,10 @@ class NiFiClient:
             "password": self.password
         }
 
-        response = requests.post(url, data=data, verify=self.verify_ssl)
+        response = self._limited("POST", url, data=data, verify=self.verify_ssl)
 
         if response.status_code in (200, 201):
-            self.token = response.text
-            return self.token
+            return response.text
         else:
             raise AuthenticationError(f"Authentication failed: {response.status_code} - {response.text}")
 
@@ -100,24 +223,252 @@ class NiFiClient:
         """
         Get HTTP headers with authorization token.
 
+        The token is loaded from the cache or refreshed when missing or about
+        to expire.
+
         Returns:
             dict: Headers dictionary
         """
-        if not self.token:
-            self.authenticate()
-
         return {
-            "Authorization": f"Bearer {self.token}",
+            "Authorization": f"Bearer {self.tokens.get_token()}",
             "Content-Type": "application/json"
         }
 
-    def get(self, endpoint, timeout=30):
+    def _send(self, method, endpoint, data=None, params=None, timeout=30, stream=False, files=None):
+        """
+        Send a request through the pooled session and check its status.
+
+        A 401 response (expired or revoked token) triggers one
+        re-authentication and retry. Transient failures are retried according
+        to the retry policy, and the circuit breaker, if enabled, rejects
+        requests while NiFi keeps failing.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (e.g., "/flow/process-groups/root")
+            data: JSON request body (optional)
+            params: Query string parameters (optional)
+            timeout: Request timeout in seconds (default: 30)
+            stream: Defer downloading the body (default: False)
+            files: Multipart files to upload; data is then sent as form fields (optional)
+
+        Returns:
+            requests.Response: Successful response
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open
+            APIError: If request fails
+        """
+        url = f"{self.base_url}/nifi-api{endpoint}"
+        attempt = 0
+
+        while True:
+            if self.breaker is not None and not self.breaker.allow():
+                raise CircuitOpenError(f"{method} {endpoint} not sent: circuit open after repeated failures, "
+                                       f"retrying in {self.breaker.retry_in():.0f}s")
+            attempt += 1
+
+            try:
+                response = self._attempt(method, url, data, params, timeout, stream, files)
+            except requests.exceptions.RequestException as e:
+                self._record_outcome(failed=True)
+                if self.retry is not None and self.retry.should_retry(method, endpoint, attempt,
+                                                                      connect_error=_never_sent(e)):
+                    self.retry.wait(attempt)
+                    continue
+                raise APIError(f"{method} {endpoint} failed: {e}") from e
+            except BaseException:
+                # Anything else (e.g. a failed login) still ends a half-open trial
+                self._record_outcome(failed=True)
+                raise
+
+            self._record_outcome(failed=response.status_code >= 500)
+            if response.status_code < 400:
+                return response
+
+            if self.retry is not None and self.retry.should_retry(method, endpoint, attempt, response.status_code):
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self.retry.wait(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None)
+                continue
+
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                raise APIError(f"{method} {endpoint} failed: {e}", status_code=response.status_code) from e
+
+    def _attempt(self, method, url, data, params, timeout, stream, files=None):
+        """Send one request, re-authenticating once on HTTP 401."""
+        body = {"json": data} if files is None else {"data": data, "files": files}
+        response = self._limited(method, url, params=params, headers=self._auth_headers(files is None),
+                                 verify=self.verify_ssl, timeout=timeout, stream=stream, **body)
+        if response.status_code == 401:
+            response.close()
+            rejected = response.request.headers.get("Authorization", "")[len("Bearer "):]
+            self.tokens.invalidate(rejected)
+            response = self._limited(method, url, params=params, headers=self._auth_headers(files is None),
+                                     verify=self.verify_ssl, timeout=timeout, stream=stream, **body)
+        return response
+
+    def _auth_headers(self, json_body=True):
+        """get_headers(), timed as the active event's auth phase."""
+        event = active_event() if self.hooks else None
+        if event is None:
+            headers = self.get_headers()
+        else:
+            # A login request made here belongs to the auth phase, not to the event
+            set_active_event(None)
+            started = time.perf_counter()
+            try:
+                headers = self.get_headers()
+            finally:
+                event.auth += time.perf_counter() - started
+                set_active_event(event)
+
+        if not json_body:
+            # Let requests set the multipart Content-Type with its boundary
+            del headers["Content-Type"]
+        return headers
+
+    def _limited(self, method, url, **kwargs):
+        """Send one request through the session, within the rate limit if one is set."""
+        event = active_event() if self.hooks else None
+        if self.limiter is None and event is None:
+            return self.session.request(method, url, **kwargs)
+
+        if self.limiter is not None:
+            self.limiter.acquire(method)
+        started = time.monotonic()
+        connect = event.connect if event is not None else 0.0
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            if self.limiter is not None:
+                self.limiter.record(time.monotonic() - started)
+            if event is not None:
+                event.attempts += 1
+            raise
+        latency = time.monotonic() - started
+        if self.limiter is not None:
+            self.limiter.record(latency, response.status_code)
+        if event is not None:
+            self._observe(event, response, latency, event.connect - connect, kwargs.get("stream", False))
+        return response
+
+    @staticmethod
+    def _observe(event, response, latency, connect, stream):
+        """Add one attempt's status, sizes and timings to a request event."""
+        # response.elapsed runs from sending the request to parsing the
+        # headers; anything after it was spent reading the body
+        headers = response.elapsed.total_seconds()
+        event.attempts += 1
+        event.status = response.status_code
+        event.server += max(0.0, headers - connect)
+        event.transfer += max(0.0, latency - headers)
+        body = response.request.body
+        event.bytes_sent += len(body) if body else 0
+        if stream:
+            event.bytes_received += int(response.headers.get("Content-Length") or 0)
+        else:
+            event.bytes_received += len(response.content)
+
+    def _record_outcome(self, failed):
+        if self.breaker is not None:
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+    def _request(self, method, endpoint, data=None, params=None, timeout=30, files=None):
+        """
+        Send a request to the NiFi API and decode the JSON response.
+
+        Component entities returned by mutations are recorded in the revision
+        cache; deleted components are dropped from it. Mutations also
+        invalidate cached responses for the resource and its parent group.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (e.g., "/flow/process-groups/root")
+            data: JSON request body (optional)
+            params: Query string parameters (optional)
+            timeout: Request timeout in seconds (default: 30)
+            files: Multipart files to upload; data is then sent as form fields (optional)
+
+        Returns:
+            dict: Response JSON
+
+        Raises:
+            APIError: If request fails
+        """
+        if self.hooks:
+            return self._observed_request(method, endpoint, data, params, timeout, files)
+
+        response = self._send(method, endpoint, data=data, params=params, timeout=timeout, files=files)
+        return self._handle(method, endpoint, response)
+
+    def _observed_request(self, method, endpoint, data, params, timeout, files=None):
+        """_request() wrapped in request_start and request_end events."""
+        event = RequestEvent(method, endpoint)
+        self.hooks.emit("request_start", event)
+        started = time.perf_counter()
+        previous = set_active_event(event)
+        try:
+            response = self._send(method, endpoint, data=data, params=params, timeout=timeout, files=files)
+            return self._handle(method, endpoint, response, event)
+        except NiFiError as e:
+            event.error = e
+            event.status = getattr(e, "status_code", None) or event.status
+            raise
+        finally:
+            set_active_event(previous)
+            event.total = time.perf_counter() - started
+            self.hooks.emit("request_end", event)
+
+    def _handle(self, method, endpoint, response, event=None):
+        """Decode a successful response and update the revision and response caches."""
+        started = time.perf_counter() if event is not None else 0.0
+        try:
+            result = response.json()
+        except ValueError as e:
+            raise APIError(f"{method} {endpoint} failed: invalid JSON response: {e}",
+                           status_code=response.status_code) from e
+        if event is not None:
+            event.decode = time.perf_counter() - started
+
+        if method == "DELETE":
+            if isinstance(result, dict) and "id" in result:
+                self.revisions.forget(result["id"])
+        elif method != "GET":
+            self.revisions.record(result)
+
+        if method != "GET" and self.cache is not None:
+            self._invalidate(endpoint, result)
+
+        return result
+
+    def _invalidate(self, endpoint, result):
+        """Drop cached responses touched by a mutation of endpoint."""
+        ids = resource_ids(endpoint) | response_ids(result)
+        if self.root_pg_id:
+            if self.root_pg_id in ids:
+                ids.add("root")
+            elif "root" in ids:
+                ids.add(self.root_pg_id)
+        self.cache.invalidate(ids)
+
+    def get(self, endpoint, timeout=30, cached=True):
         """
         Make GET request to NiFi API.
 
+        When the client has a response cache, fresh cached responses are
+        returned without a request. Cached responses are shared and must not
+        be modified.
+
         Args:
             endpoint: API endpoint (e.g., "/flow/process-groups/root")
             timeout: Request timeout in seconds (default: 30)
+            cached: Use the response cache, if enabled (default: True)
 
         Returns:
             dict: Response JSON
@@ -125,13 +476,73 @@ class NiFiClient:
         Raises:
             APIError: If request fails
         """
-        url = f"{self.base_url}/nifi-api{endpoint}"
+        if self.cache is None or not cached:
+            return self._request("GET", endpoint, timeout=timeout)
+
+        result = self.cache.get(endpoint)
+        if result is None:
+            result = self._request("GET", endpoint, timeout=timeout)
+            self.cache.store(endpoint, result)
+        return result
+
+    def get_stream(self, endpoint, paths, timeout=30, chunk_size=65536):
+        """
+        Make a streaming GET request, decoding selected arrays one element at a time.
+
+        Peak memory stays roughly constant regardless of response size, since
+        the body is never fully loaded or decoded at once.
+
+        Args:
+            endpoint: API endpoint (e.g., "/flow/process-groups/root")
+            paths: Dotted paths of the arrays to yield, matched against the end
+                of the member path (e.g., ["flow.processors", "flow.connections"])
+            timeout: Request timeout in seconds (default: 30)
+            chunk_size: Bytes read per chunk (default: 65536)
+
+        Yields:
+            tuple: (path, element) in document order
+
+        Raises:
+            APIError: If request fails or the body is not valid JSON
+        """
+        event = None
+        if self.hooks:
+            event = RequestEvent("GET", endpoint)
+            self.hooks.emit("request_start", event)
+            started = time.perf_counter()
+            previous = set_active_event(event)
+            try:
+                response = self._send("GET", endpoint, timeout=timeout, stream=True)
+            except NiFiError as e:
+                event.error = e
+                event.status = getattr(e, "status_code", None) or event.status
+                event.total = time.perf_counter() - started
+                self.hooks.emit("request_end", event)
+                raise
+            finally:
+                set_active_event(previous)
+        else:
+            response = self._send("GET", endpoint, timeout=timeout, stream=True)
+
         try:
-            response = requests.get(url, headers=self.get_headers(), verify=self.verify_ssl, timeout=timeout)
-            response.raise_for_status()
-            return response.json()
+            yield from iter_json_items(response.iter_content(chunk_size=chunk_size), paths)
+        except ValueError as e:
+            if event is not None:
+                event.error = e
+            raise APIError(f"GET {endpoint} failed: invalid JSON response: {e}",
+                           status_code=response.status_code) from e
         except requests.exceptions.RequestException as e:
-            raise APIError(f"GET {endpoint} failed: {e}") from e
+            if event is not None:
+                event.error = e
+            raise APIError(f"GET {endpoint} failed: {e}", status_code=response.status_code) from e
+        finally:
+            response.close()
+            if event is not None:
+                # Reading, decoding and the caller's own work are interleaved,
+                # so everything after the headers counts as decode
+                event.total = time.perf_counter() - started
+                event.decode = max(0.0, event.total - event.auth - event.connect - event.server - event.transfer)
+                self.hooks.emit("request_end", event)
 
     def post(self, endpoint, data, timeout=30):
         """
@@ -148,13 +559,25 @@ class NiFiClient:
         Raises:
             APIError: If request fails
         """
-        url = f"{self.base_url}/nifi-api{endpoint}"
-        try:
-            response = requests.post(url, json=data, headers=self.get_headers(), verify=self.verify_ssl, timeout=timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise APIError(f"POST {endpoint} failed: {e}") from e
+        return self._request("POST", endpoint, data=data, timeout=timeout)
+
+    def upload(self, endpoint, files, fields=None, timeout=120):
+        """
+        Make a multipart POST request to NiFi API.
+
+        Args:
+            endpoint: API endpoint
+            files: Dict of field name -> (filename, content, content type)
+            fields: Extra form fields (optional)
+            timeout: Request timeout in seconds (default: 120)
+
+        Returns:
+            dict: Response JSON
+
+        Raises:
+            APIError: If request fails
+        """
+        return self._request("POST", endpoint, data=fields or {}, timeout=timeout, files=files)
 
     def put(self, endpoint, data, timeout=30):
         """
@@ -171,13 +594,24 @@ class NiFiClient:
         Raises:
             APIError: If request fails
         """
-        url = f"{self.base_url}/nifi-api{endpoint}"
-        try:
-            response = requests.put(url, json=data, headers=self.get_headers(), verify=self.verify_ssl, timeout=timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            raise APIError(f"PUT {endpoint} failed: {e}") from e
+        return self._request("PUT", endpoint, data=data, timeout=timeout)
+
+    def delete(self, endpoint, params=None, timeout=30):
+        """
+        Make DELETE request to NiFi API.
+
+        Args:
+            endpoint: API endpoint
+            params: Query string parameters, e.g. {"version": 3} (optional)
+            timeout: Request timeout in seconds (default: 30)
+
+        Returns:
+            dict: Response JSON
+
+        Raises:
+            APIError: If request fails
+        """
+        return self._request("DELETE", endpoint, params=params, timeout=timeout)
 
     def get_root_process_group_id(self):
         """
@@ -211,7 +645,7 @@ class NiFiClient:
         """
         try:
             url = f"{self.base_url}/nifi/"
-            response = requests.get(url, verify=self.verify_ssl, timeout=5)
+            response = self._limited("GET", url, verify=self.verify_ssl, timeout=5)
             return response.status_code == 200
         except (requests.exceptions.RequestException, Exception):
             return False
@@ -0,0 +1,83 @@
+"""
+Dependency-Ordered Task Runner
+
+Runs tasks on a worker pool as soon as all of their dependencies have
+finished.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .client import NiFiError
+
+
+def run_dag(tasks, concurrency=16, on_done=None):
+    """
+    Run a dependency graph of tasks in parallel.
+
+    Each task is submitted the moment its last dependency succeeds. Tasks
+    whose dependencies failed are not run and are reported as failed.
+
+    Args:
+        tasks: Dict mapping task key -> (dependency keys, callable). The callable
+            receives the dict of results completed so far.
+        concurrency: Maximum tasks running at once (default: 16)
+        on_done: Optional callback (key, result, error) invoked as each task finishes
+
+    Returns:
+        tuple: (results dict key -> return value, errors dict key -> exception)
+    """
+    results = {}
+    errors = {}
+    waiting = {key: set(deps) for key, (deps, fn) in tasks.items()}
+    dependents = {}
+    for key, deps in waiting.items():
+        for dep in deps:
+            if dep not in tasks:
+                raise NiFiError(f"Task {key!r} depends on unknown task {dep!r}")
+            dependents.setdefault(dep, []).append(key)
+
+    def finish(key, result=None, error=None):
+        if error is None:
+            results[key] = result
+        else:
+            errors[key] = error
+        if on_done:
+            on_done(key, result, error)
+
+    def fail_dependents(key):
+        for child in dependents.get(key, []):
+            if child in waiting:
+                del waiting[child]
+                finish(child, error=NiFiError(f"Skipped: dependency {key!r} failed"))
+                fail_dependents(child)
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        running = {}
+
+        def submit_ready():
+            for key in [k for k, deps in waiting.items() if not deps]:
+                del waiting[key]
+                running[pool.submit(tasks[key][1], results)] = key
+
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = running.pop(future)
+                try:
+                    finish(key, result=future.result())
+                except Exception as e:
+                    finish(key, error=e)
+                    fail_dependents(key)
+                    continue
+
+                for child in dependents.get(key, []):
+                    if child in waiting:
+                        waiting[child].discard(key)
+            submit_ready()
+
+    for key in list(waiting):
+        del waiting[key]
+        finish(key, error=NiFiError(f"Task {key!r} is part of a dependency cycle"))
+
+    return results, errors
@@ -0,0 +1,299 @@
+"""
+NiFi Flow Definitions
+
+Builds, loads and checks flow definitions: the JSON document NiFi
+exports with "Download flow definition" and accepts back as a new
+process group in a single upload.
+
+A definition holds a nested "flowContents" process group with
+processors, connections, ports, funnels and child groups, each keyed by
+an "identifier" that connections refer to.
+"""
+
+import json
+import os
+import uuid
+
+from .client import NiFiError
+from .spec import flatten_spec, group_label, load_spec
+
+
+# Namespace for the stable identifiers generated from a spec
+SPEC_NAMESPACE = uuid.UUID("6f1c2d4e-8a3b-4c5d-9e7f-0a1b2c3d4e5f")
+
+# Connectable components of a group, by definition key -> connection endpoint type
+CONNECTABLES = {
+    "processors": "PROCESSOR",
+    "inputPorts": "INPUT_PORT",
+    "outputPorts": "OUTPUT_PORT",
+    "funnels": "FUNNEL",
+}
+
+
+class DefinitionError(NiFiError):
+    """Raised when a flow definition is malformed."""
+    pass
+
+
+def _identifier(*parts):
+    return str(uuid.uuid5(SPEC_NAMESPACE, "\x1f".join(parts)))
+
+
+def empty_group(name, identifier, position=None):
+    """
+    Build an empty process group in flow definition form.
+
+    Args:
+        name: Group name
+        identifier: Group identifier
+        position: Position dict with x, y coordinates (default: {x: 0, y: 0})
+
+    Returns:
+        dict: Versioned process group
+    """
+    return {
+        "identifier": identifier,
+        "name": name,
+        "comments": "",
+        "position": position or {"x": 0.0, "y": 0.0},
+        "componentType": "PROCESS_GROUP",
+        "processGroups": [],
+        "processors": [],
+        "connections": [],
+        "inputPorts": [],
+        "outputPorts": [],
+        "funnels": [],
+        "labels": [],
+        "controllerServices": [],
+        "remoteProcessGroups": [],
+        "variables": {},
+    }
+
+
+def spec_to_definition(spec, name, bundles=None):
+    """
+    Convert a flattened flow spec into a flow definition.
+
+    Identifiers are derived from group paths and processor names, so the
+    same spec always produces the same definition.
+
+    Args:
+        spec: Flattened spec from load_spec/flatten_spec
+        name: Name of the process group the definition creates
+        bundles: Processor type -> bundle dict (group, artifact, version), used
+            for the processors' "bundle" field (optional)
+
+    Returns:
+        dict: Flow definition
+    """
+    bundles = bundles or {}
+    root = empty_group(name, _identifier("group"))
+    groups = {(): root}
+
+    for group in spec["groups"]:
+        child = empty_group(group["name"], _identifier("group", *group["path"]), group["position"])
+        child["groupIdentifier"] = groups[group["parent"]]["identifier"]
+        groups[group["parent"]]["processGroups"].append(child)
+        groups[group["path"]] = child
+
+    for proc in spec["processors"]:
+        group = groups[proc["group"]]
+        processor = {
+            "identifier": _identifier("processor", *proc["group"], proc["name"]),
+            "groupIdentifier": group["identifier"],
+            "name": proc["name"],
+            "type": proc["type"],
+            "componentType": "PROCESSOR",
+            "position": proc["position"],
+            "properties": proc["properties"],
+            "propertyDescriptors": {},
+            "schedulingPeriod": proc["scheduling_period"],
+            "schedulingStrategy": "TIMER_DRIVEN",
+            "executionNode": "ALL",
+            "penaltyDuration": "30 sec",
+            "yieldDuration": "1 sec",
+            "bulletinLevel": "WARN",
+            "runDurationMillis": 0,
+            "concurrentlySchedulableTaskCount": 1,
+            "autoTerminatedRelationships": proc["auto_terminate"],
+            "scheduledState": "ENABLED",
+            "style": {},
+        }
+        if proc["type"] in bundles:
+            processor["bundle"] = dict(bundles[proc["type"]])
+        group["processors"].append(processor)
+
+    for index, conn in enumerate(spec["connections"]):
+        group = groups[conn["group"]]
+
+        def endpoint(processor_name):
+            return {"id": _identifier("processor", *conn["group"], processor_name), "type": "PROCESSOR",
+                    "groupId": group["identifier"], "name": processor_name}
+
+        group["connections"].append({
+            "identifier": _identifier("connection", *conn["group"], str(index)),
+            "groupIdentifier": group["identifier"],
+            "name": "",
+            "componentType": "CONNECTION",
+            "source": endpoint(conn["source"]),
+            "destination": endpoint(conn["destination"]),
+            "selectedRelationships": conn["relationships"],
+            "backPressureObjectThreshold": 10000,
+            "backPressureDataSizeThreshold": "1 GB",
+            "flowFileExpiration": "0 sec",
+            "prioritizers": [],
+            "bends": [],
+            "labelIndex": 1,
+            "zIndex": 0,
+            "loadBalanceStrategy": "DO_NOT_LOAD_BALANCE",
+            "loadBalanceCompression": "DO_NOT_COMPRESS",
+        })
+
+    return {
+        "flowContents": root,
+        "externalControllerServices": {},
+        "parameterContexts": {},
+        "parameterProviders": {},
+        "flowEncodingVersion": "1.0",
+    }
+
+
+def load_definition(path, name=None):
+    """
+    Load a flow definition file, or build one from a flow spec.
+
+    JSON files with a top-level "flowContents" are flow definitions (as
+    downloaded from NiFi); any other JSON or YAML file is read as a spec.
+
+    Args:
+        path: Definition or spec file (.json, .yaml or .yml)
+        name: Group name for a definition built from a spec (default: file name)
+
+    Returns:
+        dict: Flow definition
+
+    Raises:
+        DefinitionError: If a definition file is not valid JSON
+        SpecError: If a spec file is invalid
+    """
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                raw = json.load(f)
+            except ValueError as e:
+                raise DefinitionError(f"Invalid JSON in {path}: {e}") from e
+        if isinstance(raw, dict) and "flowContents" in raw:
+            return raw
+        spec = flatten_spec(raw)
+    else:
+        spec = load_spec(path)
+
+    default_name = os.path.basename(path).split(".", 1)[0]
+    return spec_to_definition(spec, name or default_name)
+
+
+def iter_groups(group, path=()):
+    """
+    Yield a definition's process group and all of its descendants.
+
+    Args:
+        group: Versioned process group (e.g. definition["flowContents"])
+        path: Names of the enclosing groups (default: none)
+
+    Yields:
+        tuple: (group path, group), the path ending with the group's own name
+    """
+    path = path + (group.get("name", ""),)
+    yield path, group
+    for child in group.get("processGroups") or []:
+        yield from iter_groups(child, path)
+
+
+def validate_definition(definition, processor_types=None):
+    """
+    Check a flow definition before uploading it.
+
+    Checks that every component has an identifier unique within the
+    definition, processors have a name, type and bundle, and connections
+    join components in the same group or in its child groups' ports. With
+    processor_types, every processor type and bundle must be installed.
+
+    Args:
+        definition: Flow definition
+        processor_types: Type -> list of bundle dicts installed on the target
+            NiFi, from Flow.processor_bundles (optional)
+
+    Returns:
+        list: Problems found, as strings; empty when the definition is valid
+    """
+    if not isinstance(definition, dict) or not isinstance(definition.get("flowContents"), dict):
+        return ["Flow definition needs a \"flowContents\" process group"]
+
+    problems = []
+    seen = set()
+
+    for path, group in iter_groups(definition["flowContents"]):
+        where = group_label(path[1:])
+        components = [(key, component) for key in list(CONNECTABLES) + ["connections"]
+                      for component in group.get(key) or []]
+        components.append(("processGroups", group))
+
+        for key, component in components:
+            identifier = component.get("identifier")
+            if not identifier:
+                problems.append(f"{where}: {key[:-1]} {component.get('name', '')!r} has no identifier")
+            elif identifier in seen:
+                problems.append(f"{where}: duplicate identifier {identifier}")
+            seen.add(identifier)
+
+        for proc in group.get("processors") or []:
+            label = f"{where}: processor {proc.get('name')!r}"
+            if not proc.get("name") or not proc.get("type"):
+                problems.append(f"{label} needs a name and a type")
+                continue
+            bundle = proc.get("bundle")
+            installed = processor_types.get(proc["type"]) if processor_types is not None else None
+            if processor_types is not None and not installed:
+                problems.append(f"{label}: type {proc['type']} is not installed")
+            elif not bundle or not all(bundle.get(key) for key in ("group", "artifact", "version")):
+                problems.append(f"{label} has no bundle (group, artifact, version)")
+            elif installed is not None and bundle not in installed:
+                problems.append(f"{label}: bundle {bundle['group']}:{bundle['artifact']}:{bundle['version']} "
+                                f"is not installed for {proc['type']}")
+
+        # Connections may reach components of this group and ports of its direct children
+        reachable = {component["identifier"]: CONNECTABLES[key] for key in CONNECTABLES
+                     for component in group.get(key) or [] if component.get("identifier")}
+        for child in group.get("processGroups") or []:
+            for key in ("inputPorts", "outputPorts"):
+                for port in child.get(key) or []:
+                    if port.get("identifier"):
+                        reachable[port["identifier"]] = CONNECTABLES[key]
+
+        for index, conn in enumerate(group.get("connections") or []):
+            label = f"{where}: connection #{index + 1}"
+            for end in ("source", "destination"):
+                target = conn.get(end) or {}
+                if target.get("id") not in reachable:
+                    problems.append(f"{label}: {end} {target.get('id')!r} is not in the group or its child ports")
+                elif target.get("type") != reachable[target["id"]]:
+                    problems.append(f"{label}: {end} type {target.get('type')!r} should be {reachable[target['id']]}")
+            source_type = (conn.get("source") or {}).get("type")
+            if source_type == "PROCESSOR" and not conn.get("selectedRelationships"):
+                problems.append(f"{label} routes no relationships")
+
+    return problems
+
+
+def definition_size(definition):
+    """
+    Count the components in a flow definition.
+
+    Returns:
+        dict: Component counts keyed by definition key (processors, connections, ...)
+    """
+    counts = {}
+    for path, group in iter_groups(definition["flowContents"]):
+        for key in list(CONNECTABLES) + ["connections", "processGroups"]:
+            counts[key] = counts.get(key, 0) + len(group.get(key) or [])
+    return counts
@@ -0,0 +1,289 @@
+"""
+NiFi Flow Deployment
+
+Deploys a declarative flow spec by creating components in dependency order,
+as many at a time as the dependency graph allows.
+"""
+
+from .client import APIError
+from .dag import run_dag
+from .flow import Flow
+from .process_group import ProcessGroup
+from .processor import Processor
+from .spec import group_label
+
+
+class Deployer:
+    """
+    Creates the components of a flow spec in parallel.
+
+    Process groups are created parent-first, processors as soon as their
+    group exists, and connections as soon as both endpoints exist.
+    """
+
+    def __init__(self, client, concurrency=16):
+        """
+        Initialize deployer.
+
+        Args:
+            client: NiFiClient instance
+            concurrency: Maximum components created at once (default: 16)
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.processor = Processor(client)
+        self.process_group = ProcessGroup(client)
+        self.flow = Flow(client)
+
+    def deploy(self, spec, process_group_id=None, on_done=None):
+        """
+        Create every group, processor and connection in a flattened spec.
+
+        Args:
+            spec: Flattened spec from load_spec/flatten_spec
+            process_group_id: Group to deploy into (default: root)
+            on_done: Optional callback (task key, result, error) as each component finishes
+
+        Returns:
+            dict: {"groups": {path: id}, "processors": {(group path, name): id},
+                "connections": [ids], "failed": {task key: exception}}
+        """
+        root_id = self.process_group.resolve_id(process_group_id)
+        tasks = self.build_tasks(spec, root_id)
+        results, errors = run_dag(tasks, concurrency=self.concurrency, on_done=on_done)
+
+        deployed = {"groups": {(): root_id}, "processors": {}, "connections": [], "failed": errors}
+        for key, entity in results.items():
+            kind = key[0]
+            if kind == "group":
+                deployed["groups"][key[1]] = entity["id"]
+            elif kind == "processor":
+                deployed["processors"][(key[1], key[2])] = entity["id"]
+            elif kind == "connection":
+                deployed["connections"].append(entity["id"])
+
+        return deployed
+
+    def build_tasks(self, spec, root_id):
+        """
+        Build the dependency graph for a spec.
+
+        Task keys are ("group", path), ("processor", group path, name) and
+        ("connection", group path, index).
+
+        Args:
+            spec: Flattened spec
+            root_id: ID of the group the spec is deployed into
+
+        Returns:
+            dict: Tasks for run_dag
+        """
+        def group_id(results, path):
+            return root_id if not path else results[("group", path)]["id"]
+
+        def group_deps(path):
+            return [("group", path)] if path else []
+
+        tasks = {}
+
+        for group in spec["groups"]:
+            def create_group(results, group=group):
+                return self.process_group.create(group["name"], group_id(results, group["parent"]),
+                                                 position=group["position"])
+            tasks[("group", group["path"])] = (group_deps(group["parent"]), create_group)
+
+        for proc in spec["processors"]:
+            def create_processor(results, proc=proc):
+                return self.processor.create(
+                    processor_type=proc["type"],
+                    name=proc["name"],
+                    process_group_id=group_id(results, proc["group"]),
+                    position=proc["position"],
+                    properties=proc["properties"],
+                    scheduling_period=proc["scheduling_period"],
+                    auto_terminated_relationships=proc["auto_terminate"]
+                )
+            tasks[("processor", proc["group"], proc["name"])] = (group_deps(proc["group"]), create_processor)
+
+        for index, conn in enumerate(spec["connections"]):
+            source = ("processor", conn["group"], conn["source"])
+            destination = ("processor", conn["group"], conn["destination"])
+
+            def create_connection(results, conn=conn, source=source, destination=destination):
+                return self.flow.create_connection(
+                    source_id=results[source]["id"],
+                    destination_id=results[destination]["id"],
+                    relationships=conn["relationships"],
+                    process_group_id=group_id(results, conn["group"])
+                )
+            tasks[("connection", conn["group"], index)] = ([source, destination], create_connection)
+
+        return tasks
+
+    def update_processor(self, processor_id, **changes):
+        """
+        Update a processor's configuration, whatever its run state.
+
+        NiFi rejects configuration changes to a running processor, so a
+        running processor is stopped (and its threads waited out) first and
+        started again afterwards, even if the update fails.
+
+        Args:
+            processor_id: Processor ID
+            **changes: Processor.update arguments
+
+        Returns:
+            dict: Updated processor information
+
+        Raises:
+            APIError: If the processor does not stop in time or NiFi rejects the update
+        """
+        was_running = self.processor.stop(processor_id)["status"] == "stopped"
+        try:
+            if was_running and not self.processor.wait_for_state(processor_id, "STOPPED"):
+                raise APIError(f"Processor {processor_id} did not stop; not updating it")
+            return self.processor.update(processor_id, **changes)
+        finally:
+            if was_running:
+                self.processor.start(processor_id)
+
+    def apply_plan(self, plan, on_done=None):
+        """
+        Execute a plan from Planner.plan.
+
+        Creates follow the same dependency order as deploy(); deletes remove
+        connections before the processors they touch. Group deletes run last,
+        after every other update and delete, since stopping a group clears the
+        revision and response caches those operations rely on.
+
+        Args:
+            plan: Plan dict from Planner.plan
+            on_done: Optional callback (operation, result, error) as each operation finishes
+
+        Returns:
+            dict: {"applied": [operations], "failed": [(operation, exception)]}
+        """
+        root_id = plan["root_id"]
+        tasks = {}
+        operations = {}
+
+        def key_of(operation):
+            # Creates are found by path and name; updates and deletes target one entity, and
+            # leftovers being pruned may share a name, so they are keyed by ID
+            if operation["action"] == "create":
+                return (operation["action"], operation["kind"], operation["path"], operation["name"])
+            return (operation["action"], operation["kind"], operation["id"])
+
+        def group_id(results, path):
+            created = results.get(("create", "group", path[:-1], path[-1])) if path else None
+            return created["id"] if created else (plan["groups"].get(path) or root_id)
+
+        def group_deps(path):
+            key = ("create", "group", path[:-1], path[-1]) if path else None
+            return [key] if key in operations else []
+
+        def processor_id(results, path, name):
+            created = results.get(("create", "processor", path, name))
+            return created["id"] if created else plan["processors"][(path, name)]
+
+        def processor_deps(path, name):
+            key = ("create", "processor", path, name)
+            return [key] if key in operations else []
+
+        for operation in plan["operations"]:
+            operations[key_of(operation)] = operation
+
+        deleted_connections = {}
+        for operation in plan["operations"]:
+            if operation["action"] == "delete" and operation["kind"] == "connection":
+                for endpoint in operation["endpoints"]:
+                    deleted_connections.setdefault(endpoint, []).append(key_of(operation))
+
+        for key, operation in operations.items():
+            action, kind, path = operation["action"], operation["kind"], operation["path"]
+            spec = operation.get("spec")
+
+            if action == "create" and kind == "group":
+                def run(results, spec=spec, path=path):
+                    return self.process_group.create(spec["name"], group_id(results, path), position=spec["position"])
+                deps = group_deps(path)
+            elif action == "create" and kind == "processor":
+                def run(results, spec=spec, path=path):
+                    return self.processor.create(
+                        processor_type=spec["type"],
+                        name=spec["name"],
+                        process_group_id=group_id(results, path),
+                        position=spec["position"],
+                        properties=spec["properties"],
+                        scheduling_period=spec["scheduling_period"],
+                        auto_terminated_relationships=spec["auto_terminate"]
+                    )
+                deps = group_deps(path)
+            elif action == "create" and kind == "connection":
+                def run(results, spec=spec, path=path):
+                    return self.flow.create_connection(
+                        source_id=processor_id(results, path, spec["source"]),
+                        destination_id=processor_id(results, path, spec["destination"]),
+                        relationships=spec["relationships"],
+                        process_group_id=group_id(results, path)
+                    )
+                deps = processor_deps(path, spec["source"]) + processor_deps(path, spec["destination"])
+            elif action == "update" and kind == "processor":
+                def run(results, spec=spec, operation=operation):
+                    return self.update_processor(
+                        operation["id"],
+                        properties=spec["properties"],
+                        scheduling_period=spec["scheduling_period"],
+                        auto_terminated_relationships=spec["auto_terminate"]
+                    )
+                deps = []
+            elif action == "update" and kind == "connection":
+                def run(results, spec=spec, operation=operation):
+                    return self.flow.update_connection(operation["id"], spec["relationships"],
+                                                       version=operation["version"])
+                deps = []
+            elif action == "delete" and kind == "connection":
+                def run(results, operation=operation):
+                    return self.flow.delete_connection(operation["id"], version=operation["version"])
+                deps = []
+            elif action == "delete" and kind == "processor":
+                def run(results, operation=operation):
+                    return self.processor.delete(operation["id"])
+                deps = deleted_connections.get(operation["id"], [])
+            else:
+                def run(results, operation=operation):
+                    self.process_group.schedule(operation["id"], "STOPPED")
+                    return self.process_group.delete(operation["id"])
+                deps = [other for other, candidate in operations.items()
+                        if candidate["action"] != "create" and candidate["kind"] != "group"]
+
+            tasks[key] = (deps, run)
+
+        def task_done(key, result, error):
+            if on_done:
+                on_done(operations[key], result, error)
+
+        results, errors = run_dag(tasks, concurrency=self.concurrency, on_done=task_done)
+
+        return {
+            "applied": [operations[key] for key in results],
+            "failed": [(operations[key], error) for key, error in errors.items()]
+        }
+
+
+def describe_task(key):
+    """
+    Format a deployment task key for display.
+
+    Args:
+        key: Task key built by Deployer.build_tasks
+
+    Returns:
+        str: e.g. "processor Ingest/Generate"
+    """
+    kind, path = key[0], key[1]
+    if kind == "group":
+        return f"group {group_label(path)}"
+    if kind == "processor":
+        return f"processor {group_label(path)}/{key[2]}"
+    return f"connection #{key[2] + 1} in {group_label(path)}"
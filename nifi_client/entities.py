@@ -0,0 +1,243 @@
+"""
+NiFi Entities
+
+Compact, typed views of the NiFi entities the library works with most.
+
+The REST API returns deeply nested dicts carrying every property and
+descriptor of a component. These classes decode only the commonly used
+fields into ``__slots__`` attributes, interning repeated strings such as
+types and states, and keep the full payload only as requested.
+"""
+
+import json
+import sys
+
+
+# How the raw payload is kept: the dict itself, compact JSON text decoded on
+# access, or not at all
+RAW_MODES = ("keep", "lazy", "drop")
+
+
+def _text(value):
+    """Intern short repeated strings (types, states, group IDs)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _position(component):
+    position = component.get("position")
+    if not position:
+        return None
+    return (position.get("x", 0.0), position.get("y", 0.0))
+
+
+class Revision:
+    """Component revision used for optimistic locking."""
+
+    __slots__ = ("version", "client_id", "last_modifier")
+
+    def __init__(self, version=0, client_id=None, last_modifier=None):
+        self.version = version
+        self.client_id = client_id
+        self.last_modifier = last_modifier
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Build a revision from its JSON form.
+
+        Args:
+            data: Revision dict, e.g. {"version": 3, "clientId": "..."} (may be None)
+
+        Returns:
+            Revision: Decoded revision
+        """
+        data = data or {}
+        return cls(data.get("version", 0), data.get("clientId"), _text(data.get("lastModifier")))
+
+    def to_json(self):
+        """
+        Return the revision in the form NiFi expects in request bodies.
+
+        Returns:
+            dict: {"version": ...} plus clientId when set
+        """
+        revision = {"version": self.version}
+        if self.client_id:
+            revision["clientId"] = self.client_id
+        return revision
+
+    def __eq__(self, other):
+        if not isinstance(other, Revision):
+            return NotImplemented
+        return (self.version, self.client_id) == (other.version, other.client_id)
+
+    def __repr__(self):
+        return f"Revision(version={self.version!r})"
+
+
+class Entity:
+    """
+    Base class for slotted entities.
+
+    The raw payload is available through ``raw``. With raw="keep" it is the
+    original dict; with raw="lazy" it is stored as compact JSON text and
+    decoded on every access; with raw="drop" it is discarded and ``raw`` is
+    None.
+    """
+
+    __slots__ = ("id", "revision", "_raw")
+
+    def __init__(self, data, raw="lazy"):
+        if raw not in RAW_MODES:
+            raise ValueError(f"raw must be one of {', '.join(RAW_MODES)}, got {raw!r}")
+
+        self.id = data["id"]
+        self.revision = Revision.from_json(data.get("revision"))
+
+        if raw == "keep":
+            self._raw = data
+        elif raw == "lazy":
+            self._raw = json.dumps(data, separators=(",", ":"))
+        else:
+            self._raw = None
+
+    @classmethod
+    def from_json(cls, data, raw="lazy"):
+        """
+        Decode an entity from its REST API JSON.
+
+        Args:
+            data: Entity dict as returned by NiFi
+            raw: How to keep the full payload: "keep", "lazy" or "drop" (default: "lazy")
+
+        Returns:
+            Entity: Decoded entity
+        """
+        return cls(data, raw)
+
+    @property
+    def raw(self):
+        """dict: Full REST API payload, or None if it was dropped."""
+        if isinstance(self._raw, str):
+            return json.loads(self._raw)
+        return self._raw
+
+    @property
+    def version(self):
+        """int: Current revision version."""
+        return self.revision.version
+
+    def __eq__(self, other):
+        if not isinstance(other, Entity):
+            return NotImplemented
+        return type(self) is type(other) and self.id == other.id and self.revision == other.revision
+
+    def __hash__(self):
+        return hash((type(self), self.id))
+
+    def __repr__(self):
+        name = getattr(self, "name", None)
+        return f"{type(self).__name__}(id={self.id!r}, name={name!r}, version={self.revision.version!r})"
+
+
+class ProcessorEntity(Entity):
+    """A processor: identity, type, state and scheduling."""
+
+    __slots__ = ("name", "type", "state", "group_id", "validation_status",
+                 "scheduling_period", "position", "active_threads")
+
+    def __init__(self, data, raw="lazy"):
+        super().__init__(data, raw)
+        component = data.get("component", {})
+        config = component.get("config", {})
+
+        self.name = component.get("name")
+        self.type = _text(component.get("type"))
+        self.state = _text(component.get("state"))
+        self.group_id = _text(component.get("parentGroupId"))
+        self.validation_status = _text(component.get("validationStatus"))
+        self.scheduling_period = _text(config.get("schedulingPeriod"))
+        self.position = _position(component)
+        self.active_threads = data.get("status", {}).get("aggregateSnapshot", {}).get("activeThreadCount", 0)
+
+    @property
+    def short_type(self):
+        """str: Type without its package, e.g. "GenerateFlowFile"."""
+        return self.type.rsplit(".", 1)[-1] if self.type else self.type
+
+    @property
+    def running(self):
+        """bool: Whether the processor is running."""
+        return self.state == "RUNNING"
+
+
+class ConnectionEntity(Entity):
+    """A connection between two components."""
+
+    __slots__ = ("name", "group_id", "source_id", "source_type", "destination_id",
+                 "destination_type", "relationships", "object_threshold", "size_threshold")
+
+    def __init__(self, data, raw="lazy"):
+        super().__init__(data, raw)
+        component = data.get("component", {})
+        source = component.get("source", {})
+        destination = component.get("destination", {})
+
+        self.name = component.get("name")
+        self.group_id = _text(component.get("parentGroupId"))
+        self.source_id = source.get("id", data.get("sourceId"))
+        self.source_type = _text(source.get("type"))
+        self.destination_id = destination.get("id", data.get("destinationId"))
+        self.destination_type = _text(destination.get("type"))
+        self.relationships = tuple(_text(name) for name in component.get("selectedRelationships") or ())
+        self.object_threshold = component.get("backPressureObjectThreshold")
+        self.size_threshold = _text(component.get("backPressureDataSizeThreshold"))
+
+
+class ProcessGroupEntity(Entity):
+    """A process group with its component counts."""
+
+    __slots__ = ("name", "parent_group_id", "position", "running_count", "stopped_count",
+                 "invalid_count", "disabled_count")
+
+    def __init__(self, data, raw="lazy"):
+        super().__init__(data, raw)
+        component = data.get("component", {})
+
+        self.name = component.get("name")
+        self.parent_group_id = _text(component.get("parentGroupId"))
+        self.position = _position(component)
+        self.running_count = data.get("runningCount", component.get("runningCount", 0))
+        self.stopped_count = data.get("stoppedCount", component.get("stoppedCount", 0))
+        self.invalid_count = data.get("invalidCount", component.get("invalidCount", 0))
+        self.disabled_count = data.get("disabledCount", component.get("disabledCount", 0))
+
+
+# Walker kinds -> entity class
+ENTITY_TYPES = {
+    "processor": ProcessorEntity,
+    "connection": ConnectionEntity,
+    "group": ProcessGroupEntity,
+}
+
+
+def from_json(kind, data, raw="lazy"):
+    """
+    Decode an entity of the given kind.
+
+    Args:
+        kind: "processor", "connection" or "group" (the kinds Walker yields)
+        data: Entity dict as returned by NiFi
+        raw: How to keep the full payload: "keep", "lazy" or "drop" (default: "lazy")
+
+    Returns:
+        Entity: Decoded entity
+
+    Raises:
+        ValueError: If the kind has no entity class
+    """
+    try:
+        entity_type = ENTITY_TYPES[kind]
+    except KeyError:
+        raise ValueError(f"No entity type for {kind!r}")
+    return entity_type(data, raw)
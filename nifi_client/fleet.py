@@ -0,0 +1,360 @@
+"""
+NiFi Fleets
+
+Runs the same operation against several NiFi instances at once. A fleet
+file lists named targets with their URL and credentials:
+
+    defaults:
+      username: admin
+      timeout: 60
+    targets:
+      - name: east
+        url: https://nifi-east:8443
+        password_env: NIFI_EAST_PASSWORD
+      - name: west
+        url: https://nifi-west:8443
+        password: adminadminadmin
+        timeout: 30
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+
+from .client import NiFiClient, NiFiError
+
+
+# Target settings a fleet file may give, per target or under "defaults"
+TARGET_KEYS = ("name", "url", "username", "password", "password_env", "token_cache", "verify_ssl",
+               "cert_path", "timeout")
+
+_local = threading.local()
+
+
+class FleetError(NiFiError):
+    """Raised when a fleet file is invalid or names an unknown target."""
+    pass
+
+
+class Target:
+    """One NiFi instance in a fleet."""
+
+    __slots__ = ("name", "url", "username", "password", "token_cache", "verify_ssl", "cert_path", "timeout")
+
+    def __init__(self, name, url, username="admin", password="adminadminadmin", token_cache=None,
+                 verify_ssl=False, cert_path=None, timeout=60):
+        """
+        Initialize target.
+
+        Args:
+            name: Target name, unique within the fleet
+            url: NiFi base URL
+            username: NiFi username (default: admin)
+            password: NiFi password (default: adminadminadmin)
+            token_cache: Token cache file (optional)
+            verify_ssl: Verify SSL certificates (default: False)
+            cert_path: Path to CA bundle for SSL verification (optional)
+            timeout: Seconds an operation may take on this target (default: 60)
+        """
+        self.name = name
+        self.url = url
+        self.username = username
+        self.password = password
+        self.token_cache = token_cache
+        self.verify_ssl = verify_ssl
+        self.cert_path = cert_path
+        self.timeout = timeout
+
+    def client(self, **kwargs):
+        """
+        Create a client for this target.
+
+        Args:
+            **kwargs: Extra NiFiClient arguments (pool_maxsize, rate_limit, ...)
+
+        Returns:
+            NiFiClient: Client connected to the target
+        """
+        return NiFiClient(base_url=self.url, username=self.username, password=self.password,
+                          token_cache=self.token_cache, verify_ssl=self.verify_ssl, cert_path=self.cert_path,
+                          **kwargs)
+
+    def __repr__(self):
+        return f"Target({self.name!r}, {self.url!r})"
+
+
+class TargetResult:
+    """Outcome of running an operation on one target."""
+
+    __slots__ = ("target", "value", "error", "output", "seconds", "timed_out")
+
+    def __init__(self, target):
+        self.target = target
+        self.value = None
+        self.error = None
+        self.output = ""
+        self.seconds = 0.0
+        self.timed_out = False
+
+    @property
+    def ok(self):
+        """bool: Whether the operation finished without raising."""
+        return self.error is None and not self.timed_out
+
+
+def current_target():
+    """
+    Get the target the calling thread is running a fleet operation for.
+
+    Returns:
+        Target: The thread's target, or None outside Fleet.run
+    """
+    return getattr(_local, "target", None)
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stands in for sys.stdout, sending each fleet thread's writes to its own buffer.
+
+    It stays installed until every thread started under it has finished, so
+    a thread abandoned after its timeout keeps writing into its (discarded)
+    buffer instead of onto the terminal.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.active = 0
+        self.released = False
+        self._lock = threading.Lock()
+
+    def enter(self):
+        """Count a thread that may write through this stream."""
+        with self._lock:
+            self.active += 1
+
+    def leave(self):
+        """Uncount a finished thread, restoring sys.stdout if it was the last one after release()."""
+        with self._lock:
+            self.active -= 1
+            self._restore()
+
+    def release(self):
+        """Restore sys.stdout now, or once the last counted thread leaves."""
+        with self._lock:
+            self.released = True
+            self._restore()
+
+    def _restore(self):
+        # Leave sys.stdout alone if something else replaced it in the meantime
+        if self.released and not self.active and sys.stdout is self:
+            sys.stdout = self.stream
+
+    def write(self, text):
+        buffer = getattr(_local, "output", None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(_local, "output", None) is None:
+            self.stream.flush()
+
+    def isatty(self):
+        return False
+
+
+def load_fleet(path):
+    """
+    Load a fleet file.
+
+    YAML requires the optional PyYAML dependency (``pip install nifi-client[yaml]``).
+
+    Args:
+        path: Fleet file (.yaml, .yml or .json)
+
+    Returns:
+        Fleet: The fleet's targets, in file order
+
+    Raises:
+        FleetError: If the file can't be parsed or a target is invalid
+    """
+    with open(os.path.expanduser(path), "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise FleetError("YAML fleet files require PyYAML: pip install nifi-client[yaml]") from None
+        try:
+            raw = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise FleetError(f"Invalid YAML in {path}: {e}") from e
+    else:
+        try:
+            raw = json.loads(text)
+        except ValueError as e:
+            raise FleetError(f"Invalid JSON in {path}: {e}") from e
+
+    if not isinstance(raw, dict) or not isinstance(raw.get("targets"), list) or not raw["targets"]:
+        raise FleetError(f"{path} needs a non-empty \"targets\" list")
+    defaults = raw.get("defaults") or {}
+
+    targets = []
+    for index, entry in enumerate(raw["targets"]):
+        settings = dict(defaults, **entry) if isinstance(entry, dict) else {}
+        unknown = set(settings) - set(TARGET_KEYS)
+        if not settings.get("name") or not settings.get("url") or unknown:
+            raise FleetError(f"{path}: target #{index + 1} needs a name and a url"
+                             + (f" (unknown keys: {', '.join(sorted(unknown))})" if unknown else ""))
+        timeout = settings.get("timeout", 60)
+        if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+            raise FleetError(f"{path}: target {settings['name']!r} has timeout {timeout!r}; "
+                             f"expected a positive number of seconds")
+        password_env = settings.pop("password_env", None)
+        if password_env:
+            if password_env not in os.environ:
+                raise FleetError(f"{path}: target {settings['name']!r} reads its password from "
+                                 f"${password_env}, which is not set")
+            settings["password"] = os.environ[password_env]
+        targets.append(Target(**settings))
+
+    return Fleet(targets)
+
+
+class Fleet:
+    """
+    A set of named NiFi instances operated on together.
+
+    Fleet.run calls a function once per target, each in its own thread, and
+    waits at most each target's timeout for it. A fleet-wide operation
+    takes as long as its slowest target rather than the sum of all of them.
+    """
+
+    def __init__(self, targets):
+        """
+        Initialize fleet.
+
+        Args:
+            targets: Target instances
+
+        Raises:
+            FleetError: If two targets share a name
+        """
+        self.targets = list(targets)
+        names = [target.name for target in self.targets]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise FleetError(f"Duplicate target names: {', '.join(duplicates)}")
+
+    def select(self, names=None):
+        """
+        Pick targets by name.
+
+        Args:
+            names: Target names, a comma-separated string of them, or None/"all"
+                for every target
+
+        Returns:
+            list: Selected targets, in fleet order
+
+        Raises:
+            FleetError: If a name is not in the fleet
+        """
+        if names is None or names == "all":
+            return list(self.targets)
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(",") if name.strip()]
+
+        known = {target.name for target in self.targets}
+        unknown = [name for name in names if name not in known]
+        if unknown:
+            raise FleetError(f"Unknown target(s): {', '.join(unknown)} (fleet has: {', '.join(sorted(known))})")
+        return [target for target in self.targets if target.name in names]
+
+    def run(self, fn, names=None, capture=False, on_done=None):
+        """
+        Run a function against several targets concurrently.
+
+        Each call runs in a daemon thread, so a target that hangs past its
+        timeout is reported and abandoned without holding up the others or
+        the process exit. While fn runs, current_target() returns its target.
+
+        Args:
+            fn: Callable taking a Target and returning a value
+            names: Targets to run on (see select; default: all)
+            capture: Collect what each call prints to stdout into its result's
+                output instead of printing it (default: False)
+            on_done: Optional callback (TargetResult) as each target finishes
+                or times out
+
+        Returns:
+            list: TargetResult per target, in fleet order
+        """
+        targets = self.select(names)
+        results = [TargetResult(target) for target in targets]
+        finished = threading.Condition()
+        done = set()
+
+        def call(result):
+            _local.target = result.target
+            _local.output = io.StringIO() if capture else None
+            started = time.monotonic()
+            value = error = None
+            try:
+                value = fn(result.target)
+            except Exception as e:
+                error = e
+            finally:
+                output = _local.output.getvalue() if capture else ""
+                _local.target = _local.output = None
+                if capture:
+                    stdout.leave()
+                with finished:
+                    # A call that outlived its timeout has already been reported
+                    if not result.timed_out:
+                        result.value, result.error, result.output = value, error, output
+                        result.seconds = time.monotonic() - started
+                        done.add(id(result))
+                        finished.notify_all()
+
+        stdout = _ThreadOutput(sys.stdout) if capture else None
+        if capture:
+            sys.stdout = stdout
+        try:
+            started = time.monotonic()
+            for result in results:
+                if capture:
+                    stdout.enter()
+                threading.Thread(target=call, args=(result,), name=f"fleet-{result.target.name}",
+                                 daemon=True).start()
+
+            reported = set()
+            while len(reported) < len(results):
+                with finished:
+                    now = time.monotonic() - started
+                    ready = []
+                    for result in results:
+                        if id(result) in reported:
+                            continue
+                        if id(result) not in done and now >= result.target.timeout:
+                            result.timed_out = True
+                            result.seconds = now
+                            result.error = NiFiError(f"Timed out after {result.target.timeout}s")
+                        if result.timed_out or id(result) in done:
+                            reported.add(id(result))
+                            ready.append(result)
+                    if not ready:
+                        finished.wait(min(result.target.timeout for result in results
+                                          if id(result) not in reported) - now)
+                for result in ready:
+                    if on_done:
+                        on_done(result)
+        finally:
+            if capture:
+                # Threads abandoned after a timeout may still print; their
+                # output stays captured until they finish
+                stdout.release()
+
+        return results
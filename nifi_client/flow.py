@@ -4,9 +4,54 @@ NiFi Flow Management
 Class for creating and managing NiFi flows (processors + connections).
 """
 
+import json
+import re
+import time
+import uuid
+
+from .bulk import BulkRunStatus, format_result, format_summary, summarize
+from .client import APIError
+from .definition import DefinitionError, iter_groups, validate_definition
+from .process_group import ProcessGroup
 from .processor import Processor
 
 
+def connection_payload(source_id, destination_id, relationships, process_group_id):
+    """
+    Build the request body for connecting two processors in a process group.
+
+    Args:
+        source_id: Source processor ID
+        destination_id: Destination processor ID
+        relationships: List of relationships (e.g., ["success"])
+        process_group_id: Process group ID containing both processors
+
+    Returns:
+        dict: Connection entity ready to POST
+    """
+    return {
+        "revision": {"version": 0},
+        "component": {
+            "source": {
+                "id": source_id,
+                "groupId": process_group_id,
+                "type": "PROCESSOR"
+            },
+            "destination": {
+                "id": destination_id,
+                "groupId": process_group_id,
+                "type": "PROCESSOR"
+            },
+            "selectedRelationships": relationships
+        }
+    }
+
+
+def _version_key(bundle):
+    """Sort key for bundle versions, comparing their numbers numerically."""
+    return [int(number) for number in re.findall(r"\d+", bundle.get("version") or "")]
+
+
 class Flow:
     """
     Manages NiFi flows.
@@ -23,6 +68,7 @@ class Flow:
         """
         self.client = client
         self.processor = Processor(client)
+        self.process_group = ProcessGroup(client)
         self.created_processors = []
         self.created_connections = []
 
@@ -115,94 +161,240 @@ class Flow:
         if not process_group_id:
             process_group_id = self.client.get_root_process_group_id()
 
+        data = connection_payload(source_id, destination_id, relationships, process_group_id)
+
+        response = self.client.post(f"/process-groups/{process_group_id}/connections", data)
+        return response
+
+    def update_connection(self, connection_id, relationships, version=None):
+        """
+        Change the relationships routed through a connection.
+
+        Args:
+            connection_id: Connection ID
+            relationships: List of relationships (e.g., ["success"])
+            version: Current revision version (default: fetched)
+
+        Returns:
+            dict: Updated connection response
+        """
+        if version is None:
+            version = self.client.get(f"/connections/{connection_id}", cached=False)["revision"]["version"]
+
         data = {
-            "revision": {"version": 0},
+            "revision": {"version": version},
             "component": {
-                "source": {
-                    "id": source_id,
-                    "groupId": process_group_id,
-                    "type": "PROCESSOR"
-                },
-                "destination": {
-                    "id": destination_id,
-                    "groupId": process_group_id,
-                    "type": "PROCESSOR"
-                },
+                "id": connection_id,
                 "selectedRelationships": relationships
             }
         }
+        return self.client.put(f"/connections/{connection_id}", data)
 
-        response = self.client.post(f"/process-groups/{process_group_id}/connections", data)
-        return response
+    def delete_connection(self, connection_id, version=None):
+        """
+        Delete a connection (its queue must be empty).
 
-    def start_all_processors(self):
+        Args:
+            connection_id: Connection ID
+            version: Current revision version (default: fetched)
+
+        Returns:
+            dict: Deletion response
         """
-        Start all processors that were created by this flow instance.
+        if version is None:
+            version = self.client.get(f"/connections/{connection_id}", cached=False)["revision"]["version"]
+
+        return self.client.delete(f"/connections/{connection_id}", params={"version": version})
+
+    def drop_queue(self, connection_id, timeout=60):
+        """
+        Drop every FlowFile queued in a connection and wait for the drop to finish.
+
+        Args:
+            connection_id: Connection ID
+            timeout: Seconds to wait for the drop request to finish (default: 60)
 
         Returns:
-            dict: Summary of started, already running, and failed processors
+            dict: Final drop request (dropped count in "droppedCount")
+
+        Raises:
+            APIError: If the drop fails or does not finish in time
         """
-        print(f"\nStarting {len(self.created_processors)} processors...")
+        endpoint = f"/flowfile-queues/{connection_id}/drop-requests"
+        request = self.client.post(endpoint, {})["dropRequest"]
+        deadline = time.monotonic() + timeout
+        interval = 0.05
+
+        try:
+            while not request.get("finished"):
+                if time.monotonic() >= deadline:
+                    raise APIError(f"Dropping queue of connection {connection_id} did not finish within {timeout}s")
+                time.sleep(interval)
+                interval = min(1.0, interval * 2)
+                request = self.client.get(f"{endpoint}/{request['id']}", cached=False)["dropRequest"]
+        finally:
+            # NiFi keeps finished drop requests until they are deleted
+            request = self.client.delete(f"{endpoint}/{request['id']}").get("dropRequest", request)
+
+        if request.get("failureReason"):
+            raise APIError(f"Dropping queue of connection {connection_id} failed: {request['failureReason']}")
+        return request
+
+    def processor_bundles(self):
+        """
+        List the processor types installed on NiFi with their bundles.
+
+        Returns:
+            dict: Processor type -> list of bundle dicts (group, artifact, version)
+        """
+        types = {}
+        for entry in self.client.get("/flow/processor-types").get("processorTypes", []):
+            bundle = entry.get("bundle") or {}
+            types.setdefault(entry["type"], []).append(
+                {key: bundle.get(key) for key in ("group", "artifact", "version")})
+        return types
+
+    def check_definition(self, definition, installed=True):
+        """
+        Fill in missing processor bundles and check a flow definition.
+
+        Processors without a bundle get the newest installed bundle for
+        their type, in place. The installed types are fetched with one
+        request, only when needed.
 
-        started = []
-        already_running = []
-        failed = []
+        Args:
+            definition: Flow definition (see nifi_client.definition)
+            installed: Also check every type and bundle is installed (default: True)
 
-        for proc_id in self.created_processors:
-            try:
-                result = self.processor.start(proc_id)
-                proc_name = result["processor"]["component"]["name"]
+        Returns:
+            list: Problems found, as strings; empty when the definition is valid
+        """
+        contents = definition.get("flowContents") if isinstance(definition, dict) else None
+        processors = [proc for path, group in iter_groups(contents) for proc in group.get("processors") or []] \
+            if isinstance(contents, dict) else []
 
-                if result["status"] == "started":
-                    print(f"  ✓ Started: {proc_name}")
-                    started.append(proc_id)
-                elif result["status"] == "already_running":
-                    print(f"  ⚠ Already running: {proc_name}")
-                    already_running.append(proc_id)
-            except Exception as e:
-                print(f"  ✗ Failed to start {proc_id}: {e}")
-                failed.append(proc_id)
+        types = None
+        if installed or any(not proc.get("bundle") for proc in processors):
+            types = self.processor_bundles()
+            for proc in processors:
+                if not proc.get("bundle") and types.get(proc.get("type")):
+                    proc["bundle"] = max(types[proc["type"]], key=_version_key)
 
-        print(f"\nSummary: {len(started)} started, {len(already_running)} already running, {len(failed)} failed")
+        return validate_definition(definition, types if installed else None)
 
-        return {
-            "started": started,
-            "already_running": already_running,
-            "failed": failed
+    def upload_definition(self, definition, name=None, process_group_id=None, position=None, validate=True,
+                          timeout=300):
+        """
+        Create a new process group from a flow definition in a single upload.
+
+        The whole definition is sent in one request, however many components
+        it holds. It is first completed and checked with check_definition(),
+        which costs one more request. Structural problems (missing or
+        duplicate identifiers, incomplete processors, dangling connections)
+        always stop the upload; validate only controls the check against the
+        processor types installed on the target.
+
+        Args:
+            definition: Flow definition (see nifi_client.definition)
+            name: Name of the new group (default: the definition's group name)
+            process_group_id: Parent process group ID (default: root)
+            position: Position dict with x, y coordinates (default: {x: 300, y: 200})
+            validate: Also check every processor type and bundle is installed
+                (default: True)
+            timeout: Request timeout in seconds (default: 300)
+
+        Returns:
+            dict: Created process group entity
+
+        Raises:
+            DefinitionError: If the definition fails validation
+            APIError: If NiFi rejects the upload
+        """
+        problems = self.check_definition(definition, installed=validate)
+        if problems:
+            raise DefinitionError(f"Flow definition has {len(problems)} problem(s):\n  " + "\n  ".join(problems))
+
+        contents = definition["flowContents"]
+        process_group_id = self.process_group.resolve_id(process_group_id)
+        position = position or {"x": 300, "y": 200}
+        name = name or contents.get("name") or "Uploaded flow"
+
+        payload = json.dumps(definition, separators=(",", ":")).encode("utf-8")
+        fields = {
+            "groupName": name,
+            "positionX": str(position["x"]),
+            "positionY": str(position["y"]),
+            "clientId": str(uuid.uuid4()),
+            "disconnectedNodeAcknowledged": "false",
         }
+        return self.client.upload(f"/process-groups/{process_group_id}/process-groups/upload",
+                                  files={"file": (f"{name}.json", payload, "application/json")},
+                                  fields=fields, timeout=timeout)
+
+    def start_all_processors(self, concurrency=8, stream=False):
+        """
+        Start all processors that were created by this flow instance.
+
+        Args:
+            concurrency: Number of processors started in parallel (default: 8)
+            stream: Print each result as it completes instead of after the batch (default: False)
+
+        Returns:
+            dict: Summary of started, already running, and failed processors
+        """
+        print(f"\nStarting {len(self.created_processors)} processors...")
+        return self._run_all(self.created_processors, "RUNNING", concurrency, stream)
 
-    def stop_all_processors(self):
+    def stop_all_processors(self, concurrency=8, stream=False):
         """
         Stop all processors that were created by this flow instance.
 
+        Args:
+            concurrency: Number of processors stopped in parallel (default: 8)
+            stream: Print each result as it completes instead of after the batch (default: False)
+
         Returns:
             dict: Summary of stopped processors
         """
         print(f"\nStopping {len(self.created_processors)} processors...")
+        return self._run_all(self.created_processors, "STOPPED", concurrency, stream)
 
-        stopped = []
-        already_stopped = []
-        failed = []
+    def start_process_group(self, process_group_id=None, wait=True, timeout=60):
+        """
+        Start every component in a process group, recursively, with one API call.
 
-        for proc_id in self.created_processors:
-            try:
-                result = self.processor.stop(proc_id)
-                proc_name = result["processor"]["component"]["name"]
+        Args:
+            process_group_id: Process group ID (default: root)
+            wait: Wait until all runnable processors report Running (default: True)
+            timeout: Seconds to wait for the target state (default: 60)
 
-                if result["status"] == "stopped":
-                    print(f"  ✓ Stopped: {proc_name}")
-                    stopped.append(proc_id)
-                elif result["status"] == "already_stopped":
-                    print(f"  ⚠ Already stopped: {proc_name}")
-                    already_stopped.append(proc_id)
-            except Exception as e:
-                print(f"  ✗ Failed to stop {proc_id}: {e}")
-                failed.append(proc_id)
+        Returns:
+            dict: Schedule response
+        """
+        return self.process_group.start(process_group_id, wait=wait, timeout=timeout)
 
-        print(f"\nSummary: {len(stopped)} stopped, {len(already_stopped)} already stopped, {len(failed)} failed")
+    def stop_process_group(self, process_group_id=None, wait=True, timeout=60):
+        """
+        Stop every component in a process group, recursively, with one API call.
 
-        return {
-            "stopped": stopped,
-            "already_stopped": already_stopped,
-            "failed": failed
-        }
+        Args:
+            process_group_id: Process group ID (default: root)
+            wait: Wait until all processors report Stopped (default: True)
+            timeout: Seconds to wait for the target state (default: 60)
+
+        Returns:
+            dict: Schedule response
+        """
+        return self.process_group.stop(process_group_id, wait=wait, timeout=timeout)
+
+    def _run_all(self, processors, state, concurrency, stream):
+        on_result = (lambda result: print(format_result(result))) if stream else None
+        results = BulkRunStatus(self.client, concurrency).run(processors, state, on_result=on_result)
+
+        if not stream:
+            for result in results:
+                print(format_result(result))
+
+        summary = summarize(results, state)
+        print(f"\n{format_summary(summary, state)}")
+        return summary
@@ -0,0 +1,292 @@
+"""
+NiFi Request Instrumentation
+
+Request start/end events for NiFiClient, with per-phase timings, and a
+per-endpoint latency histogram built on them.
+
+Events are only built while at least one hook is registered, so an
+uninstrumented client pays a single truthiness check per request.
+"""
+
+import re
+import threading
+import time
+import warnings
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+EVENTS = ("request_start", "request_end")
+
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+# Per-thread event of the request being sent, so connection setup deep
+# inside urllib3 can be attributed to it
+_active = threading.local()
+
+
+def endpoint_template(endpoint):
+    """
+    Reduce an endpoint to its template by replacing IDs and dropping the query.
+
+    Args:
+        endpoint: API endpoint, e.g. "/processors/0a1b.../run-status?x=1"
+
+    Returns:
+        str: Template, e.g. "/processors/{id}/run-status"
+    """
+    path = _UUID.sub("{id}", endpoint.split("?", 1)[0])
+    return re.sub(r"/root(?=/|$)", "/{id}", path)
+
+
+class RequestEvent:
+    """
+    One logical API request, including any retries.
+
+    Timings are in seconds: auth (getting a token), connect (TCP and TLS
+    setup of new connections), server (waiting for response headers),
+    transfer (reading the body), decode (parsing JSON) and total.
+    """
+
+    __slots__ = ("method", "endpoint", "template", "status", "error", "attempts", "bytes_sent",
+                 "bytes_received", "started", "auth", "connect", "server", "transfer", "decode", "total")
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.template = endpoint_template(endpoint)
+        self.status = None
+        self.error = None
+        self.attempts = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.started = time.time()
+        self.auth = 0.0
+        self.connect = 0.0
+        self.server = 0.0
+        self.transfer = 0.0
+        self.decode = 0.0
+        self.total = 0.0
+
+    def as_dict(self):
+        """dict: The event's fields."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return (f"RequestEvent({self.method} {self.template} status={self.status} "
+                f"total={self.total * 1000:.1f}ms)")
+
+
+class Hooks:
+    """
+    Registry of request event callbacks.
+
+    Callbacks receive a RequestEvent. On "request_start" only the method,
+    endpoint and template are set; on "request_end" everything is. A
+    failing callback is reported as a warning and never breaks the request.
+    """
+
+    def __init__(self):
+        self._callbacks = {event: [] for event in EVENTS}
+        self._any = False
+
+    def add(self, event, callback):
+        """
+        Register a callback.
+
+        Args:
+            event: "request_start" or "request_end"
+            callback: Callable taking a RequestEvent
+
+        Returns:
+            The callback, unchanged
+        """
+        if event not in self._callbacks:
+            raise ValueError(f"Unknown event {event!r}; expected one of {', '.join(EVENTS)}")
+        self._callbacks[event].append(callback)
+        self._any = True
+        return callback
+
+    def remove(self, event, callback):
+        """Unregister a callback added with add()."""
+        self._callbacks[event].remove(callback)
+        self._any = any(self._callbacks.values())
+
+    def emit(self, event, payload):
+        """Call every callback registered for an event."""
+        for callback in self._callbacks[event]:
+            try:
+                callback(payload)
+            except Exception as e:
+                warnings.warn(f"Request hook {callback!r} failed: {e}", RuntimeWarning, stacklevel=2)
+
+    def __bool__(self):
+        return self._any
+
+
+def active_event():
+    """RequestEvent being sent on this thread, or None."""
+    return getattr(_active, "event", None)
+
+
+def set_active_event(event):
+    """Make an event the one being sent on this thread; returns the previous one."""
+    previous = getattr(_active, "event", None)
+    _active.event = event
+    return previous
+
+
+class _TimedConnectMixin:
+    def connect(self):
+        event = getattr(_active, "event", None)
+        if event is None:
+            return super().connect()
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            event.connect += time.perf_counter() - started
+
+
+class TimedHTTPConnection(_TimedConnectMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose new connections report their setup time to the active event."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+
+# Upper bounds of the histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+PHASES = ("auth", "connect", "server", "transfer", "decode")
+
+
+class LatencyHistogram:
+    """
+    Aggregates request_end events into a latency histogram per endpoint.
+
+    Endpoints are keyed by method and template, so every processor's
+    run-status call lands in one "PUT /processors/{id}/run-status" row.
+    """
+
+    def __init__(self):
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def attach(self, client):
+        """
+        Start recording a client's requests.
+
+        Args:
+            client: NiFiClient instance
+
+        Returns:
+            LatencyHistogram: self
+        """
+        client.hooks.add("request_end", self)
+        return self
+
+    def detach(self, client):
+        """Stop recording a client's requests."""
+        client.hooks.remove("request_end", self)
+
+    def __call__(self, event):
+        self.record(event)
+
+    def record(self, event):
+        """Add one finished request."""
+        key = f"{event.method} {event.template}"
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = {"count": 0, "errors": 0, "total": 0.0, "max": 0.0,
+                                               "bytes": 0, "buckets": [0] * len(BUCKETS),
+                                               **{phase: 0.0 for phase in PHASES}}
+            stats["count"] += 1
+            stats["errors"] += 1 if event.error is not None else 0
+            stats["total"] += event.total
+            stats["max"] = max(stats["max"], event.total)
+            stats["bytes"] += event.bytes_received
+            for phase in PHASES:
+                stats[phase] += getattr(event, phase)
+            for index, bound in enumerate(BUCKETS):
+                if event.total <= bound:
+                    stats["buckets"][index] += 1
+                    break
+
+    @staticmethod
+    def quantile(stats, fraction):
+        """
+        Estimate a latency quantile from the histogram buckets.
+
+        Returns:
+            float: Upper bound of the bucket holding the quantile (the
+                observed maximum for the last bucket)
+        """
+        rank = fraction * stats["count"]
+        seen = 0
+        for bound, count in zip(BUCKETS, stats["buckets"]):
+            seen += count
+            if seen >= rank and count:
+                return min(bound, stats["max"])
+        return stats["max"]
+
+    def summary(self):
+        """
+        Return one row per endpoint, slowest total time first.
+
+        Returns:
+            list: Dicts with endpoint, count, errors, total, mean, p50, p95, max,
+                bytes and the total seconds spent in each phase
+        """
+        with self._lock:
+            rows = []
+            for key, stats in self.endpoints.items():
+                row = {"endpoint": key, "count": stats["count"], "errors": stats["errors"],
+                       "total": stats["total"], "mean": stats["total"] / stats["count"],
+                       "p50": self.quantile(stats, 0.50), "p95": self.quantile(stats, 0.95),
+                       "max": stats["max"], "bytes": stats["bytes"]}
+                row.update({phase: stats[phase] for phase in PHASES})
+                rows.append(row)
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    def format_table(self):
+        """
+        Format the summary as a printable table.
+
+        Returns:
+            str: Table with per-endpoint counts, latency and phase breakdown
+        """
+        rows = self.summary()
+        lines = [f"{'Endpoint':48} {'Calls':>6} {'Err':>4} {'Total s':>8} {'Mean ms':>8} {'p95 ms':>8} "
+                 f"{'Auth':>6} {'Conn':>6} {'Server':>7} {'Xfer':>6} {'Decode':>7}"]
+        for row in rows:
+            total = row["total"] or 1.0
+            endpoint = row["endpoint"] if len(row["endpoint"]) <= 48 else row["endpoint"][:45] + "..."
+            lines.append(f"{endpoint:48} {row['count']:>6} {row['errors']:>4} {row['total']:>8.3f} "
+                         f"{row['mean'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f} "
+                         + " ".join(f"{row[phase] / total:>{width}.0%}"
+                                    for phase, width in zip(PHASES, (6, 6, 7, 6, 7))))
+        calls = sum(row["count"] for row in rows)
+        seconds = sum(row["total"] for row in rows)
+        lines.append(f"{'Total':48} {calls:>6} {sum(row['errors'] for row in rows):>4} {seconds:>8.3f}")
+        return "\n".join(lines)
@@ -0,0 +1,376 @@
+"""
+NiFi Metrics Exporter
+
+Polls flow status and system diagnostics on an interval, keeps a short
+history of every metric, and serves the latest values in the Prometheus
+text exposition format.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .client import NiFiError
+from .process_group import ProcessGroup, iter_connection_status, iter_group_status, iter_processor_status
+
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# name -> (type, help)
+METRICS = {
+    "nifi_up": ("gauge", "Whether the last poll of NiFi succeeded"),
+    "nifi_poll_duration_seconds": ("gauge", "Duration of the last poll"),
+    "nifi_poll_timestamp_seconds": ("gauge", "Unix time of the last successful poll"),
+    "nifi_poll_errors_total": ("counter", "Polls of NiFi that failed"),
+    "nifi_jvm_heap_used_bytes": ("gauge", "JVM heap in use"),
+    "nifi_jvm_heap_max_bytes": ("gauge", "Maximum JVM heap"),
+    "nifi_jvm_threads": ("gauge", "Live JVM threads"),
+    "nifi_available_processors": ("gauge", "CPUs available to NiFi"),
+    "nifi_processor_load_average": ("gauge", "System load average"),
+    "nifi_group_active_threads": ("gauge", "Active threads in a process group"),
+    "nifi_group_queued_flowfiles": ("gauge", "FlowFiles queued in a process group"),
+    "nifi_group_queued_bytes": ("gauge", "Bytes queued in a process group"),
+    "nifi_processor_active_threads": ("gauge", "Active threads of a processor"),
+    "nifi_processor_running": ("gauge", "Whether a processor is running"),
+    "nifi_processor_flowfiles_in": ("gauge", "FlowFiles received by a processor in the last 5 minutes"),
+    "nifi_processor_flowfiles_out": ("gauge", "FlowFiles sent by a processor in the last 5 minutes"),
+    "nifi_processor_bytes_read": ("gauge", "Bytes read by a processor in the last 5 minutes"),
+    "nifi_processor_bytes_written": ("gauge", "Bytes written by a processor in the last 5 minutes"),
+    "nifi_connection_queued_flowfiles": ("gauge", "FlowFiles queued in a connection"),
+    "nifi_connection_queued_bytes": ("gauge", "Bytes queued in a connection"),
+    "nifi_connection_percent_use_count": ("gauge", "Queued FlowFiles as a percentage of the backpressure threshold"),
+    "nifi_connection_percent_use_bytes": ("gauge", "Queued bytes as a percentage of the backpressure threshold"),
+}
+
+# snapshot field -> metric, per component kind
+PROCESSOR_FIELDS = {
+    "activeThreadCount": "nifi_processor_active_threads",
+    "flowFilesIn": "nifi_processor_flowfiles_in",
+    "flowFilesOut": "nifi_processor_flowfiles_out",
+    "bytesRead": "nifi_processor_bytes_read",
+    "bytesWritten": "nifi_processor_bytes_written",
+}
+CONNECTION_FIELDS = {
+    "flowFilesQueued": "nifi_connection_queued_flowfiles",
+    "bytesQueued": "nifi_connection_queued_bytes",
+    "percentUseCount": "nifi_connection_percent_use_count",
+    "percentUseBytes": "nifi_connection_percent_use_bytes",
+}
+GROUP_FIELDS = {
+    "activeThreadCount": "nifi_group_active_threads",
+    "flowFilesQueued": "nifi_group_queued_flowfiles",
+    "bytesQueued": "nifi_group_queued_bytes",
+}
+SYSTEM_FIELDS = {
+    "usedHeapBytes": "nifi_jvm_heap_used_bytes",
+    "maxHeapBytes": "nifi_jvm_heap_max_bytes",
+    "totalThreads": "nifi_jvm_threads",
+    "availableProcessors": "nifi_available_processors",
+    "processorLoadAverage": "nifi_processor_load_average",
+}
+
+
+def escape_label(value):
+    """Escape a label value for the exposition format."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(**labels):
+    """
+    Render a label set, e.g. {id="abc",name="Generate"}.
+
+    Returns:
+        str: Rendered labels ("" when there are none)
+    """
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+class RingBuffer:
+    """Fixed-size buffer of float samples; the oldest sample is overwritten."""
+
+    __slots__ = ("values", "head", "count")
+
+    def __init__(self, size):
+        self.values = array("d", bytes(8 * size))
+        self.head = 0
+        self.count = 0
+
+    def append(self, value):
+        self.values[self.head] = value
+        self.head = (self.head + 1) % len(self.values)
+        self.count = min(self.count + 1, len(self.values))
+
+    def last(self):
+        return self.values[self.head - 1]
+
+    def items(self):
+        """Return the buffered samples, oldest first."""
+        size = len(self.values)
+        start = (self.head - self.count) % size
+        return [self.values[(start + i) % size] for i in range(self.count)]
+
+    def __len__(self):
+        return self.count
+
+
+class MetricsPoller:
+    """
+    Collects NiFi metrics with two requests per cycle.
+
+    Every cycle reads the recursive status of the monitored group and the
+    system diagnostics, and appends each value to that series' ring buffer.
+    Series whose component disappeared are dropped. The exposition text is
+    rendered at most once per cycle and reused by every scrape until the
+    next poll. A failed poll is logged, counted in nifi_poll_errors_total
+    and kept in last_error; nifi_poll_timestamp_seconds keeps the time of
+    the last poll that succeeded.
+    """
+
+    def __init__(self, client, process_group_id="root", history=60):
+        """
+        Initialize poller.
+
+        Args:
+            client: NiFiClient instance
+            process_group_id: Group whose status is polled recursively (default: "root")
+            history: Samples kept per metric (default: 60)
+        """
+        self.client = client
+        self.process_group = ProcessGroup(client)
+        self.process_group_id = process_group_id
+        self.history = max(1, history)
+        self.series = {}
+        self.up = False
+        self.errors = 0
+        self.last_error = None
+        self._rendered = None
+        self._lock = threading.Lock()
+
+    def collect(self):
+        """
+        Fetch one round of samples.
+
+        Returns:
+            dict: (metric, rendered labels) -> value
+
+        Raises:
+            APIError: If NiFi cannot be reached
+        """
+        status = self.process_group.get_status(self.process_group_id, recursive=True)
+        diagnostics = self.client.get("/system-diagnostics")["systemDiagnostics"]["aggregateSnapshot"]
+        samples = {}
+
+        for field, metric in SYSTEM_FIELDS.items():
+            if diagnostics.get(field) is not None:
+                samples[(metric, "")] = float(diagnostics[field])
+
+        for group in iter_group_status(status):
+            labels = format_labels(id=group["id"], name=group.get("name", ""))
+            for field, metric in GROUP_FIELDS.items():
+                samples[(metric, labels)] = float(group.get(field) or 0)
+
+        for proc in iter_processor_status(status):
+            labels = format_labels(id=proc["id"], name=proc.get("name", ""), group_id=proc.get("groupId", ""),
+                                   type=proc.get("type", ""))
+            for field, metric in PROCESSOR_FIELDS.items():
+                samples[(metric, labels)] = float(proc.get(field) or 0)
+            samples[("nifi_processor_running", labels)] = 1.0 if proc.get("runStatus") == "Running" else 0.0
+
+        for conn in iter_connection_status(status):
+            labels = format_labels(id=conn["id"], name=conn.get("name", ""), group_id=conn.get("groupId", ""),
+                                   source=conn.get("sourceName", ""), destination=conn.get("destinationName", ""))
+            for field, metric in CONNECTION_FIELDS.items():
+                samples[(metric, labels)] = float(conn.get(field) or 0)
+
+        return samples
+
+    def poll(self):
+        """
+        Run one poll cycle and record the results.
+
+        Returns:
+            bool: True if NiFi was polled successfully
+        """
+        started = time.time()
+        try:
+            samples = self.collect()
+            up = True
+        except Exception as e:
+            # Keep polling whatever went wrong, but leave a trace of it
+            logger.warning("Polling NiFi failed: %s", e, exc_info=not isinstance(e, NiFiError))
+            samples = None
+            up = False
+            self.last_error = e
+
+        duration = time.time() - started
+
+        with self._lock:
+            self.up = up
+            if up:
+                for key in set(self.series) - set(samples):
+                    if not key[0].startswith("nifi_poll"):
+                        del self.series[key]
+                samples[("nifi_poll_timestamp_seconds", "")] = started
+            else:
+                self.errors += 1
+                samples = {}
+
+            samples[("nifi_up", "")] = 1.0 if up else 0.0
+            samples[("nifi_poll_duration_seconds", "")] = duration
+            samples[("nifi_poll_errors_total", "")] = float(self.errors)
+
+            for key, value in samples.items():
+                buffer = self.series.get(key)
+                if buffer is None:
+                    buffer = self.series[key] = RingBuffer(self.history)
+                buffer.append(value)
+
+            self._rendered = None
+
+        return up
+
+    def history_of(self, metric, labels=""):
+        """
+        Return the buffered samples of one series.
+
+        Args:
+            metric: Metric name, e.g. "nifi_connection_queued_flowfiles"
+            labels: Rendered labels, as produced by format_labels (default: "")
+
+        Returns:
+            list: Sample values, oldest first (empty if the series is unknown)
+        """
+        with self._lock:
+            buffer = self.series.get((metric, labels))
+            return buffer.items() if buffer is not None else []
+
+    def exposition(self):
+        """
+        Return the latest samples in the Prometheus text format.
+
+        The text is rendered once per poll cycle and reused for every scrape
+        until the next cycle. While NiFi is unreachable only the exporter's
+        own metrics (nifi_up, nifi_poll_*) are exposed.
+
+        Returns:
+            bytes: UTF-8 exposition text
+        """
+        with self._lock:
+            if self._rendered is None:
+                self._rendered = self._render()
+            return self._rendered
+
+    def _render(self):
+        by_metric = {}
+        for (metric, labels), buffer in self.series.items():
+            if self.up or metric == "nifi_up" or metric.startswith("nifi_poll"):
+                by_metric.setdefault(metric, []).append(f"{metric}{labels} {buffer.last()!r}")
+
+        lines = []
+        for metric, (metric_type, help_text) in METRICS.items():
+            samples = by_metric.get(metric)
+            if samples:
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {metric_type}")
+                lines.extend(samples)
+
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def run(self, interval=15, stop=None):
+        """
+        Poll until stopped, keeping cycles interval seconds apart.
+
+        Args:
+            interval: Seconds between the start of consecutive polls (default: 15)
+            stop: threading.Event that ends the loop (optional)
+        """
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            started = time.monotonic()
+            self.poll()
+            stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+
+class MetricsServer:
+    """
+    Serves a poller's exposition text over HTTP at /metrics while polling
+    in a background thread.
+    """
+
+    def __init__(self, poller, host="127.0.0.1", port=9403, interval=15):
+        """
+        Initialize server.
+
+        Args:
+            poller: MetricsPoller instance
+            host: Interface to listen on (default: 127.0.0.1)
+            port: Port to listen on; 0 picks a free port (default: 9403)
+            interval: Seconds between polls (default: 15)
+        """
+        self.poller = poller
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._poll_thread = None
+
+    @property
+    def address(self):
+        """tuple: (host, port) the server is bound to."""
+        return self.httpd.server_address[:2]
+
+    def _handler(self):
+        poller = self.poller
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = poller.exposition()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _start_polling(self):
+        # Poll once up front so the first scrape has data
+        self.poller.poll()
+
+        def loop():
+            self.stop_event.wait(self.interval)
+            self.poller.run(self.interval, self.stop_event)
+
+        self._poll_thread = threading.Thread(target=loop, daemon=True)
+        self._poll_thread.start()
+
+    def start(self):
+        """Run the first poll, then poll and serve in background threads."""
+        self._start_polling()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def serve_forever(self):
+        """Poll and serve until interrupted."""
+        self._start_polling()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Stop polling and serving."""
+        self.stop_event.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,235 @@
+"""
+NiFi Deployment Planning
+
+Diffs a flow spec against what already exists in NiFi and produces the
+minimal set of create/update/delete operations needed to converge.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .process_group import ProcessGroup
+from .spec import group_label
+
+
+class Planner:
+    """
+    Builds deployment plans by comparing a spec with the live flow.
+
+    Components are matched by stable key: processors by group path, name and
+    type; groups by path; connections by group path and endpoint names. Each
+    group in the spec that already exists is read once.
+    """
+
+    def __init__(self, client, concurrency=8):
+        """
+        Initialize planner.
+
+        Args:
+            client: NiFiClient instance
+            concurrency: Groups read in parallel (default: 8)
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.process_group = ProcessGroup(client)
+
+    def fetch(self, spec, root_id):
+        """
+        Read the existing contents of every group the spec describes.
+
+        Args:
+            spec: Flattened spec
+            root_id: ID of the group the spec is deployed into
+
+        Returns:
+            dict: {"groups": {path: group entity}, "extra_groups": [(path, entity)],
+                "processors": {path: [entities]}, "connections": {path: [entities]}}
+        """
+        wanted = {group["path"] for group in spec["groups"]}
+        state = {"groups": {(): {"id": root_id}}, "extra_groups": [], "processors": {}, "connections": {}}
+        level = [()]
+
+        with ThreadPoolExecutor(max_workers=max(1, self.concurrency)) as pool:
+            while level:
+                ids = [state["groups"][path]["id"] for path in level]
+                next_level = []
+
+                for path, flow in zip(level, pool.map(self.process_group.get_flow, ids)):
+                    state["processors"][path] = flow.get("processors", [])
+                    state["connections"][path] = flow.get("connections", [])
+                    self.client.revisions.record_many(state["processors"][path])
+
+                    for group in flow.get("processGroups", []):
+                        child = path + (group["component"]["name"],)
+                        if child in wanted and child not in state["groups"]:
+                            state["groups"][child] = group
+                            next_level.append(child)
+                        else:
+                            state["extra_groups"].append((child, group))
+
+                level = next_level
+
+        return state
+
+    def plan(self, spec, process_group_id=None, prune=False):
+        """
+        Diff a spec against the live flow.
+
+        Args:
+            spec: Flattened spec from load_spec/flatten_spec
+            process_group_id: Group the spec is deployed into (default: root)
+            prune: Also delete components that are not in the spec (default: False)
+
+        Returns:
+            dict: {"root_id": ..., "groups": {path: id}, "processors": {(path, name): id},
+                "operations": [operation dicts]}. Each operation has action
+                ("create", "update" or "delete"), kind ("group", "processor" or
+                "connection"), path, name and, depending on the action, id,
+                version, spec and changes.
+        """
+        root_id = self.process_group.resolve_id(process_group_id)
+        state = self.fetch(spec, root_id)
+        operations = []
+        kept_groups = {path: group["id"] for path, group in state["groups"].items()}
+        kept_processors = {}
+
+        for group in spec["groups"]:
+            if group["path"] not in kept_groups:
+                operations.append(_operation("create", "group", group["path"][:-1], group["name"], spec=group))
+
+        # Processors: match by (path, name, type)
+        existing = {}
+        leftovers = []
+        for path, entities in state["processors"].items():
+            for entity in entities:
+                key = (path, entity["component"]["name"], entity["component"]["type"])
+                if key in existing:
+                    leftovers.append((path, entity))
+                else:
+                    existing[key] = entity
+
+        for proc in spec["processors"]:
+            entity = existing.pop((proc["group"], proc["name"], proc["type"]), None)
+            if entity is None:
+                operations.append(_operation("create", "processor", proc["group"], proc["name"], spec=proc))
+                continue
+
+            kept_processors[(proc["group"], proc["name"])] = entity["id"]
+            changes = processor_changes(entity, proc)
+            if changes:
+                operations.append(_operation("update", "processor", proc["group"], proc["name"], spec=proc,
+                                             id=entity["id"], version=entity["revision"]["version"],
+                                             changes=changes))
+
+        leftovers.extend((key[0], entity) for key, entity in existing.items())
+
+        # Connections: match by (path, source name, destination name) between kept processors
+        kept_ids = {proc_id: key[1] for key, proc_id in kept_processors.items()}
+        existing_connections = {}
+        stale_connections = []
+        for path, entities in state["connections"].items():
+            for entity in entities:
+                component = entity["component"]
+                if component["source"]["type"] != "PROCESSOR" or component["destination"]["type"] != "PROCESSOR":
+                    continue
+                source = kept_ids.get(component["source"]["id"])
+                destination = kept_ids.get(component["destination"]["id"])
+                key = (path, source, destination)
+                if source is None or destination is None or key in existing_connections:
+                    stale_connections.append((path, entity))
+                else:
+                    existing_connections[key] = entity
+
+        for conn in spec["connections"]:
+            name = (conn["source"], conn["destination"])
+            entity = existing_connections.pop((conn["group"],) + name, None)
+            if entity is None:
+                operations.append(_operation("create", "connection", conn["group"], name, spec=conn))
+                continue
+
+            current = sorted(entity["component"].get("selectedRelationships") or [])
+            if current != sorted(conn["relationships"]):
+                operations.append(_operation("update", "connection", conn["group"], name, spec=conn,
+                                             id=entity["id"], version=entity["revision"]["version"],
+                                             changes={"relationships": (current, sorted(conn["relationships"]))}))
+
+        stale_connections.extend((key[0], entity) for key, entity in existing_connections.items())
+
+        if prune:
+            for path, entity in stale_connections:
+                component = entity["component"]
+                operations.append(_operation("delete", "connection", path, entity["id"], id=entity["id"],
+                                             version=entity["revision"]["version"],
+                                             endpoints=(component["source"]["id"], component["destination"]["id"])))
+            for path, entity in leftovers:
+                operations.append(_operation("delete", "processor", path, entity["component"]["name"],
+                                             id=entity["id"], version=entity["revision"]["version"]))
+            for path, entity in state["extra_groups"]:
+                operations.append(_operation("delete", "group", path[:-1], path[-1], id=entity["id"],
+                                             version=entity["revision"]["version"]))
+
+        return {
+            "root_id": root_id,
+            "groups": kept_groups,
+            "processors": kept_processors,
+            "operations": operations
+        }
+
+
+def _operation(action, kind, path, name, **fields):
+    operation = {"action": action, "kind": kind, "path": path, "name": name}
+    operation.update(fields)
+    return operation
+
+
+def processor_changes(entity, proc):
+    """
+    Compare a live processor with its spec.
+
+    Only properties named in the spec are compared, since NiFi reports
+    every property including defaults. Positions are layout, not behaviour,
+    and are ignored.
+
+    Args:
+        entity: Processor entity from NiFi
+        proc: Processor spec
+
+    Returns:
+        dict: Field -> (current, desired) for every difference
+    """
+    config = entity["component"].get("config", {})
+    current_properties = config.get("properties") or {}
+    changes = {}
+
+    for name, value in proc["properties"].items():
+        if current_properties.get(name) != value:
+            changes[f"properties.{name}"] = (current_properties.get(name), value)
+
+    if config.get("schedulingPeriod") != proc["scheduling_period"]:
+        changes["scheduling_period"] = (config.get("schedulingPeriod"), proc["scheduling_period"])
+
+    current_terminated = sorted(config.get("autoTerminatedRelationships") or [])
+    if current_terminated != sorted(proc["auto_terminate"]):
+        changes["auto_terminate"] = (current_terminated, sorted(proc["auto_terminate"]))
+
+    return changes
+
+
+def format_operation(operation):
+    """
+    Format a plan operation for display.
+
+    Args:
+        operation: Operation dict from Planner.plan
+
+    Returns:
+        str: e.g. "+ processor Ingest/Generate"
+    """
+    symbol = {"create": "+", "update": "~", "delete": "-"}[operation["action"]]
+    name = operation["name"]
+    if operation["kind"] == "connection" and isinstance(name, tuple):
+        name = f"{name[0]} -> {name[1]}"
+
+    line = f"{symbol} {operation['kind']} {group_label(operation['path'])}/{name}"
+    for field, (current, desired) in sorted(operation.get("changes", {}).items()):
+        line += f"\n      {field}: {current!r} -> {desired!r}"
+    return line
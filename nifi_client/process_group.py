@@ -0,0 +1,369 @@
+"""
+NiFi Process Group Management
+
+Class for scheduling whole process groups with a single API call.
+"""
+
+import time
+
+from .client import APIError
+
+
+# Processor runStatus values reported by the status API that can never become RUNNING
+NOT_RUNNABLE = ("Invalid", "Disabled")
+
+
+class ProcessGroup:
+    """
+    Represents a NiFi process group.
+
+    Starting or stopping a group schedules every component in it, including
+    nested groups, with one ``PUT /flow/process-groups/{id}`` request.
+    """
+
+    def __init__(self, client):
+        """
+        Initialize ProcessGroup manager.
+
+        Args:
+            client: NiFiClient instance
+        """
+        self.client = client
+
+    def resolve_id(self, process_group_id):
+        """
+        Resolve an optional process group ID, mapping None and "root" to the root group ID.
+
+        Args:
+            process_group_id: Process group ID, "root" or None
+
+        Returns:
+            str: Concrete process group ID
+        """
+        if not process_group_id or process_group_id == "root":
+            return self.client.get_root_process_group_id()
+        return process_group_id
+
+    def get(self, process_group_id=None):
+        """
+        Get process group information.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+
+        Returns:
+            dict: Process group entity
+        """
+        return self.client.get(f"/process-groups/{self.resolve_id(process_group_id)}")
+
+    def create(self, name, parent_group_id=None, position=None):
+        """
+        Create a child process group.
+
+        Args:
+            name: Process group name
+            parent_group_id: Parent process group ID (default: root)
+            position: Position dict with x, y coordinates (default: {x: 300, y: 200})
+
+        Returns:
+            dict: Created process group response with ID
+        """
+        parent_group_id = self.resolve_id(parent_group_id)
+        data = {
+            "revision": {"version": 0},
+            "component": {
+                "name": name,
+                "position": position or {"x": 300, "y": 200}
+            }
+        }
+        return self.client.post(f"/process-groups/{parent_group_id}/process-groups", data)
+
+    def get_flow(self, process_group_id=None):
+        """
+        Get the contents of a process group (processors, connections, child groups, ...).
+
+        Args:
+            process_group_id: Process group ID (default: root)
+
+        Returns:
+            dict: The processGroupFlow "flow" object
+        """
+        process_group_id = self.resolve_id(process_group_id)
+        response = self.client.get(f"/flow/process-groups/{process_group_id}")
+        return response["processGroupFlow"]["flow"]
+
+    def delete(self, process_group_id, version=None):
+        """
+        Delete a process group (it must be stopped and its queues empty).
+
+        Args:
+            process_group_id: Process group ID
+            version: Current revision version (default: fetched)
+
+        Returns:
+            dict: Deletion response
+        """
+        if version is None:
+            version = self.get(process_group_id)["revision"]["version"]
+
+        return self.client.delete(f"/process-groups/{process_group_id}", params={"version": version})
+
+    def get_status(self, process_group_id=None, recursive=True):
+        """
+        Get the status snapshot of a process group.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+            recursive: Include nested process groups (default: True)
+
+        Returns:
+            dict: Aggregate status snapshot
+        """
+        process_group_id = self.resolve_id(process_group_id)
+        flag = "true" if recursive else "false"
+        response = self.client.get(f"/flow/process-groups/{process_group_id}/status?recursive={flag}")
+        return response["processGroupStatus"]["aggregateSnapshot"]
+
+    def schedule(self, process_group_id, state):
+        """
+        Schedule every component in a process group, recursively, in one request.
+
+        Cached processor revisions and responses are dropped since every
+        scheduled component's revision changes.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+            state: Target state ("RUNNING" or "STOPPED")
+
+        Returns:
+            dict: Schedule response
+        """
+        process_group_id = self.resolve_id(process_group_id)
+        data = {
+            "id": process_group_id,
+            "state": state,
+            "disconnectedNodeAcknowledged": False
+        }
+        response = self.client.put(f"/flow/process-groups/{process_group_id}", data)
+        self.client.revisions.clear()
+        if self.client.cache is not None:
+            self.client.cache.clear()
+        return response
+
+    def start(self, process_group_id=None, wait=True, timeout=60):
+        """
+        Start all components in a process group.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+            wait: Wait until every runnable processor reports Running (default: True)
+            timeout: Seconds to wait for the target state (default: 60)
+
+        Returns:
+            dict: Schedule response
+
+        Raises:
+            APIError: If the group does not reach the target state in time
+        """
+        return self._set_state(process_group_id, "RUNNING", wait, timeout)
+
+    def stop(self, process_group_id=None, wait=True, timeout=60):
+        """
+        Stop all components in a process group.
+
+        Args:
+            process_group_id: Process group ID (default: root)
+            wait: Wait until every processor reports Stopped (default: True)
+            timeout: Seconds to wait for the target state (default: 60)
+
+        Returns:
+            dict: Schedule response
+
+        Raises:
+            APIError: If the group does not reach the target state in time
+        """
+        return self._set_state(process_group_id, "STOPPED", wait, timeout)
+
+    def _set_state(self, process_group_id, state, wait, timeout):
+        process_group_id = self.resolve_id(process_group_id)
+        response = self.schedule(process_group_id, state)
+
+        if wait and not self.wait_for_state(process_group_id, state, timeout):
+            raise APIError(f"Process group {process_group_id} did not reach {state} within {timeout}s")
+
+        return response
+
+    def wait_for_state(self, targets, state, timeout=60, interval=1, on_poll=None):
+        """
+        Wait until processors reach a run state, with one status request per poll.
+
+        Each poll reads one group status snapshot covering every target. The
+        first poll is immediate; after that polls start 0.1s apart and back
+        off by half again each time no target made progress, up to interval.
+
+        A processor counts as STOPPED only once it also has no active
+        threads. Processors whose status is Invalid or Disabled can never
+        reach RUNNING, so they end the wait instead of holding it until the
+        timeout and are reported in the result's ``invalid`` list.
+
+        Args:
+            targets: Process group ID (every processor in it, recursively) or
+                an iterable of processor IDs
+            state: Target state ("RUNNING", "STOPPED" or "DISABLED")
+            timeout: Maximum seconds to wait (default: 60)
+            interval: Longest pause between polls in seconds (default: 1)
+            on_poll: Optional callback receiving the WaitResult after every poll
+
+        Returns:
+            WaitResult: Truthy if every target was found and none is left pending
+        """
+        if isinstance(targets, str) or targets is None:
+            scope, recursive, ids = self.resolve_id(targets), True, None
+        else:
+            ids = set(targets)
+            scope, recursive = self._status_scope(ids)
+
+        started = time.monotonic()
+        deadline = started + timeout
+        delay = min(0.1, interval)
+        result = WaitResult(state)
+
+        while True:
+            snapshot = self.get_status(scope, recursive=recursive)
+            statuses = iter_processor_status(snapshot)
+            if ids is not None:
+                statuses = (proc for proc in statuses if proc["id"] in ids)
+
+            previous = len(result.pending)
+            result.update(statuses, ids, time.monotonic() - started)
+            if result.missing and (scope, recursive) != ("root", True):
+                # Some targets live outside the guessed group; widen to the whole flow
+                scope, recursive = "root", True
+                continue
+            if on_poll:
+                on_poll(result)
+
+            if result.done or time.monotonic() >= deadline:
+                return result
+
+            if result.polls > 1 and len(result.pending) >= previous:
+                delay = min(interval, delay * 1.5)
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+
+    def _status_scope(self, processor_ids):
+        """Pick the smallest group status (group ID, recursive) known to cover some processors."""
+        groups = set()
+        for processor_id in processor_ids:
+            entity = self.client.revisions.get(processor_id)
+            groups.add(entity.get("component", {}).get("parentGroupId") if entity else None)
+
+        if len(groups) == 1 and None not in groups:
+            return groups.pop(), False
+        return "root", True
+
+
+class WaitResult:
+    """
+    Outcome of ProcessGroup.wait_for_state, truthy when the state was reached.
+
+    ``pending``, ``invalid`` and ``missing`` hold processor IDs: still
+    changing state, unable to run, and not found in the status. ``threads``
+    counts active threads across the targets at the last poll.
+    """
+
+    __slots__ = ("state", "pending", "invalid", "missing", "threads", "polls", "seconds")
+
+    def __init__(self, state):
+        self.state = state
+        self.pending = []
+        self.invalid = []
+        self.missing = []
+        self.threads = 0
+        self.polls = 0
+        self.seconds = 0.0
+
+    def update(self, statuses, ids, seconds):
+        """Classify the targets from one poll's processor status snapshots."""
+        expected = self.state.title()
+        self.pending, self.invalid, self.threads = [], [], 0
+        seen = set()
+
+        for proc in statuses:
+            seen.add(proc["id"])
+            run_status = proc.get("runStatus")
+            threads = proc.get("activeThreadCount", 0) or 0
+            self.threads += threads
+
+            if self.state == "RUNNING" and run_status in NOT_RUNNABLE:
+                self.invalid.append(proc["id"])
+            elif self.state == "STOPPED" and run_status in ("Stopped",) + NOT_RUNNABLE:
+                if threads:
+                    self.pending.append(proc["id"])
+            elif run_status != expected:
+                self.pending.append(proc["id"])
+
+        self.missing = sorted(ids - seen) if ids is not None else []
+        self.polls += 1
+        self.seconds = seconds
+
+    @property
+    def done(self):
+        """bool: No target is still changing state."""
+        return not self.pending
+
+    def __bool__(self):
+        return not self.pending and not self.missing
+
+    def __repr__(self):
+        return (f"WaitResult({self.state}: {len(self.pending)} pending, {len(self.invalid)} invalid, "
+                f"{len(self.missing)} missing, {self.threads} threads, {self.polls} polls)")
+
+
+def iter_processor_status(snapshot):
+    """
+    Yield every processor status snapshot in a (recursive) group status snapshot.
+
+    Args:
+        snapshot: Process group aggregate status snapshot
+
+    Yields:
+        dict: Processor status snapshot
+    """
+    for entry in snapshot.get("processorStatusSnapshots", []):
+        yield entry["processorStatusSnapshot"]
+
+    for entry in snapshot.get("processGroupStatusSnapshots", []):
+        yield from iter_processor_status(entry["processGroupStatusSnapshot"])
+
+
+def iter_connection_status(snapshot):
+    """
+    Yield every connection status snapshot in a (recursive) group status snapshot.
+
+    Args:
+        snapshot: Process group aggregate status snapshot
+
+    Yields:
+        dict: Connection status snapshot
+    """
+    for entry in snapshot.get("connectionStatusSnapshots", []):
+        yield entry["connectionStatusSnapshot"]
+
+    for entry in snapshot.get("processGroupStatusSnapshots", []):
+        yield from iter_connection_status(entry["processGroupStatusSnapshot"])
+
+
+def iter_group_status(snapshot):
+    """
+    Yield a group status snapshot and those of all its descendants.
+
+    Args:
+        snapshot: Process group aggregate status snapshot
+
+    Yields:
+        dict: Process group status snapshot
+    """
+    yield snapshot
+
+    for entry in snapshot.get("processGroupStatusSnapshots", []):
+        yield from iter_group_status(entry["processGroupStatusSnapshot"])
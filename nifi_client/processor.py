@@ -4,7 +4,49 @@ NiFi Processor Management
 Class for creating and managing NiFi processors.
 """
 
-import requests
+from .client import APIError
+from .process_group import ProcessGroup
+
+
+def processor_payload(processor_type, name, position=None, properties=None, scheduling_period="60 sec",
+                      auto_terminated_relationships=None):
+    """
+    Build the request body for creating a processor.
+
+    Args:
+        processor_type: Processor type (e.g., "org.apache.nifi.processors.standard.GenerateFlowFile")
+        name: Processor name
+        position: Position dict with x, y coordinates (default: {x: 300, y: 200})
+        properties: Processor properties dict
+        scheduling_period: Scheduling period (default: "60 sec")
+        auto_terminated_relationships: List of relationships to auto-terminate
+
+    Returns:
+        dict: Processor entity ready to POST
+    """
+    if not position:
+        position = {"x": 300, "y": 200}
+
+    if not properties:
+        properties = {}
+
+    config = {
+        "properties": properties,
+        "schedulingPeriod": scheduling_period
+    }
+
+    if auto_terminated_relationships:
+        config["autoTerminatedRelationships"] = auto_terminated_relationships
+
+    return {
+        "revision": {"version": 0},
+        "component": {
+            "type": processor_type,
+            "name": name,
+            "position": position,
+            "config": config
+        }
+    }
 
 
 class Processor:
@@ -14,14 +56,16 @@ class Processor:
     Provides methods for creating, starting, stopping, and querying processors.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, conflict_retries=3):
         """
         Initialize Processor manager.
 
         Args:
             client: NiFiClient instance
+            conflict_retries: Retries after an HTTP 409 revision conflict (default: 3)
         """
         self.client = client
+        self.conflict_retries = conflict_retries
 
     def create(self, processor_type, name, process_group_id=None, position=None, properties=None,
                scheduling_period="60 sec", auto_terminated_relationships=None):
@@ -43,110 +87,205 @@ class Processor:
         if not process_group_id:
             process_group_id = self.client.get_root_process_group_id()
 
-        if not position:
-            position = {"x": 300, "y": 200}
-
-        if not properties:
-            properties = {}
-
-        config = {
-            "properties": properties,
-            "schedulingPeriod": scheduling_period
-        }
-
-        if auto_terminated_relationships:
-            config["autoTerminatedRelationships"] = auto_terminated_relationships
-
-        data = {
-            "revision": {"version": 0},
-            "component": {
-                "type": processor_type,
-                "name": name,
-                "position": position,
-                "config": config
-            }
-        }
+        data = processor_payload(processor_type, name, position, properties, scheduling_period,
+                                 auto_terminated_relationships)
 
         response = self.client.post(f"/process-groups/{process_group_id}/processors", data)
         return response
 
-    def get(self, processor_id):
+    def get(self, processor_id, cached=True):
         """
         Get processor information.
 
         Args:
             processor_id: Processor ID
+            cached: Allow a cached response, if the client caches (default: True)
 
         Returns:
             dict: Processor information
         """
-        return self.client.get(f"/processors/{processor_id}")
+        proc_info = self.client.get(f"/processors/{processor_id}", cached=cached)
+        self.client.revisions.record(proc_info)
+        return proc_info
 
-    def start(self, processor_id):
+    def _current(self, processor_id, refresh=False):
+        """Return the cached processor entity, fetching it on a miss or when refresh is set."""
+        proc_info = None if refresh else self.client.revisions.get(processor_id)
+        return proc_info or self.get(processor_id, cached=not refresh)
+
+    def _with_revision(self, processor_id, operation):
         """
-        Start a processor.
+        Run a mutation with the cached revision, refreshing and retrying on HTTP 409.
+
+        NiFi also answers 409 when the processor's state forbids the change
+        (it is running, or still has connections). Those are not revision
+        conflicts: if the refreshed revision is the one just sent, the error
+        is raised at once instead of being retried.
 
         Args:
             processor_id: Processor ID
+            operation: Callable taking the current processor entity
 
         Returns:
-            dict: Updated processor information
+            Result of operation
         """
-        proc_info = self.get(processor_id)
-        revision = proc_info["revision"]["version"]
-        state = proc_info["component"]["state"]
+        proc_info = self._current(processor_id)
+        for attempt in range(self.conflict_retries + 1):
+            try:
+                return operation(proc_info)
+            except APIError as e:
+                if e.status_code != 409 or attempt == self.conflict_retries:
+                    raise
+                # The operation may have re-read the processor; the cache holds what it sent
+                sent = (self.client.revisions.get(processor_id) or proc_info)["revision"]["version"]
+                if attempt and self.client.retry is not None:
+                    # Repeated conflicts: back off instead of racing the other writer
+                    self.client.retry.wait(attempt)
+                proc_info = self._current(processor_id, refresh=True)
+                if proc_info["revision"]["version"] == sent:
+                    raise
+
+    def _set_state(self, processor_id, state, done_status, already_status):
+        def operation(proc_info):
+            if proc_info["component"]["state"] == state:
+                # The cache only vouches for the revision; the state may have been
+                # changed elsewhere since, so confirm it before skipping the request
+                proc_info = self._current(processor_id, refresh=True)
+                if proc_info["component"]["state"] == state:
+                    return {"status": already_status, "processor": proc_info}
+
+            data = {
+                "revision": {"version": proc_info["revision"]["version"]},
+                "state": state
+            }
 
-        if state == "RUNNING":
-            return {"status": "already_running", "processor": proc_info}
+            response = self.client.put(f"/processors/{processor_id}/run-status", data)
+            return {"status": done_status, "processor": response}
 
-        data = {
-            "revision": {"version": revision},
-            "state": "RUNNING"
-        }
+        return self._with_revision(processor_id, operation)
+
+    def start(self, processor_id):
+        """
+        Start a processor.
+
+        Uses the cached revision when available; a revision conflict
+        refreshes the processor and retries. A processor the cache shows as
+        already running is re-read before the start is skipped.
+
+        Args:
+            processor_id: Processor ID
 
-        response = self.client.put(f"/processors/{processor_id}/run-status", data)
-        return {"status": "started", "processor": response}
+        Returns:
+            dict: Updated processor information
+        """
+        return self._set_state(processor_id, "RUNNING", "started", "already_running")
 
     def stop(self, processor_id):
         """
         Stop a processor.
 
+        Uses the cached revision when available; a revision conflict
+        refreshes the processor and retries. A processor the cache shows as
+        already stopped is re-read before the stop is skipped.
+
         Args:
             processor_id: Processor ID
 
         Returns:
             dict: Updated processor information
         """
-        proc_info = self.get(processor_id)
-        revision = proc_info["revision"]["version"]
-        state = proc_info["component"]["state"]
+        return self._set_state(processor_id, "STOPPED", "stopped", "already_stopped")
 
-        if state == "STOPPED":
-            return {"status": "already_stopped", "processor": proc_info}
+    def wait_for_state(self, processor_ids, state, timeout=60, interval=1):
+        """
+        Wait until processors reach a run state, polling one group status per check.
 
-        data = {
-            "revision": {"version": revision},
-            "state": "STOPPED"
-        }
+        Processors in one known group are checked with that group's status;
+        otherwise the whole flow's recursive status is read. See
+        ProcessGroup.wait_for_state.
 
-        response = self.client.put(f"/processors/{processor_id}/run-status", data)
-        return {"status": "stopped", "processor": response}
+        Args:
+            processor_ids: Processor ID or iterable of IDs
+            state: Target state ("RUNNING", "STOPPED" or "DISABLED")
+            timeout: Maximum seconds to wait (default: 60)
+            interval: Longest pause between polls in seconds (default: 1)
+
+        Returns:
+            WaitResult: Truthy if every processor reached the state
+        """
+        if isinstance(processor_ids, str):
+            processor_ids = [processor_ids]
+        return ProcessGroup(self.client).wait_for_state(processor_ids, state, timeout=timeout, interval=interval)
 
-    def list_all(self, process_group_id=None):
+    def update(self, processor_id, name=None, properties=None, scheduling_period=None,
+               auto_terminated_relationships=None):
+        """
+        Update a processor's name or configuration (processor must be stopped).
+
+        Only the given fields are sent; omitted properties keep their values.
+
+        Args:
+            processor_id: Processor ID
+            name: New processor name (optional)
+            properties: Properties to set (optional)
+            scheduling_period: Scheduling period (optional)
+            auto_terminated_relationships: Relationships to auto-terminate (optional)
+
+        Returns:
+            dict: Updated processor information
+        """
+        component = {"id": processor_id}
+        config = {}
+
+        if name is not None:
+            component["name"] = name
+        if properties is not None:
+            config["properties"] = properties
+        if scheduling_period is not None:
+            config["schedulingPeriod"] = scheduling_period
+        if auto_terminated_relationships is not None:
+            config["autoTerminatedRelationships"] = auto_terminated_relationships
+        if config:
+            component["config"] = config
+
+        def operation(proc_info):
+            data = {
+                "revision": {"version": proc_info["revision"]["version"]},
+                "component": component
+            }
+            return self.client.put(f"/processors/{processor_id}", data)
+
+        return self._with_revision(processor_id, operation)
+
+    def list_all(self, process_group_id=None, stream=False):
         """
         List all processors in a process group.
 
         Args:
             process_group_id: Process group ID (default: root)
+            stream: Decode the response incrementally and return a generator,
+                keeping memory flat for very large groups (default: False)
 
         Returns:
-            list: List of processors
+            list: List of processors (a generator when stream=True)
         """
         if not process_group_id:
             process_group_id = "root"
 
-        response = self.client.get(f"/process-groups/{process_group_id}/processors")
-        return response.get("processors", [])
+        endpoint = f"/process-groups/{process_group_id}/processors"
+        if stream:
+            return self._stream_processors(endpoint)
+
+        response = self.client.get(endpoint)
+        processors = response.get("processors", [])
+        self.client.revisions.record_many(processors)
+        return processors
+
+    def _stream_processors(self, endpoint):
+        """Yield the processors of a streamed listing, recording their revisions."""
+        for path, proc in self.client.get_stream(endpoint, ["processors"]):
+            self.client.revisions.record(proc)
+            yield proc
 
     def delete(self, processor_id):
         """
@@ -161,13 +300,9 @@ class Processor:
         # First stop the processor
         self.stop(processor_id)
 
-        # Get current revision
-        proc_info = self.get(processor_id)
-        revision = proc_info["revision"]["version"]
+        # Delete with the revision returned by the stop (or cached)
+        def operation(proc_info):
+            revision = proc_info["revision"]["version"]
+            return self.client.delete(f"/processors/{processor_id}", params={"version": revision})
 
-        # Delete using DELETE request
-        url = f"{self.client.base_url}/nifi-api/processors/{processor_id}?version={revision}"
-        headers = self.client.get_headers()
-        response = requests.delete(url, headers=headers, verify=self.client.verify_ssl, timeout=30)
-        response.raise_for_status()
-        return response.json()
+        return self._with_revision(processor_id, operation)
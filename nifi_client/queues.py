@@ -0,0 +1,190 @@
+"""
+NiFi Queue Monitor
+
+Tracks connection queues across a process group tree with one recursive
+status request per poll, computing how close each queue is to
+backpressure and how fast it is filling.
+"""
+
+import re
+import time
+
+from .process_group import ProcessGroup, iter_connection_status
+from .walker import Walker
+
+
+_DATA_SIZE = re.compile(r"^\s*([\d.]+)\s*([KMGTP]?B)?\s*$", re.IGNORECASE)
+_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4, "PB": 1024 ** 5}
+
+
+def parse_data_size(value):
+    """
+    Convert a NiFi data size such as "1 GB" to bytes.
+
+    Args:
+        value: Data size string (or a number of bytes)
+
+    Returns:
+        int: Bytes, or None if the value cannot be parsed
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _DATA_SIZE.match(value or "")
+    if not match:
+        return None
+    return int(float(match.group(1)) * _UNITS[(match.group(2) or "B").upper()])
+
+
+def format_bytes(size):
+    """Format a byte count with a binary unit, e.g. 1.5 MB."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if abs(size) < 1024 or unit == "TB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class QueueMonitor:
+    """
+    Polls connection queues and ranks them by backpressure pressure.
+
+    Fill ratios use the percentages NiFi reports in the status snapshot.
+    When a snapshot lacks them, the connection's thresholds are read once
+    by walking the group tree and reused until a new connection appears.
+    """
+
+    def __init__(self, client, process_group_id="root"):
+        """
+        Initialize queue monitor.
+
+        Args:
+            client: NiFiClient instance
+            process_group_id: Group whose queues are monitored recursively (default: "root")
+        """
+        self.client = client
+        self.process_group = ProcessGroup(client)
+        self.process_group_id = process_group_id
+        self.thresholds = {}
+        self.previous = {}
+        self.previous_time = None
+
+    def load_thresholds(self):
+        """
+        Read the backpressure thresholds of every connection in the tree.
+
+        Returns:
+            dict: Connection ID -> (object threshold, size threshold in bytes)
+        """
+        walker = Walker(self.client)
+        for kind, entity, path in walker.walk(self.process_group_id, kinds=("connection",)):
+            component = entity.get("component", {})
+            self.thresholds[entity["id"]] = (component.get("backPressureObjectThreshold"),
+                                             parse_data_size(component.get("backPressureDataSizeThreshold")))
+        return self.thresholds
+
+    def _ratios(self, snapshot):
+        count = snapshot.get("percentUseCount")
+        size = snapshot.get("percentUseBytes")
+        if count is not None and size is not None:
+            return count / 100, size / 100
+
+        if snapshot["id"] not in self.thresholds:
+            self.load_thresholds()
+        object_threshold, size_threshold = self.thresholds.setdefault(snapshot["id"], (None, None))
+        count_ratio = snapshot.get("flowFilesQueued", 0) / object_threshold if object_threshold else 0.0
+        size_ratio = snapshot.get("bytesQueued", 0) / size_threshold if size_threshold else 0.0
+        return count_ratio, size_ratio
+
+    def poll(self):
+        """
+        Read every queue once and compute fill ratios and rates.
+
+        Rates are the change in queued FlowFiles and bytes per second since
+        the previous poll (0 on the first poll).
+
+        Returns:
+            list: One dict per connection with keys id, name, group_id, source,
+                destination, queued, queued_bytes, count_ratio, size_ratio, fill
+                (the larger ratio), rate, bytes_rate and seconds_to_full (None
+                unless the queue is growing)
+        """
+        status = self.process_group.get_status(self.process_group_id, recursive=True)
+        now = time.monotonic()
+        elapsed = now - self.previous_time if self.previous_time is not None else None
+        queues = []
+        current = {}
+
+        for snapshot in iter_connection_status(status):
+            queued = snapshot.get("flowFilesQueued", 0)
+            queued_bytes = snapshot.get("bytesQueued", 0)
+            count_ratio, size_ratio = self._ratios(snapshot)
+            fill = max(count_ratio, size_ratio)
+
+            rate = bytes_rate = 0.0
+            before = self.previous.get(snapshot["id"])
+            if before is not None and elapsed:
+                rate = (queued - before[0]) / elapsed
+                bytes_rate = (queued_bytes - before[1]) / elapsed
+
+            seconds_to_full = None
+            if rate > 0 and 0 < count_ratio < 1:
+                seconds_to_full = (queued / count_ratio - queued) / rate
+            if bytes_rate > 0 and 0 < size_ratio < 1:
+                by_size = (queued_bytes / size_ratio - queued_bytes) / bytes_rate
+                seconds_to_full = by_size if seconds_to_full is None else min(seconds_to_full, by_size)
+
+            current[snapshot["id"]] = (queued, queued_bytes)
+            queues.append({
+                "id": snapshot["id"],
+                "name": snapshot.get("name") or "",
+                "group_id": snapshot.get("groupId"),
+                "source": snapshot.get("sourceName", ""),
+                "destination": snapshot.get("destinationName", ""),
+                "queued": queued,
+                "queued_bytes": queued_bytes,
+                "count_ratio": count_ratio,
+                "size_ratio": size_ratio,
+                "fill": fill,
+                "rate": rate,
+                "bytes_rate": bytes_rate,
+                "seconds_to_full": seconds_to_full,
+            })
+
+        self.previous = current
+        self.previous_time = now
+        return queues
+
+    def hottest(self, top=10, queues=None):
+        """
+        Return the connections closest to backpressure.
+
+        Args:
+            top: Number of connections to return (default: 10)
+            queues: Result of a previous poll() (default: poll now)
+
+        Returns:
+            list: Queue dicts ordered by fill ratio, then by growth rate
+        """
+        if queues is None:
+            queues = self.poll()
+        return sorted(queues, key=lambda queue: (queue["fill"], queue["rate"]), reverse=True)[:top]
+
+
+def format_queue(queue):
+    """
+    Format one queue as a table row.
+
+    Args:
+        queue: Queue dict from QueueMonitor.poll
+
+    Returns:
+        str: Printable row
+    """
+    label = queue["name"] or f"{queue['source']} -> {queue['destination']}"
+    if len(label) > 40:
+        label = label[:37] + "..."
+    eta = f"{queue['seconds_to_full']:.0f}s" if queue["seconds_to_full"] is not None else "-"
+    return (f"{label:40} {queue['fill'] * 100:5.1f}% {queue['queued']:>9} {format_bytes(queue['queued_bytes']):>10} "
+            f"{queue['rate']:>+9.1f}/s {eta:>8}")
+
+
+QUEUE_HEADER = f"{'Connection':40} {'Fill':>6} {'Queued':>9} {'Size':>10} {'Rate':>11} {'Full in':>8}"
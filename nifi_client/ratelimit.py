@@ -0,0 +1,198 @@
+"""
+NiFi Client Rate Limiting
+
+Token-bucket limits on the request rate, with separate budgets for reads
+and writes and an adaptive mode that slows down while NiFi is struggling.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Tokens refill continuously at ``rate`` per second up to ``burst``. A
+    caller that finds the bucket empty reserves the next token and sleeps
+    until it is due, so waiting callers are served in arrival order.
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        Initialize token bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: one second of tokens, at least 1)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate, burst=None):
+        """Change the refill rate (and capacity, if given), keeping the tokens accrued so far."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = float(burst)
+                self.tokens = min(self.tokens, self.burst)
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """
+        Take one token, sleeping until it is available.
+
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class RateLimiter:
+    """
+    Limits requests per second with separate read and write budgets.
+
+    In adaptive mode the limiter watches request latency and server errors.
+    When the p95 latency over the recent window exceeds ``target_p95``, or
+    the share of 5xx responses and connection errors exceeds
+    ``max_error_rate``, both budgets are halved, down to ``min_factor`` of
+    the configured rates. Once NiFi is healthy again they grow back in
+    steps of 10%. The burst allowance scales with the rates, so a slowed
+    limiter does not let a full configured burst through at once.
+    """
+
+    def __init__(self, read_rate=50.0, write_rate=10.0, burst=None, adaptive=False, target_p95=1.0,
+                 max_error_rate=0.05, window=100, min_factor=0.1):
+        """
+        Initialize rate limiter.
+
+        Args:
+            read_rate: GET requests per second (default: 50)
+            write_rate: POST/PUT/DELETE requests per second (default: 10)
+            burst: Requests allowed at once before limiting starts (default: one second's worth)
+            adaptive: Back off while latency or server errors are high (default: False)
+            target_p95: With adaptive, p95 latency in seconds that triggers backoff (default: 1.0)
+            max_error_rate: With adaptive, share of failed requests that triggers backoff (default: 0.05)
+            window: With adaptive, recent requests considered (default: 100)
+            min_factor: With adaptive, lowest fraction of the configured rates (default: 0.1)
+
+        Raises:
+            ValueError: If a rate or burst is not positive, or min_factor is not in (0, 1]
+        """
+        for name, value in (("read_rate", read_rate), ("write_rate", write_rate), ("burst", burst)):
+            if value is not None and not float(value) > 0:
+                raise ValueError(f"{name} must be positive, got {value!r}")
+        if not 0 < min_factor <= 1:
+            raise ValueError(f"min_factor must be in (0, 1], got {min_factor!r}")
+
+        self.read_rate = read_rate
+        self.write_rate = write_rate
+        self.burst = burst
+        self.read = TokenBucket(read_rate, burst)
+        self.write = TokenBucket(write_rate, burst)
+        self.adaptive = adaptive
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.min_factor = min_factor
+        self.factor = 1.0
+        self.waited = 0.0
+        self.samples = deque(maxlen=window)
+        self._since_adjust = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, method):
+        """
+        Wait until a request with the given method may be sent.
+
+        Args:
+            method: HTTP method
+        """
+        bucket = self.read if method.upper() in READ_METHODS else self.write
+        waited = bucket.acquire()
+        if waited:
+            with self._lock:
+                self.waited += waited
+
+    def record(self, latency, status_code=None):
+        """
+        Record a finished request for adaptive mode.
+
+        Args:
+            latency: Seconds the request took
+            status_code: Response status, or None if no response was received
+        """
+        if not self.adaptive:
+            return
+
+        failed = status_code is None or status_code >= 500
+        with self._lock:
+            self.samples.append((latency, failed))
+            self._since_adjust += 1
+            # Re-evaluate every tenth of a window so one slow request can't swing the rate
+            if self._since_adjust < max(1, self.samples.maxlen // 10):
+                return
+            self._since_adjust = 0
+            p95, error_rate = self._health()
+
+            if p95 > self.target_p95 or error_rate > self.max_error_rate:
+                factor = max(self.min_factor, self.factor / 2)
+            elif p95 < self.target_p95 / 2 and error_rate == 0:
+                factor = min(1.0, self.factor + 0.1)
+            else:
+                return
+
+            if factor != self.factor:
+                self.factor = factor
+                self._scale(self.read, self.read_rate)
+                self._scale(self.write, self.write_rate)
+
+    def _scale(self, bucket, rate):
+        """Set a bucket's rate and burst to the current factor of their configured values."""
+        burst = self.burst if self.burst is not None else max(1.0, rate)
+        bucket.set_rate(rate * self.factor, max(1.0, burst * self.factor))
+
+    def _health(self):
+        latencies = sorted(sample[0] for sample in self.samples)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+        error_rate = sum(1 for sample in self.samples if sample[1]) / len(self.samples) if self.samples else 0.0
+        return p95, error_rate
+
+    def stats(self):
+        """
+        Return the limiter's current state.
+
+        Returns:
+            dict: read_rate, write_rate, read_burst and write_burst in effect,
+                factor, waited (total seconds callers were delayed), and p95
+                and error_rate over the recent window
+        """
+        with self._lock:
+            p95, error_rate = self._health()
+            return {
+                "read_rate": self.read.rate,
+                "write_rate": self.write.rate,
+                "read_burst": self.read.burst,
+                "write_burst": self.write.burst,
+                "factor": self.factor,
+                "waited": self.waited,
+                "p95": p95,
+                "error_rate": error_rate,
+            }
@@ -0,0 +1,213 @@
+"""
+NiFi Request Retries
+
+Retry policy with exponential backoff and jitter, and a circuit breaker
+that fails fast while NiFi keeps failing.
+"""
+
+import fnmatch
+import random
+import threading
+import time
+
+
+# Status code -> when to retry: "always" (the request was rejected before
+# being processed), "idempotent" (only requests that are safe to repeat) or
+# "never"
+DEFAULT_STATUS_RULES = {
+    429: "always",
+    502: "idempotent",
+    503: "idempotent",
+    504: "idempotent",
+}
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# (method, endpoint pattern) pairs that set state rather than create it, so
+# repeating them has no further effect
+IDEMPOTENT_ENDPOINTS = (
+    ("PUT", "/processors/*/run-status"),
+    ("PUT", "/flow/process-groups/*"),
+    ("PUT", "/controller-services/*/run-status"),
+    ("PUT", "/input-ports/*/run-status"),
+    ("PUT", "/output-ports/*/run-status"),
+)
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried and how long to wait.
+
+    Requests are retried when their status code's rule allows it, or on
+    connection errors and timeouts. Rules marked "idempotent" only apply to
+    GET-like methods and to endpoints in IDEMPOTENT_ENDPOINTS, so creating a
+    component is never sent twice. A connection that could not be
+    established is always safe to retry.
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=30.0, jitter=True, statuses=None,
+                 idempotent_endpoints=None, retry_connection_errors=True):
+        """
+        Initialize retry policy.
+
+        Args:
+            max_attempts: Total attempts per request, including the first (default: 3)
+            backoff: Base delay in seconds, doubled on every attempt (default: 0.5)
+            max_backoff: Upper bound for a single delay in seconds (default: 30)
+            jitter: Randomize each delay between 0 and its full value (default: True)
+            statuses: Status code -> "always", "idempotent" or "never", merged over
+                DEFAULT_STATUS_RULES, e.g. {409: "idempotent"} (optional)
+            idempotent_endpoints: Extra (method, endpoint pattern) pairs safe to repeat (optional)
+            retry_connection_errors: Retry connection errors and timeouts (default: True)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = dict(DEFAULT_STATUS_RULES)
+        self.statuses.update(statuses or {})
+        self.idempotent_endpoints = IDEMPOTENT_ENDPOINTS + tuple(idempotent_endpoints or ())
+        self.retry_connection_errors = retry_connection_errors
+        self.sleep = time.sleep
+
+    def is_idempotent(self, method, endpoint):
+        """
+        Check whether a request can safely be sent more than once.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint (query string ignored)
+
+        Returns:
+            bool: True for GET-like methods and idempotent endpoints
+        """
+        method = method.upper()
+        if method in IDEMPOTENT_METHODS:
+            return True
+        path = endpoint.split("?", 1)[0]
+        return any(method == rule_method and fnmatch.fnmatchcase(path, pattern)
+                   for rule_method, pattern in self.idempotent_endpoints)
+
+    def should_retry(self, method, endpoint, attempt, status_code=None, connect_error=False):
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint
+            attempt: Attempts made so far (1 after the first)
+            status_code: Response status, or None if no response was received
+            connect_error: The connection could not be established, so the
+                request never reached NiFi (default: False)
+
+        Returns:
+            bool: True if the request should be sent again
+        """
+        if attempt >= self.max_attempts:
+            return False
+
+        if status_code is None:
+            if not self.retry_connection_errors:
+                return False
+            return connect_error or self.is_idempotent(method, endpoint)
+
+        rule = self.statuses.get(status_code, "never")
+        if rule == "always":
+            return True
+        if rule == "idempotent":
+            return self.is_idempotent(method, endpoint)
+        return False
+
+    def delay(self, attempt, retry_after=None):
+        """
+        Return the wait before the next attempt.
+
+        Args:
+            attempt: Attempts made so far (1 after the first)
+            retry_after: Seconds requested by the server's Retry-After header (optional)
+
+        Returns:
+            float: Seconds to wait
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def wait(self, attempt, retry_after=None):
+        """Sleep for delay(attempt, retry_after) seconds."""
+        self.sleep(self.delay(attempt, retry_after))
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated failures instead of waiting on a dead node.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are rejected without being sent. Once reset_timeout has passed,
+    one trial request is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        """
+        Initialize circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit (default: 5)
+            reset_timeout: Seconds before a trial request is allowed (default: 30)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Check whether a request may be sent now.
+
+        Returns:
+            bool: False while the circuit is open
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_in(self):
+        """float: Seconds until a trial request is allowed (0 when closed)."""
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or after a failed trial."""
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self._trial_in_flight = False
@@ -0,0 +1,94 @@
+"""
+NiFi Revision Cache
+
+Remembers the last revision and run state seen for each component so
+mutations can skip the pre-flight GET.
+"""
+
+import threading
+
+
+class RevisionCache:
+    """
+    Thread-safe cache of the last entity observed for each component ID.
+
+    The cache reflects what this client last saw; changes made by other
+    clients surface as HTTP 409 revision conflicts, which callers resolve by
+    refreshing the entity and retrying.
+    """
+
+    def __init__(self):
+        """Initialize an empty revision cache."""
+        self._entities = {}
+        self._lock = threading.Lock()
+
+    def record(self, entity):
+        """
+        Store a component entity if it carries an ID and revision.
+
+        Args:
+            entity: Component entity from a NiFi response
+
+        Returns:
+            bool: True if the entity was cached
+        """
+        if not isinstance(entity, dict) or "id" not in entity or "revision" not in entity:
+            return False
+
+        with self._lock:
+            self._entities[entity["id"]] = entity
+        return True
+
+    def record_many(self, entities):
+        """
+        Store a list of component entities.
+
+        Args:
+            entities: Iterable of component entities
+        """
+        for entity in entities:
+            self.record(entity)
+
+    def get(self, component_id):
+        """
+        Get the last entity seen for a component.
+
+        Args:
+            component_id: Component ID
+
+        Returns:
+            dict: Cached entity, or None if unknown
+        """
+        with self._lock:
+            return self._entities.get(component_id)
+
+    def version(self, component_id):
+        """
+        Get the cached revision version of a component.
+
+        Args:
+            component_id: Component ID
+
+        Returns:
+            int: Revision version, or None if unknown
+        """
+        entity = self.get(component_id)
+        return entity["revision"]["version"] if entity else None
+
+    def forget(self, component_id):
+        """
+        Drop a component from the cache.
+
+        Args:
+            component_id: Component ID
+        """
+        with self._lock:
+            self._entities.pop(component_id, None)
+
+    def clear(self):
+        """Drop every cached entity."""
+        with self._lock:
+            self._entities.clear()
+
+    def __len__(self):
+        return len(self._entities)
@@ -0,0 +1,382 @@
+"""
+NiFi Component Search
+
+A local inverted index over the components of a process group tree, so
+questions like "which processors set property X" or "all PutFile
+processors" are answered from memory instead of by fetching and scanning
+the whole flow.
+
+Queries are terms separated by spaces (quote a term that contains one),
+all of which must match:
+
+    PutFile                 any field contains the word
+    name:ingest             component name
+    type:PutFile            component type (processors)
+    group:Ingest            any enclosing group, at any depth
+    kind:processor          processor, group, connection, input_port or output_port
+    prop:Directory          the processor sets property "Directory"
+    prop:Directory=/data    property "Directory" contains the word "data"
+    "prop:Log Level=debug"  property names may contain spaces
+    type:Put*               a trailing * matches words by prefix
+
+Words are compared case-insensitively and split on anything that is not a
+letter or digit, so "/data/in" matches "data in".
+"""
+
+import gzip
+import hashlib
+import heapq
+import json
+import os
+import re
+import shlex
+import tempfile
+import time
+
+from .client import NiFiError
+from .spec import group_label
+from .walker import Walker
+
+
+FORMAT = "nifi-client-index"
+FORMAT_VERSION = 1
+
+# Walker kinds kept in the index
+INDEX_KINDS = ("group", "processor", "connection", "input_port", "output_port")
+
+# Query fields that match against a component's words
+TEXT_FIELDS = ("name", "type", "group")
+
+DEFAULT_DIRECTORY = "~/.cache/nifi-client/index"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_NONE = frozenset()
+
+
+class SearchError(NiFiError):
+    """Raised for a malformed query or index file."""
+    pass
+
+
+def words(text):
+    """
+    Split text into the lowercase words the index stores.
+
+    Args:
+        text: Any value; None gives no words
+
+    Returns:
+        set: Words, e.g. {"org", "apache", ..., "putfile"} for a processor type
+    """
+    return set(_WORD.findall(str(text).lower())) if text is not None else set()
+
+
+def to_record(kind, entity, path):
+    """
+    Reduce a component entity to its index record.
+
+    Args:
+        kind: Walker kind (one of INDEX_KINDS)
+        entity: Component entity from the flow API
+        path: Names of the groups enclosing the component, from Walker.walk
+
+    Returns:
+        dict: Record with id, kind, name, type, path, group_id, version, state and properties
+    """
+    component = entity.get("component", {})
+    properties = (component.get("config", {}).get("properties") or {}) if kind == "processor" else {}
+    return {
+        "id": entity["id"],
+        "kind": kind,
+        "name": component.get("name") or "",
+        "type": component.get("type"),
+        "path": list(path),
+        "group_id": component.get("parentGroupId"),
+        "version": entity.get("revision", {}).get("version"),
+        "state": component.get("state"),
+        "properties": {key: value for key, value in properties.items() if value is not None},
+    }
+
+
+def record_terms(record):
+    """
+    List the (field, word) pairs a record is indexed under.
+
+    Args:
+        record: Index record
+
+    Returns:
+        set: (field, word) pairs; field "any" holds every searchable word
+    """
+    terms = {("kind", record["kind"])}
+    for word in words(record["name"]):
+        terms.add(("name", word))
+    for word in words(record["type"]):
+        terms.add(("type", word))
+    for name in record["path"]:
+        for word in words(name):
+            terms.add(("group", word))
+    for key, value in record["properties"].items():
+        terms.add(("propname", key.lower()))
+        for word in words(value):
+            terms.add((f"prop.{key.lower()}", word))
+            terms.add(("propvalue", word))
+
+    terms.update(("any", word) for field, word in list(terms)
+                 if field in TEXT_FIELDS or field == "propvalue")
+    return terms
+
+
+class SearchIndex:
+    """
+    Inverted index over the components of a process group tree.
+
+    The index maps (field, word) to the IDs of the components containing
+    it, so a query costs a few dictionary lookups and set intersections
+    however large the flow is. refresh() walks the tree with the concurrent
+    Walker and only re-indexes components whose revision or group path has
+    changed. save() and load() keep the records in a gzip-compressed file
+    between runs; the word lists are rebuilt from them on load.
+    """
+
+    def __init__(self, client, process_group_id=None, path=None, concurrency=16):
+        """
+        Initialize search index.
+
+        Args:
+            client: NiFiClient instance
+            process_group_id: Group tree to index (default: root)
+            path: Index file (default: one per NiFi URL and group under
+                ~/.cache/nifi-client/index)
+            concurrency: Groups fetched in parallel on refresh (default: 16)
+        """
+        self.client = client
+        self.process_group_id = process_group_id or "root"
+        self.path = os.path.expanduser(path or self.default_path(client.base_url, self.process_group_id))
+        self.concurrency = concurrency
+        self.records = {}
+        self.postings = {}
+        self.refreshed = None
+        self._ranks = None
+
+    @staticmethod
+    def default_path(base_url, process_group_id):
+        """
+        Build the default index file path for a NiFi URL and group.
+
+        Args:
+            base_url: NiFi base URL
+            process_group_id: Indexed group ID, or "root"
+
+        Returns:
+            str: Path under DEFAULT_DIRECTORY
+        """
+        digest = hashlib.sha256(f"{base_url}\n{process_group_id}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(os.path.expanduser(DEFAULT_DIRECTORY), f"{digest}.json.gz")
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def age(self):
+        """float: Seconds since the last refresh, or None if never refreshed."""
+        return time.time() - self.refreshed if self.refreshed is not None else None
+
+    def _add(self, record):
+        self._ranks = None
+        self.records[record["id"]] = record
+        for field, word in record_terms(record):
+            self.postings.setdefault(field, {}).setdefault(word, set()).add(record["id"])
+
+    def _remove(self, record):
+        self._ranks = None
+        del self.records[record["id"]]
+        for field, word in record_terms(record):
+            ids = self.postings[field][word]
+            ids.discard(record["id"])
+            if not ids:
+                del self.postings[field][word]
+
+    def _rank(self):
+        """Rank every record in result order, once per index change, so sorting results is cheap."""
+        if self._ranks is None:
+            ordered = sorted(self.records.values(),
+                             key=lambda record: (record["path"], record["kind"], record["name"].lower()))
+            self._ranks = {record["id"]: rank for rank, record in enumerate(ordered)}
+        return self._ranks
+
+    def refresh(self):
+        """
+        Bring the index up to date with the live flow.
+
+        Every group is read once, in parallel. Components whose revision
+        and group path are unchanged keep their index entries.
+
+        Returns:
+            dict: {"added", "updated", "removed", "unchanged": counts, "seconds": elapsed}
+
+        Raises:
+            APIError: If reading the flow fails
+        """
+        started = time.monotonic()
+        counts = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        seen = set()
+
+        walker = Walker(self.client, self.concurrency)
+        for kind, entity, path in walker.walk(self.process_group_id, kinds=INDEX_KINDS):
+            seen.add(entity["id"])
+            previous = self.records.get(entity["id"])
+            version = entity.get("revision", {}).get("version")
+            if previous is not None and previous["version"] == version and previous["path"] == list(path):
+                counts["unchanged"] += 1
+                continue
+            if previous is not None:
+                self._remove(previous)
+            self._add(to_record(kind, entity, path))
+            counts["updated" if previous is not None else "added"] += 1
+
+        for component_id in set(self.records) - seen:
+            self._remove(self.records[component_id])
+            counts["removed"] += 1
+
+        self.refreshed = time.time()
+        counts["seconds"] = time.monotonic() - started
+        return counts
+
+    def load(self):
+        """
+        Load the index file, if there is one for this NiFi URL and group.
+
+        Returns:
+            bool: True if the index was loaded
+
+        Raises:
+            SearchError: If the file exists but is not a readable index
+        """
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, ValueError) as e:
+            raise SearchError(f"Cannot read index {self.path}: {e}") from e
+
+        if saved.get("format") != FORMAT or saved.get("version") != FORMAT_VERSION:
+            raise SearchError(f"{self.path} is not a version {FORMAT_VERSION} index")
+        if saved.get("base_url") != self.client.base_url or saved.get("process_group") != self.process_group_id:
+            return False
+
+        self.records = {}
+        self.postings = {}
+        self._ranks = None
+        for record in saved["components"]:
+            self._add(record)
+        # Records are saved in result order
+        self._ranks = {record["id"]: rank for rank, record in enumerate(saved["components"])}
+        self.refreshed = saved.get("refreshed")
+        return True
+
+    def save(self):
+        """Write the index file, replacing it atomically."""
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+        saved = {"format": FORMAT, "version": FORMAT_VERSION, "base_url": self.client.base_url,
+                 "process_group": self.process_group_id, "refreshed": self.refreshed,
+                 "components": sorted(self.records.values(), key=lambda record: self._rank()[record["id"]])}
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".index-")
+        try:
+            os.chmod(tmp_path, 0o600)
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+                json.dump(saved, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _match(self, field, value):
+        """Return the IDs whose field contains every word of value."""
+        postings = self.postings.get(field, {})
+        terms = _WORD.findall(value.rstrip("*").lower())
+        if not terms:
+            raise SearchError(f"Nothing to search for in {value!r}")
+
+        # With a trailing *, the last word is matched by prefix
+        last = terms.pop() if value.endswith("*") else None
+        sets = [postings.get(word, _NONE) for word in terms]
+        if last is not None:
+            sets.append(set().union(*(ids for word, ids in postings.items() if word.startswith(last))))
+        if len(sets) == 1:
+            return sets[0]
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _term(self, term):
+        """Return the IDs matching one query term (possibly the index's own set; never modify it)."""
+        field, sep, value = term.partition(":")
+        if not sep:
+            return self._match("any", term)
+        field = field.lower()
+
+        if field in TEXT_FIELDS:
+            return self._match(field, value)
+        if field == "kind":
+            return self.postings.get("kind", {}).get(value.lower(), _NONE)
+        if field == "prop":
+            name, sep, wanted = value.partition("=")
+            if not name:
+                raise SearchError(f"prop: needs a property name in {term!r}")
+            if not wanted:
+                return self.postings.get("propname", {}).get(name.lower(), _NONE)
+            return self._match(f"prop.{name.lower()}", wanted)
+        raise SearchError(f"Unknown search field {field!r} in {term!r} "
+                          f"(expected one of: {', '.join(TEXT_FIELDS + ('kind', 'prop'))})")
+
+    def search(self, query, kinds=None, limit=None):
+        """
+        Find the components matching a query.
+
+        Args:
+            query: Query string, or a list of terms (see the module docstring)
+            kinds: Only return these kinds (default: all of INDEX_KINDS)
+            limit: Return at most this many results (default: all)
+
+        Returns:
+            list: Matching records, sorted by group path, kind and name
+
+        Raises:
+            SearchError: If the query is empty or malformed
+        """
+        try:
+            terms = shlex.split(query) if isinstance(query, str) else list(query)
+        except ValueError as e:
+            raise SearchError(f"Cannot parse query {query!r}: {e}") from e
+        if not terms:
+            raise SearchError("Empty search query")
+
+        matches = sorted((self._term(term) for term in terms), key=len)
+        ids = matches[0].intersection(*matches[1:]) if len(matches) > 1 else matches[0]
+        if kinds:
+            ids = {component_id for component_id in ids if self.records[component_id]["kind"] in kinds}
+
+        ranks = self._rank()
+        ids = heapq.nsmallest(limit, ids, key=ranks.__getitem__) if limit else sorted(ids, key=ranks.__getitem__)
+        return [self.records[component_id] for component_id in ids]
+
+
+def format_record(record):
+    """
+    Format a search result as one line.
+
+    Args:
+        record: Index record
+
+    Returns:
+        str: Kind, name, short type, group path and ID
+    """
+    short_type = record["type"].rsplit(".", 1)[-1] if record["type"] else ""
+    name = record["name"] or "(unnamed)"
+    label = f"{name} ({short_type})" if short_type else name
+    return f"  {record['kind']:<12} {label:<40} {group_label(record['path']):<30} {record['id']}"
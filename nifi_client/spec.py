@@ -0,0 +1,166 @@
+"""
+NiFi Flow Specifications
+
+Loads and validates declarative flow specs (YAML or JSON) describing
+process groups, processors, properties and connections.
+
+Example spec::
+
+    processors:
+      - name: Generate
+        type: org.apache.nifi.processors.standard.GenerateFlowFile
+        properties: {File Size: 1KB}
+      - name: Log
+        type: org.apache.nifi.processors.standard.LogAttribute
+        auto_terminate: [success]
+    connections:
+      - {source: Generate, destination: Log, relationships: [success]}
+    groups:
+      - name: Ingest
+        processors: [...]
+        connections: [...]
+
+Connections reference processors by name within the same group.
+"""
+
+import json
+import os
+
+from .client import NiFiError
+
+
+class SpecError(NiFiError):
+    """Raised when a flow spec is malformed."""
+    pass
+
+
+def load_spec(path):
+    """
+    Load a flow spec from a YAML or JSON file.
+
+    YAML requires the optional PyYAML dependency (``pip install nifi-client[yaml]``).
+
+    Args:
+        path: Spec file path (.yaml, .yml or .json)
+
+    Returns:
+        dict: Flattened, validated spec (see flatten_spec)
+
+    Raises:
+        SpecError: If the file can't be parsed or the spec is invalid
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SpecError("YAML specs require PyYAML: pip install nifi-client[yaml]") from None
+        try:
+            raw = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise SpecError(f"Invalid YAML in {path}: {e}") from e
+    else:
+        try:
+            raw = json.loads(text)
+        except ValueError as e:
+            raise SpecError(f"Invalid JSON in {path}: {e}") from e
+
+    return flatten_spec(raw)
+
+
+def group_label(path):
+    """
+    Format a group path for display.
+
+    Args:
+        path: Tuple of group names from the deployment root
+
+    Returns:
+        str: e.g. "Ingest/Parse", or "(root)" for the deployment root
+    """
+    return "/".join(path) if path else "(root)"
+
+
+def flatten_spec(raw):
+    """
+    Validate a nested spec and flatten it into lists keyed by group path.
+
+    Args:
+        raw: Spec dict as loaded from YAML/JSON
+
+    Returns:
+        dict: {"groups": [...], "processors": [...], "connections": [...]} where
+            each group has path/name/parent/position, each processor has
+            group/name/type/properties/scheduling_period/position/auto_terminate,
+            and each connection has group/source/destination/relationships.
+            Paths are tuples of group names.
+
+    Raises:
+        SpecError: If the spec is invalid
+    """
+    if not isinstance(raw, dict):
+        raise SpecError("Flow spec must be a mapping")
+
+    flat = {"groups": [], "processors": [], "connections": []}
+    _flatten_group(raw, (), flat)
+    return flat
+
+
+def _flatten_group(raw, path, flat):
+    where = group_label(path)
+    names = set()
+
+    for index, proc in enumerate(raw.get("processors") or []):
+        if not isinstance(proc, dict) or not proc.get("name") or not proc.get("type"):
+            raise SpecError(f"Processor #{index + 1} in {where} needs a name and a type")
+        if proc["name"] in names:
+            raise SpecError(f"Duplicate processor name {proc['name']!r} in {where}")
+        names.add(proc["name"])
+
+        flat["processors"].append({
+            "group": path,
+            "name": proc["name"],
+            "type": proc["type"],
+            "properties": dict(proc.get("properties") or {}),
+            "scheduling_period": proc.get("scheduling_period", "60 sec"),
+            "position": proc.get("position") or _grid_position(index),
+            "auto_terminate": list(proc.get("auto_terminate") or []),
+        })
+
+    for index, conn in enumerate(raw.get("connections") or []):
+        if not isinstance(conn, dict):
+            raise SpecError(f"Connection #{index + 1} in {where} must be a mapping")
+        for end in ("source", "destination"):
+            if conn.get(end) not in names:
+                raise SpecError(f"Connection #{index + 1} in {where}: unknown {end} {conn.get(end)!r}")
+
+        flat["connections"].append({
+            "group": path,
+            "source": conn["source"],
+            "destination": conn["destination"],
+            "relationships": list(conn.get("relationships") or ["success"]),
+        })
+
+    child_names = set()
+    for index, group in enumerate(raw.get("groups") or []):
+        if not isinstance(group, dict) or not group.get("name"):
+            raise SpecError(f"Group #{index + 1} in {where} needs a name")
+        if group["name"] in child_names:
+            raise SpecError(f"Duplicate group name {group['name']!r} in {where}")
+        child_names.add(group["name"])
+
+        child = path + (group["name"],)
+        flat["groups"].append({
+            "path": child,
+            "name": group["name"],
+            "parent": path,
+            "position": group.get("position") or _grid_position(index, y_offset=-300),
+        })
+        _flatten_group(group, child, flat)
+
+
+def _grid_position(index, columns=5, y_offset=0):
+    """Lay out components without an explicit position on a simple grid."""
+    return {"x": 300 + (index % columns) * 400, "y": 200 + y_offset + (index // columns) * 250}
@@ -0,0 +1,147 @@
+"""
+Streaming JSON Decoding
+
+Incrementally scans a chunked JSON document and yields the elements of
+selected arrays one at a time, so very large responses are decoded with
+roughly constant memory.
+"""
+
+import codecs
+import itertools
+import json
+import re
+
+
+STRUCTURAL = re.compile(r'["{}\[\],:]')
+STRING_END = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+WHITESPACE = re.compile(r'\s*')
+
+raw_decode = json.JSONDecoder().raw_decode
+
+
+def iter_json_items(chunks, paths):
+    """
+    Yield elements of the arrays found at the given member paths.
+
+    Paths are dotted member names matched against the end of the path to
+    the array, so "flow.processors" matches
+    ``{"processGroupFlow": {"flow": {"processors": [...]}}}``. Only the
+    element being decoded is held in memory; everything else is skipped.
+
+    Args:
+        chunks: Iterable of bytes or str chunks (e.g. response.iter_content())
+        paths: Iterable of dotted paths, e.g. ["flow.processors", "flow.connections"]
+
+    Yields:
+        tuple: (path, element) for each array element, in document order
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    targets = [(path, tuple(path.split("."))) for path in paths]
+    decoder = codecs.getincrementaldecoder("utf-8")()
+
+    buf = ""
+    pos = 0
+    # Each frame is [container, pending key, expecting key]
+    stack = []
+    names = []
+    capture = None        # path of the array whose elements are being decoded
+    retry_at = 0          # buffer length to reach before retrying an incomplete element
+
+    final = False
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is None:
+            # End of input: retry anything that was waiting for more data
+            final = True
+            retry_at = 0
+            chunk = decoder.decode(b"", final=True)
+        elif isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        buf += chunk
+
+        while True:
+            if capture is not None:
+                # Inside a target array: decode whole elements with the C decoder
+                pos = WHITESPACE.match(buf, pos).end()
+                if pos >= len(buf):
+                    break
+                if buf[pos] == ",":
+                    pos += 1
+                    continue
+                if buf[pos] == "]":
+                    pos += 1
+                    capture = None
+                    stack.pop()
+                    names.pop()
+                    continue
+                if len(buf) < retry_at:
+                    break
+
+                try:
+                    item, end = raw_decode(buf, pos)
+                except ValueError:
+                    # Incomplete element: wait until the buffered part doubles
+                    retry_at = 2 * len(buf) - pos
+                    break
+
+                # A bare number may have stopped at a chunk boundary ("-2500" of
+                # "-2500.0"), so an element only counts once a "," or "]" follows
+                after = WHITESPACE.match(buf, end).end()
+                if after >= len(buf) or buf[after] not in ",]":
+                    if final:
+                        raise ValueError(f"Invalid JSON: expected ',' or ']' after array element at {after}")
+                    retry_at = len(buf) + 1
+                    break
+
+                retry_at = 0
+                pos = end
+                yield capture, item
+                continue
+
+            match = STRUCTURAL.search(buf, pos)
+            if not match:
+                pos = len(buf)
+                break
+
+            char = match.group()
+            if char == '"':
+                end = STRING_END.match(buf, match.end())
+                if not end:
+                    pos = match.start()
+                    break
+                pos = end.end()
+                frame = stack[-1] if stack else None
+                if frame and frame[0] == "{" and frame[2]:
+                    frame[1] = json.loads(buf[match.start():pos])
+                    frame[2] = False
+                continue
+
+            pos = match.end()
+            frame = stack[-1] if stack else None
+
+            if char in "{[":
+                names.append(frame[1] if frame and frame[0] == "{" else None)
+                stack.append([char, None, char == "{"])
+                if char == "[":
+                    for path, parts in targets:
+                        if tuple(names[-len(parts):]) == parts:
+                            capture = path
+                            break
+            elif char in "}]":
+                if not stack:
+                    raise ValueError("Unbalanced JSON document")
+                stack.pop()
+                names.pop()
+            elif char == "," and frame and frame[0] == "{":
+                frame[1] = None
+                frame[2] = True
+
+        # Drop everything that has been consumed
+        if pos:
+            buf = buf[pos:]
+            retry_at = max(0, retry_at - pos)
+            pos = 0
+
+    if stack or buf.strip():
+        raise ValueError("Truncated or invalid JSON document")
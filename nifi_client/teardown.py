@@ -0,0 +1,168 @@
+"""
+NiFi Flow Teardown
+
+Deletes everything inside a process group in dependency order, as many
+components at a time as the order allows.
+"""
+
+import time
+
+from .client import APIError, NiFiError
+from .dag import run_dag
+from .flow import Flow
+from .process_group import ProcessGroup, iter_connection_status
+from .walker import Walker
+
+
+# Component kind -> endpoint prefix for deleting it
+DELETE_ENDPOINTS = {
+    "connection": "/connections",
+    "processor": "/processors",
+    "input_port": "/input-ports",
+    "output_port": "/output-ports",
+    "funnel": "/funnels",
+    "group": "/process-groups",
+}
+
+
+class Teardown:
+    """
+    Removes the contents of a process group quickly.
+
+    The group is stopped with one recursive schedule request, non-empty
+    queues are dropped concurrently, and the components are then deleted by
+    a worker pool: each connection as soon as its queue is empty, each
+    processor, port or funnel as soon as its connections are gone, and each
+    child group once everything inside it is.
+
+    Controller services, labels and remote process groups are not removed.
+    A group still holding any of them cannot be deleted: its delete fails
+    and is reported in the result's "failed", after the rest is gone.
+    """
+
+    def __init__(self, client, concurrency=16, timeout=60):
+        """
+        Initialize teardown.
+
+        Args:
+            client: NiFiClient instance
+            concurrency: Requests in flight at once (default: 16)
+            timeout: Seconds to wait for the group to stop and for each queue drop (default: 60)
+        """
+        self.client = client
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.process_group = ProcessGroup(client)
+        self.flow = Flow(client)
+
+    def teardown(self, process_group_id, delete_group=False, on_done=None):
+        """
+        Stop a process group and delete everything in it.
+
+        Args:
+            process_group_id: Process group ID ("root" empties the whole canvas)
+            delete_group: Also delete the group itself (default: False); fails
+                for a group holding controller services, labels or remote
+                process groups, which are not removed
+            on_done: Optional callback (task key, result, error) as each step finishes;
+                keys are ("drop", connection ID) or (kind, component ID)
+
+        Returns:
+            dict: {"deleted": {kind: count}, "dropped": FlowFiles dropped,
+                "failed": {task key: exception}, "seconds": elapsed}
+
+        Raises:
+            NiFiError: If delete_group is set for the root group
+            APIError: If the group cannot be stopped or read
+        """
+        started = time.monotonic()
+        root_id = self.process_group.resolve_id(process_group_id)
+        if delete_group and root_id == self.client.get_root_process_group_id():
+            raise NiFiError("The root process group cannot be deleted")
+
+        self.process_group.stop(root_id, wait=True, timeout=self.timeout)
+
+        snapshot = self.process_group.get_status(root_id, recursive=True)
+        queued = {conn["id"]: conn.get("flowFilesQueued", 0) for conn in iter_connection_status(snapshot)
+                  if conn.get("flowFilesQueued", 0)}
+
+        components = [(kind, entity) for kind, entity, path in Walker(self.client, self.concurrency).walk(root_id)]
+        if delete_group:
+            components.append(("group", self.process_group.get(root_id)))
+
+        tasks = self.build_tasks(components, queued)
+        results, errors = run_dag(tasks, concurrency=self.concurrency, on_done=on_done)
+
+        deleted = {}
+        dropped = 0
+        for key, result in results.items():
+            if key[0] == "drop":
+                dropped += int(result.get("droppedCount") or queued.get(key[1], 0))
+            else:
+                deleted[key[0]] = deleted.get(key[0], 0) + 1
+
+        return {"deleted": deleted, "dropped": dropped, "failed": errors,
+                "seconds": time.monotonic() - started}
+
+    def build_tasks(self, components, queued):
+        """
+        Build the dependency graph for deleting a set of components.
+
+        Args:
+            components: (kind, entity) pairs from Walker.walk
+            queued: Connection ID -> FlowFiles queued, for the queues to drop first
+
+        Returns:
+            dict: Tasks for run_dag
+        """
+        tasks = {}
+        touching = {}
+        contents = {}
+
+        for kind, entity in components:
+            if kind == "connection":
+                for endpoint in (entity.get("sourceId"), entity.get("destinationId")):
+                    touching.setdefault(endpoint, []).append((kind, entity["id"]))
+            parent = entity.get("component", {}).get("parentGroupId")
+            contents.setdefault(parent, []).append((kind, entity["id"]))
+
+        drops = [entity["id"] for kind, entity in components if kind == "connection" and entity["id"] in queued]
+        for connection_id in drops:
+            def drop(results, connection_id=connection_id):
+                return self.flow.drop_queue(connection_id, timeout=self.timeout)
+            tasks[("drop", connection_id)] = ([], drop)
+
+        for kind, entity in components:
+            if kind == "connection":
+                deps = [("drop", entity["id"])] if entity["id"] in queued else []
+            elif kind == "group":
+                deps = contents.get(entity["id"], [])
+            else:
+                deps = touching.get(entity["id"], [])
+
+            def delete(results, kind=kind, entity=entity):
+                return self.delete(kind, entity["id"], entity["revision"]["version"])
+            tasks[(kind, entity["id"])] = (deps, delete)
+
+        return tasks
+
+    def delete(self, kind, component_id, version):
+        """
+        Delete one component, refreshing its revision once on a conflict.
+
+        Args:
+            kind: Component kind (a key of DELETE_ENDPOINTS)
+            component_id: Component ID
+            version: Revision version seen when the flow was read
+
+        Returns:
+            dict: Deletion response
+        """
+        endpoint = f"{DELETE_ENDPOINTS[kind]}/{component_id}"
+        try:
+            return self.client.delete(endpoint, params={"version": version})
+        except APIError as e:
+            if e.status_code != 409:
+                raise
+            version = self.client.get(endpoint, cached=False)["revision"]["version"]
+            return self.client.delete(endpoint, params={"version": version})
@@ -0,0 +1,185 @@
+"""
+NiFi Process Group Walker
+
+Recursively traverses a process group tree, fetching child groups in
+parallel and yielding components while the traversal continues.
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .entities import ENTITY_TYPES, RAW_MODES
+from .process_group import ProcessGroup
+
+
+# Keys of the processGroupFlow "flow" object, keyed by the kind they are yielded as
+FLOW_KINDS = {
+    "group": "processGroups",
+    "processor": "processors",
+    "connection": "connections",
+    "input_port": "inputPorts",
+    "output_port": "outputPorts",
+    "funnel": "funnels",
+}
+
+_FINISHED = object()
+
+
+class Walker:
+    """
+    Walks a process group and all of its descendants.
+
+    Each group is read with one ``GET /flow/process-groups/{id}``; child
+    groups are fetched concurrently by a bounded pool. Components are handed
+    to the caller through a bounded buffer, so a slow consumer throttles the
+    traversal instead of letting it pile up in memory.
+    """
+
+    def __init__(self, client, concurrency=8, stream=False, buffer_size=1000):
+        """
+        Initialize walker.
+
+        Args:
+            client: NiFiClient instance
+            concurrency: Groups fetched in parallel (default: 8)
+            stream: Decode each group response incrementally (default: False)
+            buffer_size: Components buffered ahead of the caller (default: 1000)
+        """
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.stream = stream
+        self.buffer_size = buffer_size
+        self.process_group = ProcessGroup(client)
+
+    def _read_group(self, process_group_id):
+        """Yield (kind, entity) for every component directly inside a group."""
+        if self.stream:
+            kinds = {f"flow.{key}": kind for kind, key in FLOW_KINDS.items()}
+            for path, entity in self.client.get_stream(f"/flow/process-groups/{process_group_id}", list(kinds)):
+                if kinds[path] == "processor":
+                    self.client.revisions.record(entity)
+                yield kinds[path], entity
+            return
+
+        flow = self.process_group.get_flow(process_group_id)
+        self.client.revisions.record_many(flow.get("processors", []))
+        for kind, key in FLOW_KINDS.items():
+            for entity in flow.get(key, []):
+                yield kind, entity
+
+    def walk(self, process_group_id=None, kinds=None):
+        """
+        Yield every component in a process group tree as groups are fetched.
+
+        Child groups are queued for fetching as soon as they are seen, so the
+        traversal keeps running while the caller works. A group is always
+        yielded before anything inside it.
+
+        Args:
+            process_group_id: Group to start from (default: root)
+            kinds: Component kinds to yield (default: all of FLOW_KINDS)
+
+        Yields:
+            tuple: (kind, entity, path) where path is the tuple of group names
+                from the starting group to the group containing the entity
+
+        Raises:
+            APIError: If fetching any group fails
+        """
+        kinds = set(kinds or FLOW_KINDS)
+        root_id = self.process_group.resolve_id(process_group_id)
+        items = queue.Queue(maxsize=self.buffer_size)
+        stop = threading.Event()
+        lock = threading.Lock()
+        pending = [1]
+        pool = ThreadPoolExecutor(max_workers=self.concurrency)
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    items.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def fetch(group_id, path):
+            try:
+                for kind, entity in self._read_group(group_id):
+                    if stop.is_set():
+                        return
+                    # A group is handed out before its fetch starts, so it always precedes its contents
+                    if kind in kinds and not put((kind, entity, path)):
+                        return
+                    if kind == "group":
+                        with lock:
+                            pending[0] += 1
+                        pool.submit(fetch, entity["id"], path + (entity["component"]["name"],))
+            except Exception as e:
+                put(e)
+            finally:
+                with lock:
+                    pending[0] -= 1
+                    finished = pending[0] == 0
+                if finished:
+                    put(_FINISHED)
+
+        pool.submit(fetch, root_id, ())
+
+        try:
+            while True:
+                item = items.get()
+                if item is _FINISHED:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=False)
+
+    def processors(self, process_group_id=None):
+        """
+        Yield every processor in a process group tree.
+
+        Args:
+            process_group_id: Group to start from (default: root)
+
+        Yields:
+            dict: Processor entity
+        """
+        for kind, entity, path in self.walk(process_group_id, kinds=("processor",)):
+            yield entity
+
+    def entities(self, process_group_id=None, kinds=None, raw="lazy"):
+        """
+        Yield compact entity objects for every component in a process group tree.
+
+        Args:
+            process_group_id: Group to start from (default: root)
+            kinds: Kinds to yield, any of "processor", "connection" and "group"
+                (default: all three)
+            raw: How each entity keeps its full payload: "keep", "lazy" or "drop"
+                (default: "lazy")
+
+        Returns:
+            generator: (entity, path) tuples with a ProcessorEntity, ConnectionEntity
+                or ProcessGroupEntity and the group path containing it
+
+        Raises:
+            ValueError: If a kind has no entity class or raw is unknown (raised
+                by this call, before any group is fetched)
+        """
+        kinds = set(kinds or ENTITY_TYPES)
+        unknown = sorted(kinds - set(ENTITY_TYPES))
+        if unknown:
+            raise ValueError(f"No entity type for {', '.join(map(repr, unknown))} "
+                             f"(expected any of: {', '.join(ENTITY_TYPES)})")
+        if raw not in RAW_MODES:
+            raise ValueError(f"raw must be one of {', '.join(RAW_MODES)}, got {raw!r}")
+        return self._entities(process_group_id, kinds, raw)
+
+    def _entities(self, process_group_id, kinds, raw):
+        for kind, data, path in self.walk(process_group_id, kinds=kinds):
+            yield ENTITY_TYPES[kind](data, raw), path
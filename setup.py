@@ -26,6 +26,10 @@ setup(
         "requests>=2.31.0",
         "urllib3>=2.0.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8.0"],
+        "yaml": ["PyYAML>=5.1"],
+    },
     entry_points={
         "console_scripts": [
             "nifi-cli=nifi_client.cli:main",
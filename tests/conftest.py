@@ -0,0 +1,30 @@
+"""Shared fixtures: an in-process mock NiFi and a client connected to it."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from mock_nifi import MockNiFi  # noqa: E402
+
+from nifi_client import NiFiClient  # noqa: E402
+
+
+def pytest_configure(config):
+    # The mock serves plain HTTP
+    config.addinivalue_line("filterwarnings", "ignore:HTTP URLs are not secure")
+    config.addinivalue_line("filterwarnings", "ignore:SSL certificate verification is disabled")
+
+
+@pytest.fixture
+def mock():
+    with MockNiFi() as server:
+        yield server
+
+
+@pytest.fixture
+def client(mock):
+    with NiFiClient(base_url=mock.url) as nifi:
+        yield nifi
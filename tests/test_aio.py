@@ -0,0 +1,66 @@
+"""Tests for the asyncio client, run with asyncio.run against the mock server."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from nifi_client import APIError, AsyncFlow, AsyncNiFiClient, AsyncProcessor  # noqa: E402
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def run(mock, scenario):
+    async def main():
+        async with AsyncNiFiClient(base_url=mock.url) as client:
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def test_create_start_list(mock):
+    async def scenario(client):
+        processor = AsyncProcessor(client)
+        created = await asyncio.gather(*(processor.create(LOG, f"Log {index}") for index in range(5)))
+        started = await asyncio.gather(*(processor.start(proc["id"]) for proc in created))
+        again = await processor.start(created[0]["id"])
+        return created, started, again, await processor.list_all()
+
+    created, started, again, listed = run(mock, scenario)
+    assert [result["status"] for result in started] == ["started"] * 5
+    assert again["status"] == "already_running"
+    assert {proc["id"] for proc in listed} == {proc["id"] for proc in created}
+    assert all(proc["state"] == "RUNNING" for proc in mock.flow.processors.values())
+    assert mock.calls["POST /access/token"] == 1
+
+
+def test_sample_flow(mock):
+    async def scenario(client):
+        flow = AsyncFlow(client)
+        ids = await flow.create_sample_flow()
+        return ids, await flow.start_all_processors()
+
+    ids, summary = run(mock, scenario)
+    assert sorted(summary["started"]) == sorted([ids["generate_id"], ids["log_id"]])
+    assert ids["connection_id"] in mock.flow.connections
+
+
+def test_rejected_token_is_renewed_once_for_concurrent_requests(mock):
+    async def scenario(client):
+        await client.get_nifi_version()
+        mock.revoke_tokens()
+        return await asyncio.gather(*(client.get_nifi_version() for _ in range(10)))
+
+    assert run(mock, scenario) == ["2.6.0"] * 10
+    assert mock.calls["POST /access/token"] == 2
+
+
+def test_api_error_carries_status_code(mock):
+    async def scenario(client):
+        processor = AsyncProcessor(client)
+        proc_id = (await processor.create(LOG, "Log"))["id"]
+        await client.delete(f"/processors/{proc_id}", params={"version": 99})
+
+    with pytest.raises(APIError) as excinfo:
+        run(mock, scenario)
+    assert excinfo.value.status_code == 409
@@ -0,0 +1,51 @@
+"""Tests for token handling."""
+
+import threading
+import time
+
+from mock_nifi import make_token
+
+from nifi_client.auth import TokenManager
+
+
+def test_refresh_reuses_token_obtained_while_waiting():
+    logins = []
+    entered = threading.Event()
+    release = threading.Event()
+
+    def login():
+        logins.append(None)
+        entered.set()
+        release.wait(2)
+        return make_token()
+
+    tokens = TokenManager(login)
+    first = threading.Thread(target=tokens.get_token)
+    first.start()
+    assert entered.wait(2)
+
+    refreshed = []
+    second = threading.Thread(target=lambda: refreshed.append(tokens.refresh()))
+    second.start()
+    time.sleep(0.1)  # let the second thread block on the lock
+    release.set()
+    first.join(2)
+    second.join(2)
+
+    assert len(logins) == 1
+    assert refreshed == [tokens.token]
+
+
+def test_refresh_logs_in_again_when_token_unchanged():
+    logins = []
+    tokens = TokenManager(lambda: logins.append(None) or make_token())
+    tokens.get_token()
+    tokens.refresh()
+    assert len(logins) == 2 and tokens.is_valid()
+
+
+def test_client_logs_in_again_after_401(client, mock):
+    client.get_nifi_version()
+    mock.revoke_tokens()
+    assert client.get_nifi_version() == "2.6.0"
+    assert mock.calls["POST /access/token"] == 2
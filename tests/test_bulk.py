@@ -0,0 +1,38 @@
+"""Tests for bulk start/stop."""
+
+import threading
+import time
+
+from nifi_client import Processor
+from nifi_client.bulk import BulkRunStatus
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def test_results_stream_while_input_is_still_being_read(client, mock):
+    processor = Processor(client)
+    ids = [processor.create(LOG, f"Log {index}")["id"] for index in range(3)]
+    reported = threading.Event()
+    seen_before_end = []
+
+    def slow_listing():
+        yield ids[0]
+        time.sleep(0.3)  # the first start finishes meanwhile
+        yield ids[1]
+        seen_before_end.append(reported.wait(2))
+        yield ids[2]
+
+    results = BulkRunStatus(client, concurrency=4).run(slow_listing(), "RUNNING",
+                                                       on_result=lambda result: reported.set())
+
+    assert seen_before_end == [True]
+    assert [result["id"] for result in results] == ids
+    assert all(result["status"] == "started" for result in results)
+    assert all(mock.flow.processors[proc_id]["state"] == "RUNNING" for proc_id in ids)
+
+
+def test_failures_are_reported_per_processor(client):
+    proc_id = Processor(client).create(LOG, "Log")["id"]
+    results = BulkRunStatus(client).run([proc_id, "missing"], "RUNNING")
+    assert [result["status"] for result in results] == ["started", "failed"]
+    assert results[1]["error"] is not None
@@ -0,0 +1,81 @@
+"""Tests for the opt-in GET response cache."""
+
+import time
+
+import pytest
+
+from nifi_client import NiFiClient, Processor, ProcessGroup, ResponseCache
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.fixture
+def cached(mock):
+    with NiFiClient(base_url=mock.url, cache=True) as nifi:
+        yield nifi
+
+
+def gets(mock, path):
+    return mock.calls.get(f"GET {path}", 0)
+
+
+def test_repeated_get_is_served_from_cache(cached, mock):
+    proc_id = Processor(cached).create(LOG, "Log")["id"]
+    cached.cache.clear()
+    cached.cache.hits = cached.cache.misses = 0
+    for _ in range(3):
+        cached.get(f"/processors/{proc_id}")
+
+    assert gets(mock, f"/processors/{proc_id}") == 1
+    stats = cached.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+@pytest.mark.parametrize("mutate", ["update", "delete", "create"])
+def test_mutation_invalidates_processor_and_listing(cached, mock, mutate):
+    processor = Processor(cached)
+    proc_id = processor.create(LOG, "Log")["id"]
+    cached.get(f"/processors/{proc_id}")
+    cached.get("/process-groups/root/processors")
+
+    if mutate == "update":
+        processor.update(proc_id, name="Renamed")
+    elif mutate == "delete":
+        processor.delete(proc_id)
+    else:
+        processor.create(LOG, "Another")
+
+    listing = cached.get("/process-groups/root/processors")
+    assert gets(mock, "/process-groups/root/processors") == 2
+    assert len(listing["processors"]) == (0 if mutate == "delete" else 2 if mutate == "create" else 1)
+    assert cached.cache.stats()["invalidations"] >= 1
+
+
+def test_status_endpoints_bypass_cache(cached, mock):
+    group = ProcessGroup(cached)
+    group.get_status("root")
+    group.get_status("root")
+    assert sum(count for key, count in mock.calls.items() if key.endswith("/status")) == 2
+    assert not any("/status" in endpoint for endpoint in cached.cache._entries)
+
+
+def test_entries_expire_after_ttl(mock):
+    with NiFiClient(base_url=mock.url, cache=ResponseCache(ttls={"/flow/about": 0.05})) as nifi:
+        nifi.get("/flow/about")
+        nifi.get("/flow/about")
+        time.sleep(0.1)
+        nifi.get("/flow/about")
+    assert gets(mock, "/flow/about") == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.store("/a", {"id": "a"})
+    cache.store("/b", {"id": "b"})
+    assert cache.get("/a") == {"id": "a"}
+    cache.store("/c", {"id": "c"})
+
+    assert cache.get("/b") is None
+    assert cache.get("/a") is not None and cache.get("/c") is not None
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,60 @@
+"""Tests for CLI commands run against the mock server."""
+
+import io
+
+import pytest
+
+from nifi_client import Processor
+from nifi_client.cli import main
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.fixture
+def env(mock, monkeypatch):
+    monkeypatch.setenv("NIFI_URL", mock.url)
+    for name in ("NIFI_READ_RATE", "NIFI_WRITE_RATE", "NIFI_TOKEN_CACHE"):
+        monkeypatch.delenv(name, raising=False)
+    return mock
+
+
+@pytest.mark.parametrize("command", ["start-flow", "stop-flow"])
+@pytest.mark.parametrize("recursive", [[], ["--recursive"]])
+def test_empty_flow_reports_no_processors(env, capsys, command, recursive):
+    assert main([command] + recursive) == 1
+
+    out = capsys.readouterr().out
+    assert out.count("No processors found") == 1
+    assert "Summary" not in out
+    assert ("create-flow" in out) == (command == "start-flow")
+
+
+def test_start_flow_recursive_starts_processors(env, client, capsys):
+    proc_id = Processor(client).create(LOG, "Log")["id"]
+    assert main(["start-flow", "--recursive"]) == 0
+    assert env.flow.processors[proc_id]["state"] == "RUNNING"
+    assert "Flow is now running!" in capsys.readouterr().out
+
+
+def run_batch(monkeypatch, commands, *options):
+    monkeypatch.setattr("sys.stdin", io.StringIO("\n".join(commands) + "\n"))
+    return main(["batch", "-", *options])
+
+
+def test_batch_shares_one_login(env, client, capsys, monkeypatch):
+    Processor(client).create(LOG, "Log")
+    env.calls.clear()
+
+    assert run_batch(monkeypatch, ["version", "# comment", "start-flow", "list", "stop-flow"]) == 0
+    out = capsys.readouterr().out
+    assert "Session: 4 commands, 0 failed" in out
+    assert env.calls["POST /access/token"] == 1
+
+
+@pytest.mark.parametrize("options, ran", [((), 2), (("--keep-going",), 3)])
+def test_batch_stops_at_first_failure_unless_keep_going(env, capsys, monkeypatch, options, ran):
+    assert run_batch(monkeypatch, ["version", "stop-flow", "version"], *options) == 1
+    out = capsys.readouterr().out
+    assert f"Session: {ran} commands, 1 failed" in out
+    assert out.count("> version") == ran - 1
+    assert env.calls["POST /access/token"] == 1
@@ -0,0 +1,91 @@
+"""Tests for planning and applying flow specs."""
+
+from nifi_client import Deployer, Planner, ProcessGroup, Processor
+from nifi_client.spec import flatten_spec
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def test_prune_deletes_every_duplicate_named_leftover(client, mock):
+    processor = Processor(client)
+    for index in range(3):
+        processor.create(LOG, "X", position={"x": index * 100, "y": 0})
+
+    spec = flatten_spec({"processors": [{"name": "X", "type": LOG}]})
+    plan = Planner(client).plan(spec, prune=True)
+    deletes = [op for op in plan["operations"] if op["action"] == "delete"]
+    assert len(deletes) == 2
+
+    outcome = Deployer(client).apply_plan(plan)
+    assert not outcome["failed"]
+    assert len(outcome["applied"]) == 2
+    assert [proc["name"] for proc in mock.flow.processors.values()] == ["X"]
+
+
+def test_apply_creates_then_is_up_to_date(client, mock):
+    spec = flatten_spec({
+        "processors": [{"name": "A", "type": LOG}, {"name": "B", "type": LOG}],
+        "connections": [{"source": "A", "destination": "B", "relationships": ["success"]}],
+        "groups": [{"name": "Inner", "processors": [{"name": "C", "type": LOG}]}],
+    })
+    outcome = Deployer(client).apply_plan(Planner(client).plan(spec))
+    assert not outcome["failed"]
+    assert len(mock.flow.processors) == 3
+    assert len(mock.flow.connections) == 1
+
+    assert Planner(client).plan(spec)["operations"] == []
+
+
+def test_update_restarts_running_processor(client, mock):
+    spec = flatten_spec({"processors": [{"name": "A", "type": LOG, "properties": {"Log Level": "info"}}]})
+    Deployer(client).apply_plan(Planner(client).plan(spec))
+    proc_id = next(iter(mock.flow.processors))
+    Processor(client).start(proc_id)
+
+    changed = flatten_spec({"processors": [{"name": "A", "type": LOG, "properties": {"Log Level": "debug"}}]})
+    outcome = Deployer(client).apply_plan(Planner(client).plan(changed))
+    assert not outcome["failed"] and len(outcome["applied"]) == 1
+
+    proc = mock.flow.processors[proc_id]
+    assert proc["config"]["properties"]["Log Level"] == "debug"
+    assert proc["state"] == "RUNNING"
+
+
+def test_update_leaves_stopped_processor_stopped(client, mock):
+    spec = flatten_spec({"processors": [{"name": "A", "type": LOG}]})
+    Deployer(client).apply_plan(Planner(client).plan(spec))
+
+    changed = flatten_spec({"processors": [{"name": "A", "type": LOG, "scheduling_period": "5 sec"}]})
+    assert not Deployer(client).apply_plan(Planner(client).plan(changed))["failed"]
+    assert [proc["state"] for proc in mock.flow.processors.values()] == ["STOPPED"]
+
+
+def test_group_deletes_run_after_other_changes(client, mock):
+    spec = flatten_spec({"processors": [{"name": "A", "type": LOG}, {"name": "B", "type": LOG}],
+                         "connections": [{"source": "A", "destination": "B", "relationships": ["success"]}]})
+    Deployer(client).apply_plan(Planner(client).plan(spec))
+    processor = Processor(client)
+    for name in ("Extra 1", "Extra 2"):
+        processor.create(LOG, name)
+    ProcessGroup(client).create("Unused")
+
+    changed = flatten_spec({"processors": [{"name": "A", "type": LOG, "scheduling_period": "5 sec"},
+                                           {"name": "B", "type": LOG}],
+                            "connections": [{"source": "A", "destination": "B",
+                                             "relationships": ["success", "failure"]}]})
+    order = []
+    deployer = Deployer(client, concurrency=8)
+    schedule = deployer.process_group.schedule
+    finished_before_schedule = []
+
+    def recording_schedule(*args):
+        finished_before_schedule.append(len(order))
+        return schedule(*args)
+
+    deployer.process_group.schedule = recording_schedule
+    plan = Planner(client).plan(changed, prune=True)
+    outcome = deployer.apply_plan(plan, on_done=lambda operation, result, error: order.append(operation))
+
+    assert not outcome["failed"]
+    assert len(plan["operations"]) == 5 and finished_before_schedule == [4]
+    assert len(mock.flow.groups) == 1
@@ -0,0 +1,47 @@
+"""Tests for fleet files and concurrent fleet runs."""
+
+import json
+import sys
+import threading
+import time
+
+import pytest
+
+from nifi_client import Fleet, FleetError, Target, load_fleet
+
+
+def test_abandoned_thread_output_stays_captured(capsys):
+    original = sys.stdout
+    finished = threading.Event()
+
+    def slow(target):
+        print("early")
+        time.sleep(0.3)
+        print("late")
+        finished.set()
+
+    fleet = Fleet([Target("slow", "http://slow", timeout=0.1), Target("fast", "http://fast")])
+    results = fleet.run(lambda target: slow(target) if target.name == "slow" else print("fast"), capture=True)
+
+    assert results[0].timed_out and results[1].output == "fast\n"
+    assert finished.wait(2)
+    time.sleep(0.05)
+    assert sys.stdout is original
+    assert "late" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("timeout", ["30", 0, -5, True, None])
+def test_load_fleet_rejects_bad_timeout(tmp_path, timeout):
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps({"targets": [{"name": "east", "url": "http://east", "timeout": timeout}]}))
+    with pytest.raises(FleetError, match="timeout"):
+        load_fleet(str(path))
+
+
+def test_load_fleet_applies_defaults(tmp_path):
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps({"defaults": {"timeout": 2.5},
+                                "targets": [{"name": "east", "url": "http://east"},
+                                            {"name": "west", "url": "http://west", "timeout": 9}]}))
+    fleet = load_fleet(str(path))
+    assert [target.timeout for target in fleet.targets] == [2.5, 9]
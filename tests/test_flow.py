@@ -0,0 +1,33 @@
+"""Tests for flow definition checks and uploads."""
+
+import pytest
+
+from nifi_client import DefinitionError, Flow
+from nifi_client.definition import empty_group
+
+STANDARD_BUNDLE = {"group": "org.apache.nifi", "artifact": "nifi-standard-nar", "version": "2.6.0"}
+
+
+def definition(*processors):
+    root = empty_group("Uploaded", "group-1")
+    for identifier, name, proc_type in processors:
+        root["processors"].append({"identifier": identifier, "name": name, "type": proc_type,
+                                   "position": {"x": 0.0, "y": 0.0}, "bundle": dict(STANDARD_BUNDLE)})
+    return {"flowContents": root}
+
+
+def test_no_validate_still_rejects_structural_problems(client, mock):
+    log = "org.apache.nifi.processors.standard.LogAttribute"
+    broken = definition(("p1", "A", log), ("p1", "B", log))
+
+    with pytest.raises(DefinitionError, match="duplicate identifier"):
+        Flow(client).upload_definition(broken, validate=False)
+    assert len(mock.flow.groups) == 1
+
+
+def test_no_validate_skips_installed_type_check(client):
+    custom = definition(("p1", "A", "com.example.Custom"))
+    flow = Flow(client)
+
+    assert any("not installed" in problem for problem in flow.check_definition(custom))
+    assert flow.check_definition(custom, installed=False) == []
@@ -0,0 +1,27 @@
+"""Tests for request hooks and latency histograms."""
+
+import pytest
+
+from nifi_client import AuthenticationError, LatencyHistogram
+
+
+def test_histogram_records_requests(client):
+    histogram = LatencyHistogram().attach(client)
+    client.get("/flow/about")
+    client.get("/flow/about")
+    assert histogram.endpoints["GET /flow/about"]["count"] == 2
+
+
+def test_stream_login_failure_emits_request_end(client, monkeypatch):
+    ended = []
+    client.hooks.add("request_end", ended.append)
+
+    def fail():
+        raise AuthenticationError("login failed")
+
+    monkeypatch.setattr(client.tokens, "get_token", fail)
+    with pytest.raises(AuthenticationError):
+        list(client.get_stream("/process-groups/root/processors", ["processors"]))
+
+    assert len(ended) == 1
+    assert isinstance(ended[0].error, AuthenticationError)
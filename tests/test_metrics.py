@@ -0,0 +1,28 @@
+"""Tests for the metrics poller."""
+
+import logging
+
+from nifi_client import APIError
+from nifi_client.metrics import MetricsPoller
+
+
+def test_failed_poll_is_logged_and_counted(client, monkeypatch, caplog):
+    poller = MetricsPoller(client)
+    assert poller.poll()
+    succeeded = poller.history_of("nifi_poll_timestamp_seconds")[-1]
+
+    def fail():
+        raise APIError("NiFi is down")
+
+    monkeypatch.setattr(poller, "collect", fail)
+    with caplog.at_level(logging.WARNING, logger="nifi_client.metrics"):
+        assert not poller.poll()
+        assert not poller.poll()
+
+    assert "NiFi is down" in caplog.text
+    assert isinstance(poller.last_error, APIError)
+    text = poller.exposition().decode("utf-8")
+    assert "nifi_up 0.0" in text
+    assert "nifi_poll_errors_total 2.0" in text
+    assert f"nifi_poll_timestamp_seconds {succeeded!r}" in text
+    assert "nifi_jvm_threads" not in text
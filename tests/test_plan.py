@@ -0,0 +1,43 @@
+"""Tests for diffing flow specs against the live flow."""
+
+from nifi_client import Deployer, Planner, ProcessGroup, Processor
+from nifi_client.plan import format_operation
+from nifi_client.spec import flatten_spec
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def spec(level="info", relationships=("success",)):
+    return flatten_spec({
+        "processors": [{"name": "A", "type": LOG, "properties": {"Log Level": level}},
+                       {"name": "B", "type": LOG}],
+        "connections": [{"source": "A", "destination": "B", "relationships": list(relationships)}],
+    })
+
+
+def test_plan_against_empty_flow_creates_everything(client):
+    operations = Planner(client).plan(spec())["operations"]
+    assert [(op["action"], op["kind"]) for op in operations] == [
+        ("create", "processor"), ("create", "processor"), ("create", "connection")]
+    assert format_operation(operations[2]) == "+ connection (root)/A -> B"
+
+
+def test_plan_reports_only_changed_fields(client):
+    Deployer(client).apply_plan(Planner(client).plan(spec()))
+
+    operations = Planner(client).plan(spec(level="debug", relationships=("success", "failure")))["operations"]
+    assert [(op["action"], op["kind"], op["name"]) for op in operations] == [
+        ("update", "processor", "A"), ("update", "connection", ("A", "B"))]
+    assert operations[0]["changes"] == {"properties.Log Level": ("info", "debug")}
+    assert operations[1]["changes"] == {"relationships": (["success"], ["failure", "success"])}
+
+
+def test_prune_only_deletes_when_asked(client):
+    Deployer(client).apply_plan(Planner(client).plan(spec()))
+    Processor(client).create(LOG, "Extra")
+    ProcessGroup(client).create("Unused")
+
+    assert Planner(client).plan(spec())["operations"] == []
+    pruned = Planner(client).plan(spec(), prune=True)["operations"]
+    assert sorted((op["action"], op["kind"], op["name"]) for op in pruned) == [
+        ("delete", "group", "Unused"), ("delete", "processor", "Extra")]
@@ -0,0 +1,24 @@
+"""Tests for process group scheduling and state waits."""
+
+import pytest
+
+from nifi_client import Processor, ProcessGroup
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.mark.parametrize("blocked", ["INVALID", "DISABLED"])
+def test_stop_and_start_wait_past_unrunnable_processor(client, mock, blocked):
+    processor = Processor(client)
+    ok_id = processor.create(LOG, "Ok")["id"]
+    blocked_id = processor.create(LOG, "Blocked")["id"]
+    mock.flow.processors[blocked_id]["state"] = blocked
+    group = ProcessGroup(client)
+
+    group.start(timeout=2)
+    assert mock.flow.processors[ok_id]["state"] == "RUNNING"
+    group.stop(timeout=2)
+    assert mock.flow.processors[ok_id]["state"] == "STOPPED"
+
+    result = group.wait_for_state([ok_id, blocked_id], "STOPPED", timeout=2)
+    assert result and result.polls == 1 and not result.pending
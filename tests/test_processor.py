@@ -0,0 +1,51 @@
+"""Tests for processor run-state changes."""
+
+import pytest
+
+from nifi_client import APIError, Flow, NiFiClient, Processor
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def test_start_acts_when_state_changed_elsewhere(client, mock):
+    processor = Processor(client)
+    proc_id = processor.create(LOG, "Log")["id"]
+    assert processor.start(proc_id)["status"] == "started"
+
+    # Another client stops it; this client's cache still says RUNNING
+    with NiFiClient(base_url=mock.url) as other:
+        assert Processor(other).stop(proc_id)["status"] == "stopped"
+
+    assert processor.start(proc_id)["status"] == "started"
+    assert mock.flow.processors[proc_id]["state"] == "RUNNING"
+    assert processor.start(proc_id)["status"] == "already_running"
+
+
+def test_stop_reports_already_stopped(client):
+    processor = Processor(client)
+    proc_id = processor.create(LOG, "Log")["id"]
+    assert processor.stop(proc_id)["status"] == "already_stopped"
+
+
+def test_state_conflict_is_not_retried(client, mock):
+    processor = Processor(client)
+    source = processor.create(LOG, "Source")["id"]
+    target = processor.create(LOG, "Target")["id"]
+    Flow(client).create_connection(source, target, ["success"])
+    mock.calls.clear()
+
+    with pytest.raises(APIError) as excinfo:
+        processor.delete(source)
+    assert excinfo.value.status_code == 409
+    assert sum(count for key, count in mock.calls.items() if key.startswith("DELETE ")) == 1
+    assert source in mock.flow.processors
+
+
+def test_revision_conflict_is_retried(client, mock):
+    processor = Processor(client)
+    proc_id = processor.create(LOG, "Log")["id"]
+    with NiFiClient(base_url=mock.url) as other:
+        Processor(other).update(proc_id, name="Renamed")
+
+    processor.update(proc_id, scheduling_period="5 sec")
+    assert mock.flow.processors[proc_id]["config"]["schedulingPeriod"] == "5 sec"
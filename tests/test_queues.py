@@ -0,0 +1,49 @@
+"""Tests for queue fill ratios, growth rates and time to backpressure."""
+
+import pytest
+
+from nifi_client import Flow, Processor
+from nifi_client.queues import QueueMonitor
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.fixture
+def connection(client):
+    processor = Processor(client)
+    a = processor.create(LOG, "A")["id"]
+    b = processor.create(LOG, "B")["id"]
+    return Flow(client).create_connection(a, b, ["success"])["id"]
+
+
+def test_poll_computes_rate_and_time_to_backpressure(client, mock, connection):
+    monitor = QueueMonitor(client)
+    mock.flow.connections[connection]["queued"] = 1000
+    [first] = monitor.poll()
+    assert first["queued"] == 1000
+    assert first["fill"] == pytest.approx(0.1)
+    assert first["rate"] == 0.0
+    assert first["seconds_to_full"] is None
+
+    # Pretend the first poll happened ten seconds ago
+    monitor.previous_time -= 10
+    mock.flow.connections[connection]["queued"] = 3000
+    [second] = monitor.poll()
+
+    assert second["fill"] == pytest.approx(0.3)
+    assert second["rate"] == pytest.approx(200, rel=0.01)
+    assert second["bytes_rate"] == pytest.approx(200 * 1024, rel=0.01)
+    # 7000 FlowFiles left before the 10000 object threshold, at 200/s
+    assert second["seconds_to_full"] == pytest.approx(35, rel=0.01)
+
+
+def test_draining_queue_has_no_eta(client, mock, connection):
+    monitor = QueueMonitor(client)
+    mock.flow.connections[connection]["queued"] = 3000
+    monitor.poll()
+    monitor.previous_time -= 10
+    mock.flow.connections[connection]["queued"] = 1000
+    [queue] = monitor.poll()
+
+    assert queue["rate"] == pytest.approx(-200, rel=0.01)
+    assert queue["seconds_to_full"] is None
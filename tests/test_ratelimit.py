@@ -0,0 +1,32 @@
+"""Tests for request rate limiting."""
+
+import pytest
+
+from nifi_client import RateLimiter
+from nifi_client.cli import main
+
+
+@pytest.mark.parametrize("kwargs", [{"read_rate": 0}, {"write_rate": -1}, {"burst": 0},
+                                    {"read_rate": float("nan")}, {"min_factor": 0}])
+def test_rejects_non_positive_settings(kwargs):
+    with pytest.raises(ValueError):
+        RateLimiter(**kwargs)
+
+
+def test_adaptive_backoff_scales_burst():
+    limiter = RateLimiter(read_rate=50, write_rate=10, adaptive=True, window=100)
+    for _ in range(10):
+        limiter.record(5.0, 200)
+
+    stats = limiter.stats()
+    assert stats["factor"] == 0.5
+    assert (stats["read_rate"], stats["read_burst"]) == (25, 25)
+    assert (stats["write_rate"], stats["write_burst"]) == (5, 5)
+    assert limiter.read.tokens <= 25
+
+
+@pytest.mark.parametrize("value", ["0", "-2", "fast"])
+def test_cli_reports_invalid_rate(monkeypatch, capsys, value):
+    monkeypatch.setenv("NIFI_READ_RATE", value)
+    assert main(["version"]) == 1
+    assert "✗ NIFI_READ_RATE" in capsys.readouterr().out
@@ -0,0 +1,46 @@
+"""Tests for the retry policy and circuit breaker."""
+
+import pytest
+
+from nifi_client import AuthenticationError, CircuitBreaker, CircuitOpenError, NiFiClient
+
+
+def test_breaker_opens_and_recovers_after_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert breaker.allow()          # the trial
+    assert not breaker.allow()      # only one trial at a time
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_failed_login_during_trial_releases_breaker(mock, monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    with NiFiClient(base_url=mock.url, circuit_breaker=breaker) as client:
+        breaker.record_failure()
+
+        def fail():
+            raise AuthenticationError("login failed")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(client.tokens, "get_token", fail)
+            with pytest.raises(AuthenticationError):
+                client.get("/flow/about")
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert client.get("/flow/about")["about"]["version"]
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_open_breaker_rejects_without_sending(mock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    with NiFiClient(base_url=mock.url, circuit_breaker=breaker) as client:
+        breaker.record_failure()
+        mock.calls.clear()
+        with pytest.raises(CircuitOpenError):
+            client.get("/flow/about")
+        assert mock.total_calls() == 0
@@ -0,0 +1,65 @@
+"""Tests for the local component search index."""
+
+import pytest
+
+from nifi_client import ProcessGroup, Processor, SearchError, SearchIndex
+
+PUT_FILE = "org.apache.nifi.processors.standard.PutFile"
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.fixture
+def flow(client):
+    ingest = ProcessGroup(client).create("Ingest")["id"]
+    processor = Processor(client)
+    ids = {
+        "write": processor.create(PUT_FILE, "Write Data", process_group_id=ingest,
+                                  properties={"Directory": "/data/in"})["id"],
+        "log": processor.create(LOG, "Log Everything", properties={"Log Level": "debug"})["id"],
+        "group": ingest,
+    }
+    return ids
+
+
+def names(results):
+    return [record["name"] for record in results]
+
+
+def test_queries(client, flow, tmp_path):
+    index = SearchIndex(client, path=str(tmp_path / "index.json.gz"))
+    assert index.refresh()["added"] == 3
+
+    assert names(index.search("type:PutFile")) == ["Write Data"]
+    assert names(index.search("group:ingest kind:processor")) == ["Write Data"]
+    assert names(index.search("prop:Directory=/data")) == ["Write Data"]
+    assert names(index.search('"prop:Log Level=debug"')) == ["Log Everything"]
+    assert names(index.search("type:Put*")) == ["Write Data"]
+    assert names(index.search("ingest")) == ["Ingest", "Write Data"]
+    assert index.search("kind:processor", limit=1) == index.search("kind:processor")[:1]
+    assert index.search("prop:Directory=/nowhere") == []
+
+
+@pytest.mark.parametrize("query", ["", "colour:red", "prop:", "'unterminated", "***"])
+def test_bad_queries(client, flow, tmp_path, query):
+    index = SearchIndex(client, path=str(tmp_path / "index.json.gz"))
+    index.refresh()
+    with pytest.raises(SearchError):
+        index.search(query)
+
+
+def test_refresh_is_incremental_and_survives_save(client, flow, mock, tmp_path):
+    path = str(tmp_path / "index.json.gz")
+    index = SearchIndex(client, path=path)
+    index.refresh()
+    index.save()
+
+    Processor(client).update(flow["log"], name="Log Nothing")
+    del mock.flow.processors[flow["write"]]
+
+    loaded = SearchIndex(client, path=path)
+    assert loaded.load() and len(loaded) == 3
+    counts = loaded.refresh()
+    assert (counts["updated"], counts["removed"], counts["unchanged"]) == (1, 1, 1)
+    assert names(loaded.search("log")) == ["Log Nothing"]
+    assert loaded.search("type:PutFile") == []
+    assert loaded.search("everything") == []
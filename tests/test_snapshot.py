@@ -0,0 +1,54 @@
+"""Tests for snapshot export and restore."""
+
+import gzip
+import json
+
+import pytest
+
+from nifi_client import Flow, ProcessGroup, Processor, Snapshot, SnapshotError
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+def test_round_trip_remaps_ids(client, mock, tmp_path):
+    groups = ProcessGroup(client)
+    source = groups.create("Source")["id"]
+    inner = groups.create("Inner", parent_group_id=source)["id"]
+    processor = Processor(client)
+    a = processor.create(LOG, "A", process_group_id=source, properties={"Log Level": "debug"})["id"]
+    b = processor.create(LOG, "B", process_group_id=source)["id"]
+    c = processor.create(LOG, "C", process_group_id=inner)["id"]
+    d = processor.create(LOG, "D", process_group_id=inner)["id"]
+    flow = Flow(client)
+    flow.create_connection(a, b, ["success"], process_group_id=source)
+    flow.create_connection(c, d, ["success"], process_group_id=inner)
+
+    path = str(tmp_path / "backup.snapshot.gz")
+    exported = Snapshot(client).export(path, source)
+    assert {kind: count for kind, count in exported.items() if kind != "seconds"} == {
+        "group": 1, "processor": 4, "connection": 2}
+
+    target = groups.create("Target")["id"]
+    restored = Snapshot(client).restore(path, target)
+    assert restored["failed"] == {}
+    assert restored["created"] == {"group": 1, "processor": 4, "connection": 2}
+
+    ids = restored["ids"]
+    assert set(ids) == {inner, a, b, c, d} | {conn["id"] for conn in list(mock.flow.connections.values())[:2]}
+    new_inner = ids[inner]
+    assert mock.flow.groups[new_inner]["parent"] == target
+    assert {mock.flow.processors[ids[key]]["group"] for key in (a, b)} == {target}
+    assert {mock.flow.processors[ids[key]]["group"] for key in (c, d)} == {new_inner}
+    assert mock.flow.processors[ids[a]]["config"]["properties"] == {"Log Level": "debug"}
+
+    endpoints = {(conn["source"], conn["destination"]) for conn in mock.flow.connections.values()}
+    assert (ids[a], ids[b]) in endpoints and (ids[c], ids[d]) in endpoints
+    assert len(mock.flow.connections) == 4
+
+
+def test_read_rejects_other_files(tmp_path):
+    path = tmp_path / "other.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps({"format": "something-else"}) + "\n")
+    with pytest.raises(SnapshotError):
+        list(Snapshot(None).read(str(path)))
@@ -0,0 +1,74 @@
+"""Tests for incremental JSON decoding, split at every possible chunk boundary."""
+
+import json
+import random
+
+import pytest
+
+from nifi_client import Processor, Walker
+from nifi_client.stream import iter_json_items
+
+DOCUMENTS = [
+    {"processors": [-2500.0]},
+    {"processors": [1e10, -0.5e-3, 12345678901234567890, 0, -1]},
+    {"processors": [True, False, None, "", 'a\\"b', "é中\U0001F600"]},
+    {"processors": [{"id": "p1", "n": [1, 2.5, {"x": -3e2}]}, [], {}, [[-7.25]]]},
+    {"processGroupFlow": {"flow": {"processors": [{"id": 1}], "connections": [2.0, {"id": "c"}]}},
+     "other": [1, 2]},
+    {"processors": []},
+]
+
+
+def chunked(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def collect(chunks, paths):
+    return list(iter_json_items(chunks, paths))
+
+
+def expected(document, paths):
+    flow = document.get("processGroupFlow", {}).get("flow", document)
+    return [(path, item) for path in paths for item in flow.get(path.split(".")[-1], [])]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_every_chunk_size_matches_json_loads(document):
+    paths = ["flow.processors", "flow.connections"] if "processGroupFlow" in document else ["processors"]
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    want = expected(json.loads(data), paths)
+    for size in range(1, len(data) + 1):
+        assert collect(chunked(data, size), paths) == want, f"chunk size {size}"
+
+
+def test_random_chunking_matches_json_loads():
+    rng = random.Random(1234)
+    for _ in range(300):
+        items = [rng.choice([rng.uniform(-1e6, 1e6), rng.randint(-10 ** 6, 10 ** 6), rng.random() * 1e-8,
+                             {"v": rng.uniform(-10, 10)}, "s" * rng.randint(0, 5)]) for _ in range(5)]
+        text = json.dumps({"processors": items}, separators=(",", ":") if rng.random() < 0.5 else (", ", ": "))
+        chunks, start = [], 0
+        while start < len(text):
+            step = rng.randint(1, 6)
+            chunks.append(text[start:start + step])
+            start += step
+        assert collect(chunks, ["processors"]) == [("processors", item) for item in json.loads(text)["processors"]]
+
+
+@pytest.mark.parametrize("text", ['{"processors": [1 2]}', '{"processors": [1', '{"processors": [{"a": 1}'])
+def test_invalid_documents_raise(text):
+    with pytest.raises(ValueError):
+        collect(chunked(text, 1), ["processors"])
+
+
+def test_streaming_listings_record_revisions(client):
+    processor = Processor(client)
+    created = processor.create("org.apache.nifi.processors.standard.LogAttribute", "Log")
+    client.revisions.clear()
+
+    assert [proc["id"] for proc in processor.list_all(stream=True)] == [created["id"]]
+    assert client.revisions.get(created["id"]) is not None
+
+    client.revisions.clear()
+    assert [proc["id"] for proc in Walker(client, stream=True).processors()] == [created["id"]]
+    assert client.revisions.get(created["id"]) is not None
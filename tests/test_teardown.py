@@ -0,0 +1,73 @@
+"""Tests for the teardown engine and command."""
+
+import pytest
+from mock_nifi import ROOT_ID
+
+from nifi_client import Flow, NiFiError, ProcessGroup, Processor, Teardown
+from nifi_client.cli import main
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.fixture
+def tree(client, mock):
+    """A "Work" group holding A -> B (5 FlowFiles queued) and a child group with C."""
+    groups = ProcessGroup(client)
+    work = groups.create("Work")["id"]
+    child = groups.create("Child", parent_group_id=work)["id"]
+    processor = Processor(client)
+    a = processor.create(LOG, "A", process_group_id=work)["id"]
+    b = processor.create(LOG, "B", process_group_id=work)["id"]
+    c = processor.create(LOG, "C", process_group_id=child)["id"]
+    connection = Flow(client).create_connection(a, b, ["success"], process_group_id=work)["id"]
+    mock.flow.connections[connection]["queued"] = 5
+    for proc_id in (a, b, c):
+        processor.start(proc_id)
+    return {"work": work, "child": child, "processors": [a, b, c], "connection": connection}
+
+
+def test_teardown_deletes_in_dependency_order(client, mock, tree):
+    order = []
+    outcome = Teardown(client).teardown(tree["work"], delete_group=True,
+                                        on_done=lambda key, result, error: order.append(key))
+
+    assert outcome["failed"] == {}
+    assert outcome["deleted"] == {"connection": 1, "processor": 3, "group": 2}
+    assert outcome["dropped"] == 5
+    assert list(mock.flow.groups) == [ROOT_ID] and not mock.flow.processors
+
+    position = {key: index for index, key in enumerate(order)}
+    connection = ("connection", tree["connection"])
+    assert position[("drop", tree["connection"])] < position[connection]
+    for proc_id in tree["processors"][:2]:
+        assert position[connection] < position[("processor", proc_id)]
+    assert position[("processor", tree["processors"][2])] < position[("group", tree["child"])]
+    assert order[-1] == ("group", tree["work"])
+
+
+def test_teardown_keeps_group_unless_asked(client, mock, tree):
+    outcome = Teardown(client).teardown(tree["work"])
+    assert outcome["deleted"] == {"connection": 1, "processor": 3, "group": 1}
+    assert tree["work"] in mock.flow.groups and tree["child"] not in mock.flow.groups
+
+
+def test_delete_refreshes_once_on_conflict(client, mock):
+    proc_id = Processor(client).create(LOG, "A")["id"]
+    mock.calls.clear()
+
+    Teardown(client).delete("processor", proc_id, version=0)
+    assert proc_id not in mock.flow.processors
+    assert sum(count for key, count in mock.calls.items() if key.startswith("DELETE ")) == 2
+
+
+def test_root_group_cannot_be_deleted(client):
+    with pytest.raises(NiFiError):
+        Teardown(client).teardown("root", delete_group=True)
+
+
+def test_teardown_command(client, mock, tree, monkeypatch, capsys):
+    monkeypatch.setenv("NIFI_URL", mock.url)
+    assert main(["teardown", "--pg", tree["work"], "--delete-group"]) == 0
+    out = capsys.readouterr().out
+    assert "deleted 1 connection, 2 groups, 3 processors; dropped 5 FlowFiles; 0 failed" in out
+    assert tree["work"] not in mock.flow.groups
@@ -0,0 +1,26 @@
+"""Tests for the concurrent process group walker."""
+
+import pytest
+
+from nifi_client import ProcessGroup, Processor, Walker
+
+LOG = "org.apache.nifi.processors.standard.LogAttribute"
+
+
+@pytest.mark.parametrize("kwargs", [{"kinds": ("processors",)}, {"kinds": ("processor", "funnel")},
+                                    {"raw": "all"}])
+def test_entities_rejects_bad_arguments_before_fetching(client, mock, kwargs):
+    mock.calls.clear()
+    with pytest.raises(ValueError):
+        Walker(client).entities(**kwargs)
+    assert mock.total_calls() == 0
+
+
+def test_entities_yields_nested_components(client):
+    child = ProcessGroup(client).create("Child")["id"]
+    processor = Processor(client)
+    processor.create(LOG, "Top")
+    processor.create(LOG, "Nested", process_group_id=child)
+
+    found = {(entity.name, path) for entity, path in Walker(client).entities(kinds=("processor",))}
+    assert found == {("Top", ()), ("Nested", ("Child",))}